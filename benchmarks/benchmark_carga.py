@@ -0,0 +1,231 @@
+"""
+Benchmark da carga do DW em várias escalas de corpus sintético (benchmarks/gerador_corpus.py). Cada escala executa a
+carga completa (staging, explosão, dimensões, fato e pontes) em um PostgreSQL local ou no DuckDB embarcado, registrando
+o tempo de cada comando SQL e, opcionalmente, seu plano de execução (EXPLAIN). Os relatórios são salvos em JSON e podem
+ser comparados com uma execução de referência para detectar regressões
+
+Uso:
+    python -m benchmarks.benchmark_carga --backend duckdb --escalas 7500 75000 750000
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from benchmarks.gerador_corpus import gerar_corpus
+from database.estrutura import connect_to_duckdb, sql_script, sql_script_duckdb
+from database.integracao import (
+    STAGING_TEMP, createTempPubli, insertTempPubli, insertTempPubliDuckDB, explodirTempPubli, insertIntoDimensions,
+    insertIntoFato, insertIntoPontes, dropStaging
+)
+
+RE_ESPACOS = re.compile(r"\s+")
+# Literais de texto e comentários, desconsiderados ao verificar se um comando tem mais de uma instrução
+RE_LITERAIS_COMENTARIOS = re.compile(r"'(?:[^']|'')*'|--[^\n]*")
+RE_COMANDO_EXPLICAVEL = re.compile(
+    r"^\s*(SELECT|INSERT|UPDATE|DELETE|WITH|CREATE\s+(\w+\s+)?TABLE\s+\w+\s+AS)\b", re.IGNORECASE
+)
+
+"""
+Cursor que repassa as chamadas ao cursor original, registrando o tempo de cada comando (execute e copy_expert) e a
+etapa da carga em que foi executado. Com explicar=True, o plano de cada comando único de consulta, DML ou CREATE TABLE AS é
+obtido com EXPLAIN (sem ANALYZE, para não executá-lo duas vezes) antes da execução. Comandos com várias instruções não
+são explicados
+"""
+class CursorCronometrado:
+    def __init__(self, cur, backend="postgres", explicar=False):
+        self.cur = cur
+        self.backend = backend
+        self.explicar = explicar
+        self.etapa = None
+        self.comandos = []
+
+    def __getattr__(self, nome):
+        return getattr(self.cur, nome)
+
+    def execute(self, consulta, parametros=None):
+        plano = self.plano(consulta, parametros) if self.explicar else None
+        inicio = time.perf_counter()
+        if parametros is None:
+            self.cur.execute(consulta)
+        else:
+            self.cur.execute(consulta, parametros)
+        self.registrar(consulta, time.perf_counter() - inicio, plano)
+        return self
+
+    def copy_expert(self, consulta, arquivo):
+        inicio = time.perf_counter()
+        self.cur.copy_expert(consulta, arquivo)
+        self.registrar(consulta, time.perf_counter() - inicio, None)
+
+    def registrar(self, consulta, duracao, plano):
+        self.comandos.append({
+            "etapa": self.etapa,
+            "sql": RE_ESPACOS.sub(" ", consulta).strip()[:300],
+            "tempo_s": duracao,
+            "plano": plano
+        })
+
+    """
+    Obtém o plano de execução de um comando, se ele for um único SELECT, INSERT, UPDATE, DELETE, WITH ou CREATE TABLE AS
+
+    Parâmetros:
+        consulta (str): Comando SQL
+        parametros (tuple/dict): Parâmetros do comando
+
+    Retorna:
+        dict/str: Plano em JSON (PostgreSQL) ou em texto (DuckDB), ou None se o comando não for explicável
+    """
+    def plano(self, consulta, parametros):
+        instrucoes = RE_LITERAIS_COMENTARIOS.sub("", consulta).strip().rstrip(";")
+        if not RE_COMANDO_EXPLICAVEL.match(consulta) or ";" in instrucoes:
+            return None
+        if self.backend == "duckdb":
+            self.cur.execute("EXPLAIN " + consulta, parametros)
+            return "\n".join(linha[1] for linha in self.cur.fetchall())
+        self.cur.execute("EXPLAIN (FORMAT JSON) " + consulta, parametros)
+        resultado = self.cur.fetchone()[0]
+        return (resultado if isinstance(resultado, list) else json.loads(resultado))[0]["Plan"]
+
+"""
+Executa a carga completa de um corpus, com o tempo de cada etapa registrado no cursor cronometrado
+
+Parâmetros:
+    conn (connection): Conexão com o banco (PostgreSQL ou DuckDB), com as tabelas do DW já criadas
+    cur (CursorCronometrado): Cursor cronometrado da conexão
+    caminho_corpus (str): CSV do corpus
+    backend (str): "postgres" ou "duckdb"
+
+Retorna:
+    dict: { etapa: tempo em segundos }
+"""
+def executar_carga(conn, cur, caminho_corpus, backend):
+    etapas = [
+        ("staging", lambda: (createTempPubli(cur), insertTempPubliDuckDB(cur, caminho_corpus) if backend == "duckdb"
+                             else insertTempPubli(cur, caminho_corpus))),
+        ("explosao", lambda: explodirTempPubli(cur)),
+        ("dimensoes", lambda: insertIntoDimensions(cur)),
+        ("fato", lambda: insertIntoFato(cur)),
+        ("pontes", lambda: insertIntoPontes(cur))
+    ]
+    tempos = {}
+    for etapa, funcao in etapas:
+        cur.etapa = etapa
+        inicio = time.perf_counter()
+        funcao()
+        tempos[etapa] = time.perf_counter() - inicio
+    cur.etapa = None
+    dropStaging(cur, STAGING_TEMP)
+    conn.commit()
+    return tempos
+
+"""
+Cria uma conexão limpa para o benchmark, com as tabelas do DW recriadas
+
+Parâmetros:
+    backend (str): "postgres" (banco DB_NAME do .env) ou "duckdb" (banco em memória)
+
+Retorna:
+    connection: Conexão com o banco
+"""
+def preparar_banco(backend):
+    if backend == "duckdb":
+        conn = connect_to_duckdb(":memory:")
+        conn.execute(sql_script_duckdb)
+        return conn
+    from database.conexao import conectar
+    conn = conectar()
+    cur = conn.cursor()
+    cur.execute(sql_script)
+    conn.commit()
+    cur.close()
+    return conn
+
+"""
+Executa o benchmark da carga em cada escala e salva um relatório JSON por escala
+
+Parâmetros:
+    escalas (list): Números de linhas dos corpora (ex.: [7500, 75000, 750000])
+    backend (str): "postgres" ou "duckdb" (padrão: "duckdb")
+    diretorio (str): Diretório dos corpora e relatórios (padrão: "benchmarks/resultados")
+    explicar (bool): Registra os planos de execução dos comandos (padrão: True)
+    semente (int): Semente do gerador do corpus (padrão: 42)
+
+Retorna:
+    list: Relatórios, um por escala
+"""
+def executar_benchmark(escalas, backend="duckdb", diretorio="benchmarks/resultados", explicar=True, semente=42):
+    os.makedirs(diretorio, exist_ok=True)
+    relatorios = []
+    for n_artigos in escalas:
+        caminho_corpus = os.path.join(diretorio, f"corpus_{n_artigos}.csv")
+        if not os.path.exists(caminho_corpus):
+            inicio = time.perf_counter()
+            gerar_corpus(n_artigos, caminho_corpus, semente=semente)
+            print(f"Corpus de {n_artigos} linhas gerado em {time.perf_counter() - inicio:.2f}s")
+
+        conn = preparar_banco(backend)
+        cur = CursorCronometrado(conn.cursor(), backend, explicar)
+        tempos = executar_carga(conn, cur, caminho_corpus, backend)
+        conn.close()
+
+        relatorio = {
+            "backend": backend,
+            "n_artigos": n_artigos,
+            "etapas": tempos,
+            "total_s": sum(tempos.values()),
+            "linhas_por_s": n_artigos / sum(tempos.values()),
+            "comandos": cur.comandos
+        }
+        with open(os.path.join(diretorio, f"benchmark_{backend}_{n_artigos}.json"), "w", encoding="utf-8") as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=1)
+        relatorios.append(relatorio)
+        print(f"{n_artigos} linhas: " + ", ".join(f"{etapa} {t:.2f}s" for etapa, t in tempos.items())
+              + f" | total {relatorio['total_s']:.2f}s ({relatorio['linhas_por_s']:.0f} linhas/s)")
+    return relatorios
+
+"""
+Compara um relatório com outro de referência (mesmo backend e escala), comando a comando, na ordem de execução
+
+Parâmetros:
+    relatorio (dict): Relatório atual
+    referencia (dict): Relatório de referência
+    tolerancia (float): Aumento relativo de tempo a partir do qual o comando é considerado uma regressão (padrão: 0.2)
+    tempo_minimo (float): Comandos mais rápidos que este tempo, em segundos, são ignorados (padrão: 0.05)
+
+Retorna:
+    list: Regressões, com etapa, sql, tempo de referência e tempo atual
+"""
+def comparar_relatorios(relatorio, referencia, tolerancia=0.2, tempo_minimo=0.05):
+    regressoes = []
+    for atual, anterior in zip(relatorio["comandos"], referencia["comandos"]):
+        if atual["sql"] != anterior["sql"] or atual["tempo_s"] < tempo_minimo:
+            continue
+        if atual["tempo_s"] > anterior["tempo_s"] * (1 + tolerancia):
+            regressoes.append({
+                "etapa": atual["etapa"],
+                "sql": atual["sql"],
+                "referencia_s": anterior["tempo_s"],
+                "atual_s": atual["tempo_s"]
+            })
+    for r in regressoes:
+        print(f"Regressão em {r['etapa']}: {r['referencia_s']:.3f}s -> {r['atual_s']:.3f}s | {r['sql'][:100]}")
+    return regressoes
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark da carga do DW com corpus sintético")
+    parser.add_argument("--escalas", type=int, nargs="+", default=[7500, 75000, 750000])
+    parser.add_argument("--backend", choices=["postgres", "duckdb"], default="duckdb")
+    parser.add_argument("--diretorio", default="benchmarks/resultados")
+    parser.add_argument("--sem-planos", action="store_true", help="Não registra os planos de execução")
+    parser.add_argument("--referencia", help="Diretório com relatórios de referência para detectar regressões")
+    args = parser.parse_args()
+
+    relatorios = executar_benchmark(args.escalas, args.backend, args.diretorio, explicar=not args.sem_planos)
+    if args.referencia:
+        for relatorio in relatorios:
+            caminho = os.path.join(args.referencia, f"benchmark_{args.backend}_{relatorio['n_artigos']}.json")
+            if os.path.exists(caminho):
+                with open(caminho, encoding="utf-8") as f:
+                    comparar_relatorios(relatorio, json.load(f))
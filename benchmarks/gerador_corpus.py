@@ -0,0 +1,159 @@
+"""
+Gerador de corpus sintético no formato de articles_dw.csv, utilizado para medir a carga do DW em escalas maiores que a
+base real. Autores, palavras-chave e instituições seguem distribuições de cauda longa (Zipf), de modo que poucas entidades
+se repetem em muitos artigos, e parte dos títulos é republicada em outras edições, como ocorre na base coletada
+"""
+
+import csv
+import itertools
+import random
+from unidecode import unidecode
+import pandas as pd
+
+# Colunas de articles_dw.csv, na ordem do arquivo
+COLUNAS_CORPUS = [
+    "journal", "year", "volume", "edition_number", "publication_date", "publication_type", "title", "authors",
+    "keywords", "TotalAccess", "subareas", "year_extracted", "month_extracted", "day_extracted", "edition_id",
+    "Instituicao", "Cidade", "Estado", "Pais"
+]
+
+REVISTAS = {"QN": 1978, "JBCS": 1990}
+TIPOS_PUBLICACAO = ["Articles", "Artigo", "Article", "Revisão", "Educação", "Nota Técnica", "Assuntos Gerais"]
+PESOS_TIPOS = [31, 21, 12, 7, 5, 2, 2]
+SUBAREAS = [
+    "Química Analítica", "Química Orgânica", "Química Inorgânica", "Físico-Química", "Bioquímica", "Green Chemistry",
+    "Environmental Chemistry", "Medicinal Chemistry", "Materials Science", "Nanotecnologia e Materiais"
+]
+SOBRENOMES = [
+    "Silva", "Santos", "Oliveira", "Souza", "Pereira", "Costa", "Rodrigues", "Almeida", "Nascimento", "Lima", "Araujo",
+    "Fernandes", "Carvalho", "Gomes", "Martins", "Rocha", "Ribeiro", "Alves", "Monteiro", "Mendes", "Barros", "Freitas"
+]
+PRENOMES = [
+    "Ana", "Maria", "Joao", "Jose", "Paulo", "Carlos", "Lucas", "Mariana", "Fernanda", "Pedro", "Rafael", "Juliana",
+    "Beatriz", "Gabriel", "Luiz", "Claudia", "Renato", "Patricia", "Marcos", "Camila", "Eduardo", "Helena"
+]
+RADICAIS_PALAVRAS = [
+    "catalysis", "adsorption", "voltammetry", "chromatography", "spectroscopy", "polymer", "nanoparticles", "synthesis",
+    "dft", "biodiesel", "essential oil", "antioxidant", "zeolite", "electrochemistry", "heavy metals", "kinetics",
+    "photocatalysis", "biomass", "graphene", "docking", "ionic liquids", "corrosion", "fluorescence", "sensor"
+]
+TIPOS_INSTITUICAO = ["universidade federal de", "universidade estadual de", "instituto federal de", "universidade de"]
+
+"""
+Gera os pesos acumulados de uma distribuição de Zipf para n entidades, utilizados em random.choices(cum_weights=...)
+
+Parâmetros:
+    n (int): Número de entidades
+    expoente (float): Expoente da distribuição; valores maiores concentram mais as repetições (padrão: 1.1)
+
+Retorna:
+    list: Pesos acumulados
+"""
+def pesos_zipf(n, expoente=1.1):
+    return list(itertools.accumulate(1.0 / (i ** expoente) for i in range(1, n + 1)))
+
+"""
+Gera o conjunto de entidades (autores, palavras-chave e instituições) de um corpus com n_artigos artigos
+
+Parâmetros:
+    n_artigos (int): Número de artigos do corpus
+    rng (random.Random): Gerador de números aleatórios
+
+Retorna:
+    dict: Listas "autores", "palavras" e "instituicoes" (tuplas nome, cidade, estado, pais)
+"""
+def gerar_entidades(n_artigos, rng):
+    n_autores = max(50, int(n_artigos * 3.5))
+    autores = [
+        f"{rng.choice(SOBRENOMES)}{'' if i < len(SOBRENOMES) else i}, {rng.choice(PRENOMES)} {chr(65 + i % 26)}."
+        for i in range(n_autores)
+    ]
+
+    n_palavras = max(30, n_artigos)
+    palavras = [
+        RADICAIS_PALAVRAS[i] if i < len(RADICAIS_PALAVRAS) else f"{rng.choice(RADICAIS_PALAVRAS)} {i}"
+        for i in range(n_palavras)
+    ]
+
+    municipios = pd.read_csv("./data/municipios_brasil.csv", encoding="utf-8", usecols=["municipio", "uf"])
+    municipios = municipios.sample(n=min(len(municipios), max(20, n_artigos // 10)), random_state=rng.randrange(2 ** 32))
+    instituicoes = []
+    for municipio, uf in municipios.itertuples(index=False):
+        cidade = unidecode(municipio).lower()
+        instituicoes.append((f"{rng.choice(TIPOS_INSTITUICAO)} {cidade}", cidade, uf, "brazil"))
+
+    rng.shuffle(autores)
+    rng.shuffle(palavras)
+    return {"autores": autores, "palavras": palavras, "instituicoes": instituicoes}
+
+"""
+Formata uma lista no formato de articles_dw.csv (representação de lista do Python, ex.: "['a', 'b']")
+
+Parâmetros:
+    valores (list): Valores da lista
+
+Retorna:
+    str: Lista formatada
+"""
+def formatar_lista(valores):
+    return "[" + ", ".join(f"'{v}'" for v in valores) + "]"
+
+"""
+Gera um corpus sintético no formato de articles_dw.csv e o grava em disco linha a linha, sem manter o corpus em memória
+
+Parâmetros:
+    n_artigos (int): Número de linhas do corpus
+    caminho (str): Caminho do CSV de saída
+    semente (int): Semente do gerador de números aleatórios, para corpora reprodutíveis (padrão: 42)
+    taxa_republicacao (float): Fração das linhas que repetem o título de um artigo anterior (padrão: 0.3)
+    taxa_sem_instituicao (float): Fração das linhas sem instituição ("sem valor") (padrão: 0.4)
+
+Retorna:
+    str: Caminho do CSV gerado
+"""
+def gerar_corpus(n_artigos, caminho, semente=42, taxa_republicacao=0.3, taxa_sem_instituicao=0.4):
+    rng = random.Random(semente)
+    entidades = gerar_entidades(n_artigos, rng)
+    autores, palavras, instituicoes = entidades["autores"], entidades["palavras"], entidades["instituicoes"]
+    pesos_autores = pesos_zipf(len(autores), 0.9)
+    pesos_palavras = pesos_zipf(len(palavras))
+    pesos_instituicoes = pesos_zipf(len(instituicoes))
+
+    artigos_anteriores = []
+    with open(caminho, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.writer(f, lineterminator="\n")
+        escritor.writerow(COLUNAS_CORPUS)
+        for i in range(n_artigos):
+            revista = rng.choice(list(REVISTAS))
+            ano = rng.randint(1997, 2025)
+            mes = rng.randint(1, 12)
+            volume = ano - REVISTAS[revista] + 1
+            numero = float(rng.randint(1, 12))
+
+            if artigos_anteriores and rng.random() < taxa_republicacao:
+                titulo, lista_autores, lista_palavras, lista_subareas = rng.choice(artigos_anteriores)
+            else:
+                lista_palavras = list(dict.fromkeys(rng.choices(palavras, cum_weights=pesos_palavras, k=rng.randint(0, 6))))
+                titulo = " ".join(rng.sample(RADICAIS_PALAVRAS, 4)).upper() + f" {i}"
+                lista_autores = list(dict.fromkeys(rng.choices(autores, cum_weights=pesos_autores, k=rng.randint(1, 8))))
+                lista_subareas = [rng.choice(SUBAREAS) for _ in lista_palavras] if rng.random() < 0.5 else []
+                artigos_anteriores.append((titulo, lista_autores, lista_palavras, lista_subareas))
+                if len(artigos_anteriores) > 10000:
+                    artigos_anteriores.pop(rng.randrange(len(artigos_anteriores)))
+
+            if rng.random() < taxa_sem_instituicao:
+                instituicao = cidade = estado = pais = "sem valor"
+            else:
+                escolhidas = list(dict.fromkeys(rng.choices(instituicoes, cum_weights=pesos_instituicoes, k=rng.randint(1, 3))))
+                instituicao, cidade, estado, pais = ("; ".join(campo) for campo in zip(*escolhidas))
+
+            escritor.writerow([
+                revista, ano, volume, numero,
+                f"{ano}-{mes:02d}-01" if rng.random() > 0.28 else "",
+                rng.choices(TIPOS_PUBLICACAO, weights=PESOS_TIPOS)[0] if rng.random() > 0.05 else "",
+                titulo, formatar_lista(lista_autores), formatar_lista(lista_palavras),
+                float(int(rng.lognormvariate(7.0, 0.6)) + 200), formatar_lista(lista_subareas),
+                float(ano), float(mes), 1.0, f"Vol.{volume}, No.{numero}",
+                instituicao, cidade, estado, pais
+            ])
+    return caminho
@@ -0,0 +1,223 @@
+"""
+API de consultas analíticas sobre o DW (top instituições, tendência das subáreas, distribuição de acessos por revista e
+ano, produção dos autores). As consultas são parametrizadas e seus resultados ficam em cache na memória, invalidado
+quando a marca d'água de carga (Controle_Carga, ver integracao.ultimaCarga) muda
+"""
+
+import pandas as pd
+from database.conexao import conexao
+from database.integracao import ultimaCarga, usaChaveSubstituta
+from monitoramento.cache import CacheLRU
+
+# Consultas parametrizadas. {chave_fato} é a coluna de Fato_Publicacao referenciada pelas pontes e {filtros} recebe as
+# condições dos parâmetros informados (FILTROS)
+CONSULTAS_ANALISES = {
+    "top_instituicoes": """
+        SELECT di.nome_instituicao, di.estado, di.pais, COUNT(DISTINCT pi.chavePublicacao) AS total_publicacoes,
+            SUM(fp.numero_acessos) AS total_acessos
+        FROM Ponte_Instituicao pi
+        JOIN Dim_Instituicao di ON pi.chaveInstituicao = di.chaveInstituicao
+        JOIN Fato_Publicacao fp ON pi.chavePublicacao = fp.{chave_fato}
+        JOIN Dim_Tempo dt ON fp.chaveTempo = dt.chaveTempo
+        WHERE TRUE {filtros}
+        GROUP BY di.nome_instituicao, di.estado, di.pais
+        ORDER BY total_publicacoes DESC, di.nome_instituicao
+        LIMIT %(limite)s;
+    """,
+    "tendencia_subareas": """
+        SELECT dt.ano, dp.subarea, COUNT(DISTINCT pp.chavePublicacao) AS total_publicacoes
+        FROM Ponte_PalavraChave pp
+        JOIN Dim_PalavraChave dp ON pp.chavePalavraChave = dp.chavePalavraChave
+        JOIN Fato_Publicacao fp ON pp.chavePublicacao = fp.{chave_fato}
+        JOIN Dim_Tempo dt ON fp.chaveTempo = dt.chaveTempo
+        WHERE dp.subarea IS NOT NULL {filtros}
+        GROUP BY dt.ano, dp.subarea
+        ORDER BY dt.ano, total_publicacoes DESC;
+    """,
+    "distribuicao_acessos": """
+        SELECT fp.nome_revista, dt.ano, COUNT(*) AS total_publicacoes, SUM(fp.numero_acessos) AS total_acessos,
+            AVG(fp.numero_acessos) AS media_acessos,
+            percentile_cont(0.5) WITHIN GROUP (ORDER BY fp.numero_acessos) AS mediana_acessos,
+            MAX(fp.numero_acessos) AS max_acessos
+        FROM Fato_Publicacao fp
+        JOIN Dim_Tempo dt ON fp.chaveTempo = dt.chaveTempo
+        WHERE TRUE {filtros}
+        GROUP BY fp.nome_revista, dt.ano
+        ORDER BY fp.nome_revista, dt.ano;
+    """,
+    "top_autores": """
+        SELECT da.nome_autor, COUNT(*) AS total_publicacoes, SUM(fp.numero_acessos) AS total_acessos
+        FROM Ponte_Autor pa
+        JOIN Dim_Autor da ON pa.chaveAutor = da.chaveAutor
+        JOIN Fato_Publicacao fp ON pa.chavePublicacao = fp.{chave_fato}
+        JOIN Dim_Tempo dt ON fp.chaveTempo = dt.chaveTempo
+        WHERE TRUE {filtros}
+        GROUP BY da.nome_autor
+        ORDER BY total_publicacoes DESC, da.nome_autor
+        LIMIT %(limite)s;
+    """
+}
+
+# Condição aplicada a cada parâmetro de filtro, quando informado
+FILTROS = {
+    "ano_inicio": "dt.ano >= %(ano_inicio)s",
+    "ano_fim": "dt.ano <= %(ano_fim)s",
+    "estado": "di.estado = %(estado)s",
+    "pais": "di.pais = %(pais)s",
+    "subareas": "dp.subarea = ANY(%(subareas)s)",
+    "revista": "fp.nome_revista = %(revista)s"
+}
+
+"""
+Cache LRU (monitoramento/cache.py) dos resultados das consultas analíticas, associado a uma marca d'água de carga.
+Quando a marca muda (nova carga no DW), todas as entradas são descartadas
+
+Parâmetros:
+    tamanho_maximo (int): Número máximo de resultados mantidos em memória (padrão: 256)
+"""
+class CacheConsultas(CacheLRU):
+    def __init__(self, tamanho_maximo=256):
+        super().__init__(tamanho_maximo)
+        self.marca_dagua = None
+        self.invalidacoes = 0
+
+    """
+    Descarta as entradas se a marca d'água informada for diferente da marca das entradas em cache
+
+    Parâmetros:
+        marca_dagua (tuple): Marca d'água atual, retornada por integracao.ultimaCarga()
+    """
+    def validar(self, marca_dagua):
+        with self.lock:
+            if marca_dagua != self.marca_dagua:
+                if self.entradas:
+                    self.invalidacoes += 1
+                self.entradas.clear()
+                self.marca_dagua = marca_dagua
+
+    def limpar(self):
+        super().limpar()
+        with self.lock:
+            self.marca_dagua = None
+            self.invalidacoes = 0
+
+    """
+    Retorna as estatísticas de uso do cache
+
+    Retorna:
+        dict: As de CacheLRU.estatisticas(), mais "invalidacoes"
+    """
+    def estatisticas(self):
+        estatisticas = super().estatisticas()
+        with self.lock:
+            estatisticas["invalidacoes"] = self.invalidacoes
+        return estatisticas
+
+# Cache padrão das consultas analíticas
+cache_consultas = CacheConsultas()
+
+"""
+Executa uma consulta de CONSULTAS_ANALISES com os parâmetros informados, utilizando o cache. A marca d'água de carga é
+verificada a cada chamada (uma consulta de uma linha em Controle_Carga, que toda carga atualiza com
+integracao.registrarCarga); a consulta analítica só é executada se o resultado não estiver em cache
+
+Parâmetros:
+    nome (str): Nome da consulta em CONSULTAS_ANALISES
+    parametros (dict): Parâmetros da consulta; os de FILTROS com valor None são ignorados
+    cur (cursor): Cursor da conexão com o banco; se None, utiliza uma conexão do pool compartilhado
+    cache (CacheConsultas): Cache dos resultados; se None, a consulta é sempre executada (padrão: cache_consultas)
+
+Retorna:
+    DataFrame: Resultado da consulta (cópia, pode ser alterada livremente)
+"""
+def executar_analise(nome, parametros, cur=None, cache=cache_consultas):
+    if cur is None:
+        with conexao() as conn:
+            cursor = conn.cursor()
+            try:
+                return executar_analise(nome, parametros, cursor, cache)
+            finally:
+                cursor.close()
+
+    chave = (nome, tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in parametros.items())))
+    if cache is not None:
+        # Com uma marca d'água já lida, Controle_Carga existe e a verificação da tabela (to_regclass) é dispensada
+        cache.validar(ultimaCarga(cur, verificar_tabela=cache.marca_dagua is None))
+        resultado = cache.obter(chave)
+        if resultado is not None:
+            return resultado.copy()
+
+    chave_fato = "chavePublicacao" if usaChaveSubstituta(cur) else "titulo"
+    filtros = "".join(f" AND {FILTROS[k]}" for k, v in parametros.items() if k in FILTROS and v is not None)
+    cur.execute(CONSULTAS_ANALISES[nome].format(chave_fato=chave_fato, filtros=filtros), parametros)
+    resultado = pd.DataFrame(cur.fetchall(), columns=[coluna[0] for coluna in cur.description])
+
+    if cache is not None:
+        cache.guardar(chave, resultado)
+    return resultado.copy()
+
+"""
+Instituições com maior número de publicações
+
+Parâmetros:
+    limite (int): Número de instituições retornadas (padrão: 10)
+    ano_inicio (int): Ano inicial do período (padrão: None, sem limite)
+    ano_fim (int): Ano final do período (padrão: None, sem limite)
+    estado (str): Sigla do estado das instituições (padrão: None, todos)
+    pais (str): País das instituições (padrão: None, todos)
+    cur (cursor): Cursor da conexão com o banco; se None, utiliza o pool compartilhado
+
+Retorna:
+    DataFrame: Colunas nome_instituicao, estado, pais, total_publicacoes e total_acessos
+"""
+def top_instituicoes(limite=10, ano_inicio=None, ano_fim=None, estado=None, pais=None, cur=None):
+    parametros = {"limite": limite, "ano_inicio": ano_inicio, "ano_fim": ano_fim, "estado": estado, "pais": pais}
+    return executar_analise("top_instituicoes", parametros, cur)
+
+"""
+Número de publicações por subárea e ano
+
+Parâmetros:
+    ano_inicio (int): Ano inicial do período (padrão: None, sem limite)
+    ano_fim (int): Ano final do período (padrão: None, sem limite)
+    subareas (list): Subáreas consideradas (padrão: None, todas)
+    cur (cursor): Cursor da conexão com o banco; se None, utiliza o pool compartilhado
+
+Retorna:
+    DataFrame: Colunas ano, subarea e total_publicacoes
+"""
+def tendencia_subareas(ano_inicio=None, ano_fim=None, subareas=None, cur=None):
+    parametros = {"ano_inicio": ano_inicio, "ano_fim": ano_fim, "subareas": list(subareas) if subareas else None}
+    return executar_analise("tendencia_subareas", parametros, cur)
+
+"""
+Distribuição do número de acessos das publicações por revista e ano
+
+Parâmetros:
+    ano_inicio (int): Ano inicial do período (padrão: None, sem limite)
+    ano_fim (int): Ano final do período (padrão: None, sem limite)
+    revista (str): Nome da revista (padrão: None, todas)
+    cur (cursor): Cursor da conexão com o banco; se None, utiliza o pool compartilhado
+
+Retorna:
+    DataFrame: Colunas nome_revista, ano, total_publicacoes, total_acessos, media_acessos, mediana_acessos e max_acessos
+"""
+def distribuicao_acessos(ano_inicio=None, ano_fim=None, revista=None, cur=None):
+    parametros = {"ano_inicio": ano_inicio, "ano_fim": ano_fim, "revista": revista}
+    return executar_analise("distribuicao_acessos", parametros, cur)
+
+"""
+Autores com maior número de publicações
+
+Parâmetros:
+    limite (int): Número de autores retornados (padrão: 10)
+    ano_inicio (int): Ano inicial do período (padrão: None, sem limite)
+    ano_fim (int): Ano final do período (padrão: None, sem limite)
+    cur (cursor): Cursor da conexão com o banco; se None, utiliza o pool compartilhado
+
+Retorna:
+    DataFrame: Colunas nome_autor, total_publicacoes e total_acessos
+"""
+def top_autores(limite=10, ano_inicio=None, ano_fim=None, cur=None):
+    parametros = {"limite": limite, "ano_inicio": ano_inicio, "ano_fim": ano_fim}
+    return executar_analise("top_autores", parametros, cur)
@@ -0,0 +1,154 @@
+"""
+Acesso ao banco de dados: configuração única a partir do ambiente (.env), pool de conexões compartilhado por processo,
+retirada de conexões por etapa e cursores do lado do servidor para leituras grandes
+"""
+
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
+from dotenv import load_dotenv
+
+# Variáveis do .env carregadas uma única vez, na importação (as já definidas no ambiente não são sobrescritas)
+load_dotenv()
+
+# Tamanho máximo padrão do pool, quando DB_POOL_MAX não está definido
+TAMANHO_POOL_PADRAO = 10
+
+# Pools compartilhados, um por banco de dados
+_pools = {}
+_trava_pools = threading.Lock()
+
+"""
+Lê a configuração de conexão das variáveis de ambiente (DB_NAME, DB_USER, DB_PASSWORD, DB_HOST e DB_PORT)
+
+Parâmetros:
+    banco (str): Nome do banco de dados; se None, utiliza a variável de ambiente indicada em variavel_banco
+    variavel_banco (str): Variável de ambiente com o nome do banco (padrão: "DB_NAME")
+
+Retorna:
+    dict: Parâmetros de conexão aceitos por psycopg2.connect()
+"""
+def configuracao_banco(banco=None, variavel_banco="DB_NAME"):
+    return {
+        "dbname": banco or os.getenv(variavel_banco),
+        "user": os.getenv("DB_USER"),
+        "password": os.getenv("DB_PASSWORD"),
+        "host": os.getenv("DB_HOST"),
+        "port": os.getenv("DB_PORT") or None
+    }
+
+"""
+Abre uma conexão avulsa (fora do pool), utilizada em operações administrativas como a criação do banco
+
+Parâmetros:
+    banco (str): Nome do banco de dados; se None, utiliza a variável de ambiente indicada em variavel_banco
+    autocommit (bool): Ativa o autocommit na conexão (padrão: False)
+    variavel_banco (str): Variável de ambiente com o nome do banco (padrão: "DB_NAME")
+
+Retorna:
+    connection: Conexão psycopg2
+"""
+def conectar(banco=None, autocommit=False, variavel_banco="DB_NAME"):
+    conn = psycopg2.connect(**configuracao_banco(banco, variavel_banco))
+    conn.autocommit = autocommit
+    return conn
+
+"""
+Retorna o pool de conexões compartilhado do banco, criando-o na primeira chamada. O tamanho máximo é definido na criação
+(maior valor entre DB_POOL_MAX e o parâmetro maximo) e mantido nas chamadas seguintes
+
+Parâmetros:
+    banco (str): Nome do banco de dados; se None, utiliza DB_NAME
+    maximo (int): Número mínimo de conexões que o pool deve comportar
+
+Retorna:
+    ThreadedConnectionPool: Pool de conexões
+"""
+def obter_pool(banco=None, maximo=None):
+    configuracao = configuracao_banco(banco)
+    with _trava_pools:
+        pool = _pools.get(configuracao["dbname"])
+        if pool is None or pool.closed:
+            tamanho = max(int(os.getenv("DB_POOL_MAX") or TAMANHO_POOL_PADRAO), maximo or 0)
+            pool = ThreadedConnectionPool(1, tamanho, **configuracao)
+            _pools[configuracao["dbname"]] = pool
+        elif maximo and maximo > pool.maxconn:
+            print(f"Pool de {configuracao['dbname']} já criado com {pool.maxconn} conexões; {maximo} solicitadas")
+        return pool
+
+"""
+Retira uma conexão do pool para uma etapa, confirmando a transação ao final da etapa (ou desfazendo-a em caso de erro)
+e devolvendo a conexão ao pool
+
+Parâmetros:
+    banco (str): Nome do banco de dados; se None, utiliza DB_NAME
+
+Retorna:
+    connection: Conexão do pool, válida dentro do bloco with
+"""
+@contextmanager
+def conexao(banco=None):
+    pool = obter_pool(banco)
+    conn = pool.getconn()
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        pool.putconn(conn)
+
+"""
+Cria um cursor do lado do servidor, que busca o resultado em lotes de tamanho_lote linhas em vez de trazê-lo inteiro
+para a memória. Deve ser utilizado dentro de uma transação (conexão sem autocommit)
+
+Parâmetros:
+    conn (connection): Conexão com o banco
+    tamanho_lote (int): Número de linhas buscadas por ida ao servidor (padrão: 5000)
+
+Retorna:
+    cursor: Cursor nomeado, fechado ao final do bloco with
+"""
+@contextmanager
+def cursor_servidor(conn, tamanho_lote=5000):
+    cur = conn.cursor(name=f"cursor_{uuid.uuid4().hex}")
+    cur.itersize = tamanho_lote
+    try:
+        yield cur
+    finally:
+        cur.close()
+
+"""
+Executa uma consulta com um cursor do lado do servidor e devolve as linhas em lotes
+
+Parâmetros:
+    consulta (str): Consulta SQL
+    parametros (tuple): Parâmetros da consulta (padrão: None)
+    tamanho_lote (int): Número de linhas por lote (padrão: 5000)
+    banco (str): Nome do banco de dados; se None, utiliza DB_NAME
+
+Retorna:
+    generator: Listas de até tamanho_lote linhas
+"""
+def ler_em_lotes(consulta, parametros=None, tamanho_lote=5000, banco=None):
+    with conexao(banco) as conn, cursor_servidor(conn, tamanho_lote) as cur:
+        cur.execute(consulta, parametros)
+        while True:
+            linhas = cur.fetchmany(tamanho_lote)
+            if not linhas:
+                break
+            yield linhas
+
+"""
+Fecha todas as conexões dos pools compartilhados
+"""
+def fechar_pools():
+    with _trava_pools:
+        for pool in _pools.values():
+            if not pool.closed:
+                pool.closeall()
+        _pools.clear()
@@ -0,0 +1,130 @@
+"""
+Consultas OLAP representativas sobre o DW e funções para medir seu tempo de execução (EXPLAIN ANALYZE), utilizadas para
+comparar o desempenho antes e depois do desenho físico (database/estrutura.py: gerar_sql_indices)
+"""
+
+import json
+import statistics
+from database.estrutura import gerar_sql_indices
+from database.integracao import analyzeDW, usaChaveSubstituta
+
+# Consultas representativas. {chave_fato} é substituído pela coluna de Fato_Publicacao referenciada pelas pontes
+CONSULTAS_OLAP = {
+    "subareas_por_ano": """
+        SELECT dt.ano, dp.subarea, COUNT(*) AS total_publicacoes
+        FROM Ponte_PalavraChave pp
+        JOIN Dim_PalavraChave dp ON pp.chavePalavraChave = dp.chavePalavraChave
+        JOIN Fato_Publicacao fp ON pp.chavePublicacao = fp.{chave_fato}
+        JOIN Dim_Tempo dt ON fp.chaveTempo = dt.chaveTempo
+        WHERE dt.ano >= EXTRACT(YEAR FROM CURRENT_DATE) - 10
+        GROUP BY dt.ano, dp.subarea
+        ORDER BY dt.ano DESC, total_publicacoes DESC;
+    """,
+    "publicacoes_de_uma_subarea": """
+        SELECT fp.titulo, fp.numero_acessos
+        FROM Dim_PalavraChave dp
+        JOIN Ponte_PalavraChave pp ON pp.chavePalavraChave = dp.chavePalavraChave
+        JOIN Fato_Publicacao fp ON pp.chavePublicacao = fp.{chave_fato}
+        WHERE dp.subarea = 'Química Analítica';
+    """,
+    "instituicoes_por_ano": """
+        SELECT dt.ano, di.nome_instituicao, COUNT(*) AS total_publicacoes
+        FROM Ponte_Instituicao pi
+        JOIN Dim_Instituicao di ON pi.chaveInstituicao = di.chaveInstituicao
+        JOIN Fato_Publicacao fp ON pi.chavePublicacao = fp.{chave_fato}
+        JOIN Dim_Tempo dt ON fp.chaveTempo = dt.chaveTempo
+        WHERE dt.ano >= EXTRACT(YEAR FROM CURRENT_DATE) - 10
+        GROUP BY dt.ano, di.nome_instituicao
+        ORDER BY dt.ano ASC, total_publicacoes DESC;
+    """,
+    "publicacoes_de_um_estado": """
+        SELECT di.nome_instituicao, COUNT(*) AS total_publicacoes
+        FROM Dim_Instituicao di
+        JOIN Ponte_Instituicao pi ON pi.chaveInstituicao = di.chaveInstituicao
+        WHERE di.estado = 'SP'
+        GROUP BY di.nome_instituicao
+        ORDER BY total_publicacoes DESC;
+    """,
+    "publicacoes_de_um_autor": """
+        SELECT da.nome_autor, fp.titulo, fp.chaveTempo
+        FROM Dim_Autor da
+        JOIN Ponte_Autor pa ON pa.chaveAutor = da.chaveAutor
+        JOIN Fato_Publicacao fp ON pa.chavePublicacao = fp.{chave_fato}
+        WHERE da.nome_autor = (SELECT nome_autor FROM Dim_Autor ORDER BY chaveAutor LIMIT 1);
+    """,
+    "acessos_por_revista_no_periodo": """
+        SELECT fp.nome_revista, dt.ano, SUM(fp.numero_acessos) AS total_acessos, COUNT(*) AS total_publicacoes
+        FROM Fato_Publicacao fp
+        JOIN Dim_Tempo dt ON fp.chaveTempo = dt.chaveTempo
+        WHERE fp.chaveTempo BETWEEN DATE '2020-01-01' AND DATE '2022-12-31'
+        GROUP BY fp.nome_revista, dt.ano
+        ORDER BY fp.nome_revista, dt.ano;
+    """,
+    "publicacoes_de_uma_revista": """
+        SELECT COUNT(*) AS total_publicacoes, AVG(fp.numero_acessos) AS media_acessos
+        FROM Fato_Publicacao fp
+        WHERE fp.nome_revista = 'JBCS';
+    """
+}
+
+"""
+Mede o tempo de execução de cada consulta com EXPLAIN (ANALYZE, FORMAT JSON)
+
+Parâmetros:
+    cur (cursor): Cursor da conexão com o banco
+    repeticoes (int): Número de execuções de cada consulta; é reportada a mediana (padrão: 3)
+    chave_substituta (bool): Modelo do DW. Se None, é detectado com usaChaveSubstituta()
+
+Retorna:
+    dict: { nome_consulta: {"tempo_ms": float, "plano": dict} }, com o plano da última execução
+"""
+def medir_consultas(cur, repeticoes=3, chave_substituta=None):
+    if chave_substituta is None:
+        chave_substituta = usaChaveSubstituta(cur)
+    chave_fato = "chavePublicacao" if chave_substituta else "titulo"
+
+    resultados = {}
+    for nome, consulta in CONSULTAS_OLAP.items():
+        tempos = []
+        plano = None
+        for _ in range(repeticoes):
+            cur.execute("EXPLAIN (ANALYZE, FORMAT JSON) " + consulta.format(chave_fato=chave_fato))
+            resultado = cur.fetchone()[0]
+            plano = resultado if isinstance(resultado, list) else json.loads(resultado)
+            tempos.append(plano[0]["Execution Time"])
+        resultados[nome] = {"tempo_ms": statistics.median(tempos), "plano": plano[0]["Plan"]}
+    return resultados
+
+"""
+Compara o tempo das consultas OLAP antes e depois de aplicar os índices secundários (gerar_sql_indices) e o ANALYZE.
+Os índices criados são mantidos
+
+Parâmetros:
+    conn (connection): Conexão com o banco do DW
+    brin (bool): Se True, usa BRIN em Fato_Publicacao.chaveTempo (padrão: False)
+    repeticoes (int): Número de execuções de cada consulta (padrão: 3)
+
+Retorna:
+    dict: { nome_consulta: {"antes_ms": float, "depois_ms": float, "aceleracao": float} }
+"""
+def comparar_desenho_fisico(conn, brin=False, repeticoes=3):
+    cur = conn.cursor()
+    analyzeDW(cur)
+    antes = medir_consultas(cur, repeticoes)
+
+    cur.execute(gerar_sql_indices(brin=brin))
+    analyzeDW(cur)
+    conn.commit()
+    depois = medir_consultas(cur, repeticoes)
+    cur.close()
+
+    comparacao = {}
+    for nome in CONSULTAS_OLAP:
+        t_antes, t_depois = antes[nome]["tempo_ms"], depois[nome]["tempo_ms"]
+        comparacao[nome] = {
+            "antes_ms": t_antes,
+            "depois_ms": t_depois,
+            "aceleracao": t_antes / t_depois if t_depois > 0 else float("inf")
+        }
+        print(f"{nome}: {t_antes:.2f} ms -> {t_depois:.2f} ms ({comparacao[nome]['aceleracao']:.1f}x)")
+    return comparacao
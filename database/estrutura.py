@@ -1,23 +1,44 @@
 import os
+import re
 import psycopg2
 from psycopg2 import sql
+from database.conexao import conectar
+
+# DuckDB é opcional: utilizado apenas pelo backend embarcado
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
 
 # Função para conectar ao banco de dados
 def connect_to_db():
     try:
-        # Conectar ao banco de dados PostgreSQL
-        conn = psycopg2.connect(
-            dbname=os.getenv("DB_NAME_PADRAO"),
-            user=os.getenv("DB_USER"),
-            password=os.getenv("DB_PASSWORD"),
-            host=os.getenv("DB_HOST")
-        )
-        conn.autocommit = True  # Para permitir criação do banco
-        return conn
+        # Conectar ao banco de dados PostgreSQL padrão, com autocommit para permitir criação do banco
+        return conectar(variavel_banco="DB_NAME_PADRAO", autocommit=True)
     except Exception as e:
         print(f"Erro ao conectar ao banco de dados: {e}")
         return None
 
+"""
+Abre (ou cria) um banco DuckDB embarcado, alternativa local ao PostgreSQL para construir o mesmo esquema estrela sem
+servidor nem credenciais
+
+Parâmetros:
+    caminho (str): Arquivo do banco DuckDB, ou ":memory:" para um banco em memória (padrão: "dw_projeto.duckdb")
+
+Retorna:
+    duckdb.DuckDBPyConnection: Conexão com o banco, ou None se ocorrer erro
+"""
+def connect_to_duckdb(caminho="dw_projeto.duckdb"):
+    if duckdb is None:
+        print("Erro ao conectar ao DuckDB: o pacote 'duckdb' não está instalado")
+        return None
+    try:
+        return duckdb.connect(caminho)
+    except Exception as e:
+        print(f"Erro ao conectar ao DuckDB: {e}")
+        return None
+
 # Criar o banco de dados, caso não exista
 def create_database(conn):
     try:
@@ -47,11 +68,14 @@ def run_sql_script(conn, script):
     except Exception as e:
         print(f"Erro ao executar o script SQL: {e}")
 
-# SQL script de criação das tabelas
-sql_script = """
--- Dropar tabelas, se necessário
-DROP TABLE IF EXISTS Fato_Publicacao, Ponte_PalavraChave, Dim_PalavraChave, Ponte_Instituicao, Dim_Instituicao, Ponte_Autor, Dim_Autor, Dim_TipoPublicacao, Dim_Tempo CASCADE;
+# Tabelas do DW, na ordem em que devem ser removidas
+TABELAS_DW = [
+    "Fato_Publicacao", "Ponte_PalavraChave", "Dim_PalavraChave", "Ponte_Instituicao", "Dim_Instituicao",
+    "Ponte_Autor", "Dim_Autor", "Dim_TipoPublicacao", "Dim_Tempo"
+]
 
+# SQL de criação das tabelas dimensionais
+sql_dimensoes = """
 -- Tabelas dimensionais
 CREATE TABLE Dim_Tempo (
     chaveTempo DATE NOT NULL PRIMARY KEY, 
@@ -86,7 +110,10 @@ CREATE TABLE Dim_PalavraChave (
     palavraChave TEXT NOT NULL UNIQUE,  
     subarea TEXT  
 );
+"""
 
+# SQL da fato e das pontes com o título como chave da publicação (modelo original)
+sql_fato_pontes_titulo = """
 -- Tabela fato, contém as medidas quantitativas e as chaves para as tabelas dimensionais
 CREATE TABLE Fato_Publicacao (
     titulo text PRIMARY KEY,
@@ -122,4 +149,202 @@ CREATE TABLE Ponte_PalavraChave (
     FOREIGN KEY (chavePublicacao) REFERENCES Fato_Publicacao(titulo) ON DELETE CASCADE,
     FOREIGN KEY (chavePalavraChave) REFERENCES Dim_PalavraChave(chavePalavraChave)
 );
-"""
\ No newline at end of file
+"""
+
+# SQL da fato e das pontes com chave substituta inteira; o título continua único (chave natural)
+sql_fato_pontes_chave_substituta = """
+-- Tabela fato, com chave substituta inteira e índice único sobre a chave natural (título)
+CREATE TABLE Fato_Publicacao (
+    chavePublicacao SERIAL PRIMARY KEY,
+    titulo TEXT NOT NULL,
+    chaveTempo DATE NOT NULL, 
+    chaveTipoPublicacao INT NOT NULL,
+    nome_revista TEXT NOT NULL,
+    edicao TEXT NOT NULL,
+    numero_acessos INT NOT NULL, 
+
+    CONSTRAINT unique_titulo UNIQUE (titulo),
+    FOREIGN KEY (chaveTempo) REFERENCES Dim_Tempo(chaveTempo),
+    FOREIGN KEY (chaveTipoPublicacao) REFERENCES Dim_TipoPublicacao(chaveTipoPublicacao)
+);
+CREATE TABLE Ponte_Autor (
+    chavePublicacao INT NOT NULL,
+    chaveAutor INT NOT NULL,
+    PRIMARY KEY (chavePublicacao, chaveAutor),
+    FOREIGN KEY (chavePublicacao) REFERENCES Fato_Publicacao(chavePublicacao) ON DELETE CASCADE,
+    FOREIGN KEY (chaveAutor) REFERENCES Dim_Autor(chaveAutor)
+);
+
+CREATE TABLE Ponte_Instituicao ( 
+    chavePublicacao INT NOT NULL,
+    chaveInstituicao INT NOT NULL,
+    PRIMARY KEY (chavePublicacao, chaveInstituicao),
+    FOREIGN KEY (chavePublicacao) REFERENCES Fato_Publicacao(chavePublicacao) ON DELETE CASCADE,
+    FOREIGN KEY (chaveInstituicao) REFERENCES Dim_Instituicao(chaveInstituicao)
+);
+
+CREATE TABLE Ponte_PalavraChave ( 
+    chavePublicacao INT NOT NULL,
+    chavePalavraChave INT NOT NULL,
+    PRIMARY KEY (chavePublicacao, chavePalavraChave),
+    FOREIGN KEY (chavePublicacao) REFERENCES Fato_Publicacao(chavePublicacao) ON DELETE CASCADE,
+    FOREIGN KEY (chavePalavraChave) REFERENCES Dim_PalavraChave(chavePalavraChave)
+);
+"""
+
+# SQL do registro das cargas (marca d'água), atualizado por toda carga (integracao.registrarCarga) e consultado pelo
+# cache das análises (database/analises.py)
+sql_registro_carga = """
+-- Registro das cargas
+CREATE TABLE IF NOT EXISTS Controle_Carga (
+    chaveCarga SERIAL PRIMARY KEY,
+    data_carga TIMESTAMPTZ NOT NULL DEFAULT now(),
+    arquivo TEXT,
+    publicacoes_novas INT NOT NULL,
+    publicacoes_alteradas INT NOT NULL
+);
+"""
+
+# SQL de controle da carga incremental: hash de cada publicação carregada e registro das cargas
+sql_controle_carga = """
+-- Controle da carga incremental
+ALTER TABLE Fato_Publicacao ADD COLUMN IF NOT EXISTS hash_registro TEXT;
+""" + sql_registro_carga
+
+# Tabelas de agregados pré-calculados (cubos consultados pelos painéis)
+TABELAS_AGREGADOS = ["Agg_Subarea_Ano", "Agg_Estado_Ano", "Agg_Instituicao_Ano"]
+
+# SQL de criação das tabelas de agregados, particionadas logicamente por ano para permitir a atualização parcial
+sql_agregados = """
+-- Agregados por subárea x ano, estado x ano e instituição x ano
+CREATE TABLE IF NOT EXISTS Agg_Subarea_Ano (
+    ano SMALLINT NOT NULL,
+    subarea TEXT NOT NULL,
+    total_publicacoes INT NOT NULL,
+    total_acessos BIGINT NOT NULL,
+    PRIMARY KEY (ano, subarea)
+);
+
+CREATE TABLE IF NOT EXISTS Agg_Estado_Ano (
+    ano SMALLINT NOT NULL,
+    estado TEXT NOT NULL,
+    total_publicacoes INT NOT NULL,
+    total_acessos BIGINT NOT NULL,
+    PRIMARY KEY (ano, estado)
+);
+
+CREATE TABLE IF NOT EXISTS Agg_Instituicao_Ano (
+    ano SMALLINT NOT NULL,
+    chaveInstituicao INT NOT NULL,
+    nome_instituicao TEXT NOT NULL,
+    estado TEXT,
+    total_publicacoes INT NOT NULL,
+    total_acessos BIGINT NOT NULL,
+    PRIMARY KEY (ano, chaveInstituicao)
+);
+"""
+
+"""
+Monta o script SQL de criação das tabelas do DW
+
+Parâmetros:
+    chave_substituta (bool): Se True, Fato_Publicacao usa uma chave inteira (chavePublicacao SERIAL) e as pontes a
+                             referenciam, em vez de repetir o título (padrão: False)
+    incremental (bool): Se True, não remove as tabelas existentes: cria apenas as que faltam e adiciona as estruturas de
+                        controle da carga incremental (padrão: False)
+    agregados (bool): Se True, cria também as tabelas de agregados (sql_agregados) (padrão: False)
+    backend (str): "postgres" ou "duckdb" (padrão: "postgres")
+
+Retorna:
+    str: Script SQL
+"""
+def gerar_sql_script(chave_substituta=False, incremental=False, agregados=False, backend="postgres"):
+    tabelas = sql_dimensoes + (sql_fato_pontes_chave_substituta if chave_substituta else sql_fato_pontes_titulo)
+    extras = sql_agregados if agregados else ""
+    if incremental:
+        script = tabelas.replace("CREATE TABLE ", "CREATE TABLE IF NOT EXISTS ") + sql_controle_carga + extras
+        return converter_sql_duckdb(script) if backend == "duckdb" else script
+    if backend == "duckdb":
+        # DuckDB remove uma tabela por comando e não possui CASCADE: as pontes são removidas antes da fato e das dimensões
+        ordem_remocao = sorted(TABELAS_DW, key=lambda t: (not t.startswith("Ponte"), t != "Fato_Publicacao"))
+        remocao = "\n".join(f"DROP TABLE IF EXISTS {t};" for t in ordem_remocao + TABELAS_AGREGADOS + ["Controle_Carga"])
+        script = converter_sql_duckdb(tabelas + sql_registro_carga + extras)
+        return "\n".join(["-- Dropar tabelas, se necessário", remocao, script])
+    partes = [
+        "-- Dropar tabelas, se necessário",
+        f"DROP TABLE IF EXISTS {', '.join(TABELAS_DW + TABELAS_AGREGADOS)}, Controle_Carga CASCADE;",
+        tabelas,
+        sql_registro_carga,
+        extras
+    ]
+    return "\n".join(partes)
+
+"""
+Adapta um script de criação de tabelas do PostgreSQL ao DuckDB: colunas SERIAL passam a usar uma sequência
+(seq_<tabela>) e ON DELETE CASCADE, não suportado pelo DuckDB, é removido
+
+Parâmetros:
+    script (str): Script SQL no dialeto do PostgreSQL
+
+Retorna:
+    str: Script SQL para o DuckDB
+"""
+def converter_sql_duckdb(script):
+    def converter_tabela(m):
+        criacao, tabela, corpo = m.group(1), m.group(2), m.group(3)
+        sequencia = f"seq_{tabela.lower()}"
+        if " SERIAL PRIMARY KEY" not in corpo:
+            return m.group(0)
+        corpo = re.sub(r"(\w+) SERIAL PRIMARY KEY", rf"\1 INTEGER PRIMARY KEY DEFAULT nextval('{sequencia}')", corpo)
+        return f"CREATE SEQUENCE IF NOT EXISTS {sequencia};\n{criacao}{tabela} ({corpo}"
+    script = re.sub(r"(CREATE TABLE (?:IF NOT EXISTS )?)(\w+) \((.*?\n\);)", converter_tabela, script, flags=re.S)
+    return script.replace(" ON DELETE CASCADE", "")
+
+"""
+Monta o script SQL do desenho físico opcional do DW: índices secundários nas chaves estrangeiras da fato e das pontes e nos
+atributos mais filtrados das dimensões. A fato não é particionada por ano, pois sua chave primária (título ou chave
+substituta) não inclui o ano e é referenciada pelas pontes; em seu lugar pode ser usado um índice BRIN em chaveTempo,
+adequado a uma tabela carregada aproximadamente em ordem de data
+
+Parâmetros:
+    brin (bool): Se True, indexa Fato_Publicacao.chaveTempo com BRIN em vez de B-tree (padrão: False)
+
+Retorna:
+    str: Script SQL (idempotente)
+"""
+def gerar_sql_indices(brin=False):
+    metodo_tempo = "BRIN" if brin else "BTREE"
+    return f"""
+-- Índices das pontes (a primeira coluna da chave primária já é indexada)
+CREATE INDEX IF NOT EXISTS idx_ponte_autor_chaveautor ON Ponte_Autor (chaveAutor);
+CREATE INDEX IF NOT EXISTS idx_ponte_instituicao_chaveinstituicao ON Ponte_Instituicao (chaveInstituicao);
+CREATE INDEX IF NOT EXISTS idx_ponte_palavrachave_chavepalavrachave ON Ponte_PalavraChave (chavePalavraChave);
+
+-- Índices da fato
+CREATE INDEX IF NOT EXISTS idx_fato_publicacao_chavetempo ON Fato_Publicacao USING {metodo_tempo} (chaveTempo);
+CREATE INDEX IF NOT EXISTS idx_fato_publicacao_chavetipopublicacao ON Fato_Publicacao (chaveTipoPublicacao);
+CREATE INDEX IF NOT EXISTS idx_fato_publicacao_nome_revista ON Fato_Publicacao (nome_revista);
+
+-- Índices dos atributos de agrupamento/filtro das dimensões
+CREATE INDEX IF NOT EXISTS idx_dim_tempo_ano ON Dim_Tempo (ano);
+CREATE INDEX IF NOT EXISTS idx_dim_palavrachave_subarea ON Dim_PalavraChave (subarea);
+CREATE INDEX IF NOT EXISTS idx_dim_instituicao_estado ON Dim_Instituicao (estado);
+"""
+
+# SQL script de criação das tabelas
+sql_script = gerar_sql_script()
+
+# SQL script de criação das tabelas com chave substituta na fato
+sql_script_chave_substituta = gerar_sql_script(chave_substituta=True)
+
+# SQL script que cria apenas as tabelas ausentes, para a carga incremental
+sql_script_incremental = gerar_sql_script(incremental=True)
+
+# SQL script de criação das tabelas de agregados (pode ser aplicado a um DW existente)
+sql_script_agregados = sql_agregados
+
+# SQL script de criação das tabelas no DuckDB embarcado
+sql_script_duckdb = gerar_sql_script(backend="duckdb")
+
+# SQL script dos índices secundários do DW
+sql_script_indices = gerar_sql_indices()
@@ -1,17 +1,149 @@
 import psycopg2
-import os
-from dotenv import load_dotenv
 import csv
+import io
+import time
+import uuid
+import concurrent.futures
+from psycopg2.extras import execute_values
+from database.estrutura import TABELAS_DW, TABELAS_AGREGADOS, sql_registro_carga
+from database.conexao import obter_pool
+from monitoramento.instrumentacao import instrumentacao
+
+# Colunas da tabela temporária, na mesma ordem do CSV de entrada (articles_dw.csv)
+COLUNAS_TEMP_PUBLI = [
+    "journal", "year", "volume", "edition_number", "publication_date", "publication_type", "title", "authors",
+    "keywords", "TotalAccess", "subareas", "year_extracted", "month_extracted", "day_extracted", "edition_id",
+    "instituicao", "cidade", "estado", "pais"
+]
+
+# Colunas do CSV utilizadas na limpeza das instituições
+COLUNAS_LOCALIDADE_CSV = ["Instituicao", "Cidade", "Estado", "Pais"]
+
+# Tabelas de staging. Por padrão são temporárias (visíveis apenas na sessão); na carga paralela são tabelas UNLOGGED
+# compartilhadas entre as conexões, com os nomes de STAGING_COMPARTILHADO acrescidos de um sufixo por execução
+# (ver stagingCompartilhado)
+STAGING_TEMP = {
+    "tipo": "TEMP",
+    "publicacoes": "Temp_Publicacoes",
+    "autores": "Temp_Autores",
+    "palavras": "Temp_PalavrasChave",
+    "instituicoes": "Temp_Instituicoes",
+    "chaves": "Temp_ChavesPublicacao"
+}
+STAGING_COMPARTILHADO = {
+    "tipo": "UNLOGGED",
+    "publicacoes": "Staging_Publicacoes",
+    "autores": "Staging_Autores",
+    "palavras": "Staging_PalavrasChave",
+    "instituicoes": "Staging_Instituicoes",
+    "chaves": "Staging_ChavesPublicacao"
+}
+
+"""
+Gera os nomes das tabelas de staging compartilhadas de uma carga, com um sufixo próprio da execução, para que cargas
+simultâneas (ex.: duas execuções de cargaParalela) não criem, carreguem e removam as mesmas tabelas
+
+Retorna:
+    dict: Nomes e tipo das tabelas de staging, no formato de STAGING_COMPARTILHADO
+"""
+def stagingCompartilhado():
+    sufixo = uuid.uuid4().hex[:8]
+    return {chave: nome if chave == "tipo" else f"{nome}_{sufixo}" for chave, nome in STAGING_COMPARTILHADO.items()}
+
+# Ordem das linhas de staging de um mesmo título ({p}: alias da tabela). DISTINCT ON (title) mantém a primeira (a de mais
+# acessos e, em empate, a de menor hash), de modo que o hash do delta e o upsert na fato escolhem sempre a mesma linha
+ORDEM_PUBLICACOES = "{p}.title, {p}.TotalAccess DESC NULLS LAST, md5(ROW({p}.*)::text)"
 
 def replace_empty_with_null(value):
     return None if value == '' else value
 
+"""
+Aplica a um registro do CSV a mesma limpeza feita no notebook antes da carga: descarta o registro se as colunas
+"Instituicao", "Cidade", "Estado" e "Pais" não tiverem o mesmo número de elementos e preenche as vazias com "sem valor"
+
+Parâmetros:
+    registro (dict): Linha do CSV (csv.DictReader)
+
+Retorna:
+    dict: Registro limpo, ou None se ele deve ser descartado
+"""
+def limpar_registro_dw(registro):
+    contagens = set()
+    for coluna in COLUNAS_LOCALIDADE_CSV:
+        valor = registro.get(coluna) or ""
+        contagens.add(len(valor.split(";")) if valor.strip() else 0)
+    if len(contagens) > 1:
+        return None
+    for coluna in COLUNAS_LOCALIDADE_CSV:
+        if not (registro.get(coluna) or ""):
+            registro[coluna] = "sem valor"
+    return registro
+
+"""
+Lê o CSV de entrada e gera as linhas na ordem de COLUNAS_TEMP_PUBLI, opcionalmente limpas com limpar_registro_dw()
+
+Parâmetros:
+    data_csv (str): Caminho do CSV
+    limpar (bool): Se True, aplica limpar_registro_dw() a cada registro
+
+Retorna:
+    generator: Listas de valores (strings) de cada linha
+"""
+def lerLinhasCSV(data_csv, limpar=False):
+    with open(data_csv, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        cabecalho = next(reader)  # Pular cabeçalho
+        for row in reader:
+            if limpar:
+                registro = limpar_registro_dw(dict(zip(cabecalho, row)))
+                if registro is None:
+                    continue
+                row = [registro[c] for c in cabecalho]
+            yield row
 
+"""
+Objeto com interface de arquivo (read) que serializa em CSV, sob demanda, as linhas de um gerador.
+Permite enviar as linhas ao COPY sem materializar o arquivo inteiro em memória
+"""
+class FluxoCSV(io.TextIOBase):
+    def __init__(self, linhas):
+        self.linhas = iter(linhas)
+        self.buffer = ""
+        self.saida = io.StringIO()
+        self.writer = csv.writer(self.saida, lineterminator="\n")
 
-def createTempPubli(cur):
+    def proxima_linha(self):
+        row = next(self.linhas, None)
+        if row is None:
+            return ""
+        self.saida.seek(0)
+        self.saida.truncate()
+        self.writer.writerow(row)
+        return self.saida.getvalue()
+
+    def read(self, size=-1):
+        while size < 0 or len(self.buffer) < size:
+            linha = self.proxima_linha()
+            if not linha:
+                break
+            self.buffer += linha
+        if size < 0:
+            dados, self.buffer = self.buffer, ""
+        else:
+            dados, self.buffer = self.buffer[:size], self.buffer[size:]
+        return dados
+
+"""
+Cria a tabela de staging das publicações (Temp_Publicacoes)
+
+Parâmetros:
+    cur (cursor): Cursor da conexão com o banco
+    staging (dict): Nomes e tipo das tabelas de staging (padrão: STAGING_TEMP)
+"""
+def createTempPubli(cur, staging=STAGING_TEMP):
     # Criar a tabela temporária
-    cur.execute("""
-        CREATE TEMP TABLE Temp_Publicacoes (
+    cur.execute(f"""
+        CREATE {staging['tipo']} TABLE {staging['publicacoes']} (
             journal TEXT,
             year INT,
             volume TEXT,
@@ -34,175 +166,933 @@ def createTempPubli(cur):
         );
     """)
 
-def insertTempPubli(cur, data_csv):
-    # Inserir dados na tabela temporária
-    with open("articles_dw.csv", "r", encoding="utf-8") as f:
-        reader = csv.reader(f)
-        next(reader)  # Pular cabeçalho
-        for row in reader:
-            row = [replace_empty_with_null(value) for value in row]
-            cur.execute("""
-                INSERT INTO Temp_Publicacoes (journal, year, volume, edition_number, publication_date, 
-                    publication_type, title, authors, keywords, TotalAccess, subareas, 
-                    year_extracted, month_extracted, day_extracted, edition_id, instituicao, cidade, estado, pais)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);
-            """, row)
-
-def insertIntoDimensions(cur):
-    # Inserção nas tabelas dimensionais
-    cur.execute("""
-        INSERT INTO Dim_Tempo (chaveTempo, decada, quinquenio, ano, mes)
-        SELECT DISTINCT 
-            publication_date AS chaveTempo,
-            EXTRACT(YEAR FROM publication_date)::SMALLINT / 10 * 10 AS decada,
-            EXTRACT(YEAR FROM publication_date)::SMALLINT / 5 * 5 AS quinquenio,
-            EXTRACT(YEAR FROM publication_date)::SMALLINT AS ano,
-            EXTRACT(MONTH FROM publication_date)::SMALLINT AS mes
-        FROM Temp_Publicacoes
-        WHERE publication_date IS NOT NULL
-        ON CONFLICT (chaveTempo) DO NOTHING;
-    """)
+"""
+Carrega o CSV na tabela de staging (Temp_Publicacoes) com COPY FROM STDIN. O arquivo é enviado em fluxo (sem limpeza, o próprio
+arquivo é repassado ao COPY); valores vazios são gravados como NULL. Se o COPY não estiver disponível, utiliza
+execute_values em lotes como alternativa. Ao final, informa o número de linhas e a taxa de linhas por segundo
 
-    cur.execute("""
-        INSERT INTO Dim_TipoPublicacao (tipo_publicacao)
-        SELECT DISTINCT publication_type
-        FROM Temp_Publicacoes
-        WHERE publication_type IS NOT NULL
-        ON CONFLICT (tipo_publicacao) DO NOTHING;
-    """)
+Parâmetros:
+    cur (cursor): Cursor da conexão com o banco
+    data_csv (str): Caminho do CSV de entrada (ex.: "articles_dw.csv")
+    limpar (bool): Se True, aplica limpar_registro_dw() antes da carga (padrão: False)
+    tamanho_lote (int): Número de linhas por lote no modo execute_values (padrão: 5000)
+    staging (dict): Nomes e tipo das tabelas de staging (padrão: STAGING_TEMP)
 
-    # Inserção na Dim_Autor separando os autores corretamente
-    cur.execute("""
-        INSERT INTO Dim_Autor (nome_autor)
-        SELECT DISTINCT TRIM(BOTH '"' FROM author_array.value) AS nome_autor
+Retorna:
+    int: Número de linhas carregadas
+"""
+@instrumentacao.cronometrar(linhas=int)
+def insertTempPubli(cur, data_csv, limpar=False, tamanho_lote=5000, staging=STAGING_TEMP):
+    inicio = time.perf_counter()
+    # SAVEPOINT só existe dentro de uma transação: com autocommit, a staging é esvaziada antes da alternativa
+    autocommit = cur.connection.autocommit
+    if not autocommit:
+        cur.execute("SAVEPOINT carga_temp_publi;")
+    try:
+        linhas = copyTempPubli(cur, data_csv, limpar, staging)
+        metodo = "COPY"
+    except psycopg2.Error as e:
+        print(f"COPY indisponível ({e}). Utilizando execute_values em lotes.")
+        if autocommit:
+            cur.execute(f"TRUNCATE {staging['publicacoes']};")
+        else:
+            cur.execute("ROLLBACK TO SAVEPOINT carga_temp_publi;")
+        linhas = executeValuesTempPubli(cur, data_csv, limpar, tamanho_lote, staging)
+        metodo = "execute_values"
+    if not autocommit:
+        cur.execute("RELEASE SAVEPOINT carga_temp_publi;")
+
+    duracao = time.perf_counter() - inicio
+    taxa = linhas / duracao if duracao > 0 else 0.0
+    print(f"{linhas} linhas carregadas em {staging['publicacoes']} via {metodo} em {duracao:.2f}s ({taxa:.0f} linhas/s)")
+    return linhas
+
+"""
+Envia o CSV para a tabela de staging (Temp_Publicacoes) com COPY FROM STDIN
+
+Parâmetros:
+    cur (cursor): Cursor da conexão com o banco
+    data_csv (str): Caminho do CSV de entrada
+    limpar (bool): Se True, aplica limpar_registro_dw() às linhas enviadas
+    staging (dict): Nomes e tipo das tabelas de staging (padrão: STAGING_TEMP)
+
+Retorna:
+    int: Número de linhas copiadas
+"""
+@instrumentacao.cronometrar(linhas=int)
+def copyTempPubli(cur, data_csv, limpar=False, staging=STAGING_TEMP):
+    if limpar:
+        return copyLinhasTempPubli(cur, lerLinhasCSV(data_csv, limpar=True), staging)
+    colunas = ", ".join(COLUNAS_TEMP_PUBLI)
+    comando = f"""
+        COPY {staging['publicacoes']} ({colunas})
+        FROM STDIN WITH (FORMAT csv, HEADER true, FORCE_NULL ({colunas}));
+    """
+    with open(data_csv, "r", encoding="utf-8", newline="") as f:
+        cur.copy_expert(comando, f)
+    return cur.rowcount
+
+"""
+Envia linhas já em memória (ex.: um lote do pipeline em fluxo) para a tabela de staging com COPY FROM STDIN, serializando-as
+em CSV sob demanda (FluxoCSV). Valores None ou vazios são gravados como NULL
+
+Parâmetros:
+    cur (cursor): Cursor da conexão com o banco
+    linhas (iterável): Listas de valores na ordem de COLUNAS_TEMP_PUBLI
+    staging (dict): Nomes e tipo das tabelas de staging (padrão: STAGING_TEMP)
+
+Retorna:
+    int: Número de linhas copiadas
+"""
+@instrumentacao.cronometrar(linhas=int)
+def copyLinhasTempPubli(cur, linhas, staging=STAGING_TEMP):
+    colunas = ", ".join(COLUNAS_TEMP_PUBLI)
+    cur.copy_expert(f"""
+        COPY {staging['publicacoes']} ({colunas})
+        FROM STDIN WITH (FORMAT csv, HEADER false, FORCE_NULL ({colunas}));
+    """, FluxoCSV(linhas))
+    return cur.rowcount
+
+"""
+Insere o CSV na tabela de staging (Temp_Publicacoes) com execute_values, em lotes de tamanho_lote linhas
+
+Parâmetros:
+    cur (cursor): Cursor da conexão com o banco
+    data_csv (str): Caminho do CSV de entrada
+    limpar (bool): Se True, aplica limpar_registro_dw() antes da inserção
+    tamanho_lote (int): Número de linhas por lote
+    staging (dict): Nomes e tipo das tabelas de staging (padrão: STAGING_TEMP)
+
+Retorna:
+    int: Número de linhas inseridas
+"""
+@instrumentacao.cronometrar(linhas=int)
+def executeValuesTempPubli(cur, data_csv, limpar=False, tamanho_lote=5000, staging=STAGING_TEMP):
+    comando = f"INSERT INTO {staging['publicacoes']} ({', '.join(COLUNAS_TEMP_PUBLI)}) VALUES %s"
+    total = 0
+    lote = []
+    for row in lerLinhasCSV(data_csv, limpar):
+        lote.append([replace_empty_with_null(value) for value in row])
+        if len(lote) >= tamanho_lote:
+            execute_values(cur, comando, lote, page_size=tamanho_lote)
+            total += len(lote)
+            lote = []
+    if lote:
+        execute_values(cur, comando, lote, page_size=tamanho_lote)
+        total += len(lote)
+    return total
+
+"""
+Explode uma única vez as colunas de autores, palavras-chave e instituições de Temp_Publicacoes em tabelas de staging
+indexadas no formato (título, valor normalizado, ordem). As inserções nas dimensões e nas pontes passam a ser joins
+simples (hash/índice) sobre essas tabelas, sem repetir o parsing das strings
+
+Parâmetros:
+    cur (cursor): Cursor da conexão com o banco
+    staging (dict): Nomes e tipo das tabelas de staging (padrão: STAGING_TEMP)
+"""
+@instrumentacao.cronometrar()
+def explodirTempPubli(cur, staging=STAGING_TEMP):
+    # Um comando por execute, para que cada um seja medido (e explicado, em benchmarks/benchmark_carga.py) separadamente
+    for chave in ["autores", "palavras", "instituicoes"]:
+        cur.execute(f"DROP TABLE IF EXISTS {staging[chave]};")
+
+    cur.execute(f"""
+        CREATE {staging['tipo']} TABLE {staging['autores']} AS
+        SELECT 
+            t.title,
+            TRIM(BOTH '"' FROM author_array.value) AS autor,
+            author_array.idx AS ordem
         FROM (
-            SELECT string_to_array(
+            SELECT title, string_to_array(
                 regexp_replace(authors, E'[^\\\w\\\s,]', '', 'g'),  -- Remove '[' e ']' e aspas simples ao redor
                 E', '  -- Usa ', ' como delimitador
             ) AS autores
-            FROM Temp_Publicacoes
+            FROM {staging['publicacoes']}
             WHERE authors IS NOT NULL
         ) t
-        JOIN LATERAL unnest(t.autores) AS author_array(value) ON true
-        ON CONFLICT (nome_autor) DO NOTHING;
+        JOIN LATERAL unnest(t.autores) WITH ORDINALITY AS author_array(value, idx) ON true;
     """)
 
-    cur.execute("""
-        INSERT INTO Dim_Instituicao (nome_instituicao, cidade, estado, pais)
-        SELECT DISTINCT 
+    # A subárea é associada pela posição; palavras-chave sem subárea correspondente ficam com subarea NULL
+    cur.execute(f"""
+        CREATE {staging['tipo']} TABLE {staging['palavras']} AS
+        SELECT 
+            t.title,
+            TRIM(BOTH '"' FROM keyword_array.value) AS palavra,
+            TRIM(BOTH '"' FROM subarea_array.value) AS subarea,
+            keyword_array.idx AS ordem
+        FROM (
+            SELECT 
+                title,
+                string_to_array(
+                    regexp_replace(keywords, E'[^\\\w\\\s,]', '', 'g'),  -- Remove '[' e ']' e aspas simples ao redor
+                    E', '  -- Usa ', ' como delimitador correto
+                ) AS palavras_chave,
+                string_to_array(
+                    regexp_replace(subareas, E'[^\\\w\\\s,]', '', 'g'),
+                    E', '
+                ) AS subareas_list
+            FROM {staging['publicacoes']}
+            WHERE keywords IS NOT NULL
+        ) t
+        JOIN LATERAL unnest(t.palavras_chave) WITH ORDINALITY AS keyword_array(value, idx) ON true
+        LEFT JOIN LATERAL unnest(t.subareas_list) WITH ORDINALITY AS subarea_array(value, idx) ON subarea_array.idx = keyword_array.idx;
+    """)
+
+    cur.execute(f"""
+        CREATE {staging['tipo']} TABLE {staging['instituicoes']} AS
+        SELECT 
+            t.title,
             TRIM(inst_array.value) AS nome_instituicao,
             TRIM(city_array.value) AS cidade,
             TRIM(state_array.value) AS estado,
-            TRIM(country_array.value) AS pais
+            TRIM(country_array.value) AS pais,
+            inst_array.idx AS ordem
         FROM (
             SELECT 
+                title,
                 string_to_array(instituicao, ';') AS instituicoes,
                 string_to_array(cidade, ';') AS cidades,
                 string_to_array(estado, ';') AS estados,
                 string_to_array(pais, ';') AS paises
-            FROM Temp_Publicacoes
+            FROM {staging['publicacoes']}
             WHERE instituicao IS NOT NULL
         ) t
         JOIN LATERAL unnest(t.instituicoes) WITH ORDINALITY AS inst_array(value, idx) ON true
         JOIN LATERAL unnest(t.cidades) WITH ORDINALITY AS city_array(value, idx) ON city_array.idx = inst_array.idx
         JOIN LATERAL unnest(t.estados) WITH ORDINALITY AS state_array(value, idx) ON state_array.idx = inst_array.idx
-        JOIN LATERAL unnest(t.paises) WITH ORDINALITY AS country_array(value, idx) ON country_array.idx = inst_array.idx
+        JOIN LATERAL unnest(t.paises) WITH ORDINALITY AS country_array(value, idx) ON country_array.idx = inst_array.idx;
+    """)
+
+    indices = {
+        "autores": ["autor", "title"],
+        "palavras": ["palavra", "title"],
+        "instituicoes": ["nome_instituicao, cidade, estado, pais", "title"]
+    }
+    for chave, colunas in indices.items():
+        for coluna in colunas:
+            nome = coluna.split(",")[0]
+            cur.execute(f"CREATE INDEX idx_{staging[chave]}_{nome} ON {staging[chave]} ({coluna});")
+        cur.execute(f"ANALYZE {staging[chave]};")
+
+def insertDimTempo(cur, staging=STAGING_TEMP):
+    cur.execute(f"""
+        INSERT INTO Dim_Tempo (chaveTempo, decada, quinquenio, ano, mes)
+        SELECT DISTINCT 
+            publication_date AS chaveTempo,
+            EXTRACT(YEAR FROM publication_date)::SMALLINT - EXTRACT(YEAR FROM publication_date)::SMALLINT % 10 AS decada,
+            EXTRACT(YEAR FROM publication_date)::SMALLINT - EXTRACT(YEAR FROM publication_date)::SMALLINT % 5 AS quinquenio,
+            EXTRACT(YEAR FROM publication_date)::SMALLINT AS ano,
+            EXTRACT(MONTH FROM publication_date)::SMALLINT AS mes
+        FROM {staging['publicacoes']}
+        WHERE publication_date IS NOT NULL
+        ON CONFLICT (chaveTempo) DO NOTHING;
+    """)
+
+def insertDimTipoPublicacao(cur, staging=STAGING_TEMP):
+    cur.execute(f"""
+        INSERT INTO Dim_TipoPublicacao (tipo_publicacao)
+        SELECT DISTINCT publication_type
+        FROM {staging['publicacoes']}
+        WHERE publication_type IS NOT NULL
+        ON CONFLICT (tipo_publicacao) DO NOTHING;
+    """)
+
+def insertDimAutor(cur, staging=STAGING_TEMP):
+    cur.execute(f"""
+        INSERT INTO Dim_Autor (nome_autor)
+        SELECT DISTINCT autor
+        FROM {staging['autores']}
+        ON CONFLICT (nome_autor) DO NOTHING;
+    """)
+
+def insertDimInstituicao(cur, staging=STAGING_TEMP):
+    cur.execute(f"""
+        INSERT INTO Dim_Instituicao (nome_instituicao, cidade, estado, pais)
+        SELECT DISTINCT nome_instituicao, cidade, estado, pais
+        FROM {staging['instituicoes']}
         ON CONFLICT (nome_instituicao, cidade, estado, pais) DO NOTHING;
     """)
 
-    # Inserção na Dim_PalavraChave separando palavras-chave corretamente
-    cur.execute("""
+def insertDimPalavraChave(cur, staging=STAGING_TEMP):
+    cur.execute(f"""
         INSERT INTO Dim_PalavraChave (palavraChave, subarea)
-        SELECT DISTINCT 
-            TRIM(BOTH '"' FROM keyword_array.value) AS palavraChave,
-            TRIM(BOTH '"' FROM subarea_array.value) AS subarea
-        FROM (
-            SELECT 
-                string_to_array(
-                    regexp_replace(keywords, E'[^\\\w\\\s,]', '', 'g'),  -- Remove '[' e ']' e aspas simples ao redor
-                    E', '  -- Usa ', ' como delimitador correto
-                ) AS palavras_chave,
-                string_to_array(
-                    regexp_replace(subareas, E'[^\\\w\\\s,]', '', 'g'),
-                    E', '
-                ) AS subareas_list
-            FROM Temp_Publicacoes
-            WHERE keywords IS NOT NULL
-        ) t
-        JOIN LATERAL unnest(t.palavras_chave) WITH ORDINALITY AS keyword_array(value, idx) ON true
-        JOIN LATERAL unnest(t.subareas_list) WITH ORDINALITY AS subarea_array(value, idx) ON subarea_array.idx = keyword_array.idx
+        SELECT DISTINCT palavra, subarea
+        FROM {staging['palavras']}
+        WHERE subarea IS NOT NULL
         ON CONFLICT (palavraChave) DO NOTHING;
     """)
 
-def insertIntoFato(cur):
+# Funções de carga de cada dimensão; são independentes entre si e podem ser executadas em paralelo
+FUNCOES_DIMENSOES = [insertDimTempo, insertDimTipoPublicacao, insertDimAutor, insertDimInstituicao, insertDimPalavraChave]
+
+@instrumentacao.cronometrar()
+def insertIntoDimensions(cur, staging=STAGING_TEMP):
+    # Inserção nas tabelas dimensionais (autores, instituições e palavras-chave vêm das tabelas explodidas por explodirTempPubli)
+    for funcao in FUNCOES_DIMENSOES:
+        funcao(cur, staging)
+
+"""
+Insere as publicações de Temp_Publicacoes na Fato_Publicacao
+
+Parâmetros:
+    cur (cursor): Cursor da conexão com o banco
+    atualizar (bool): Se True, publicações já existentes têm seus atributos (incluindo numero_acessos) atualizados
+                      (upsert); caso contrário são ignoradas (padrão: False)
+    staging (dict): Nomes e tipo das tabelas de staging (padrão: STAGING_TEMP)
+"""
+@instrumentacao.cronometrar()
+def insertIntoFato(cur, atualizar=False, staging=STAGING_TEMP):
+    if atualizar:
+        # Com DO UPDATE cada título só pode aparecer uma vez no comando
+        selecao = "SELECT DISTINCT ON (p.title)"
+        ordem = f"ORDER BY {ORDEM_PUBLICACOES.format(p='p')}"
+        conflito = """DO UPDATE SET
+        chaveTempo = EXCLUDED.chaveTempo,
+        chaveTipoPublicacao = EXCLUDED.chaveTipoPublicacao,
+        nome_revista = EXCLUDED.nome_revista,
+        edicao = EXCLUDED.edicao,
+        numero_acessos = EXCLUDED.numero_acessos"""
+    else:
+        selecao = "SELECT"
+        ordem = ""
+        conflito = "DO NOTHING"
+
     # Inserção na Fato_Publicacao
-    cur.execute("""
+    cur.execute(f"""
         INSERT INTO Fato_Publicacao (titulo, chaveTempo, chaveTipoPublicacao, nome_revista, edicao, numero_acessos)
-    SELECT 
+    {selecao} 
         p.title AS titulo,
         p.publication_date AS chaveTempo,
         tp.chaveTipoPublicacao AS chaveTipoPublicacao,
         p.journal AS nome_revista,
         p.edition_id AS edicao,
         p.TotalAccess AS numero_acessos
-    FROM Temp_Publicacoes p
+    FROM {staging['publicacoes']} p
     JOIN Dim_TipoPublicacao tp ON p.publication_type = tp.tipo_publicacao
     WHERE p.publication_date IS NOT NULL
-    ON CONFLICT (titulo) DO NOTHING;
+    {ordem}
+    ON CONFLICT (titulo) {conflito};
     """)
 
-def insertIntoPontes(cur):
+"""
+Verifica se o DW foi criado com chave substituta inteira em Fato_Publicacao (gerar_sql_script(chave_substituta=True))
+
+Parâmetros:
+    cur (cursor): Cursor da conexão com o banco
+
+Retorna:
+    bool: True se Fato_Publicacao possui a coluna chavePublicacao
+"""
+def usaChaveSubstituta(cur):
     cur.execute("""
+        SELECT 1
+        FROM information_schema.columns
+        WHERE table_schema = current_schema()
+            AND lower(table_name) = 'fato_publicacao'
+            AND lower(column_name) = 'chavepublicacao';
+    """)
+    return cur.fetchone() is not None
+
+"""
+Resolve em lote a chave de cada publicação carregada, criando a tabela de staging Temp_ChavesPublicacao (titulo,
+chavePublicacao). No modelo original a chave é o próprio título; com chave substituta é o inteiro de Fato_Publicacao
+
+Parâmetros:
+    cur (cursor): Cursor da conexão com o banco
+    chave_substituta (bool): Modelo do DW. Se None, é detectado com usaChaveSubstituta()
+    staging (dict): Nomes e tipo das tabelas de staging (padrão: STAGING_TEMP)
+"""
+def resolverChavesPublicacao(cur, chave_substituta=None, staging=STAGING_TEMP):
+    if chave_substituta is None:
+        chave_substituta = usaChaveSubstituta(cur)
+    coluna_chave = "fp.chavePublicacao" if chave_substituta else "fp.titulo"
+    cur.execute(f"DROP TABLE IF EXISTS {staging['chaves']};")
+    cur.execute(f"""
+        CREATE {staging['tipo']} TABLE {staging['chaves']} AS
+        SELECT fp.titulo, {coluna_chave} AS chavePublicacao
+        FROM Fato_Publicacao fp
+        WHERE fp.titulo IN (SELECT title FROM {staging['publicacoes']});
+    """)
+    cur.execute(f"CREATE UNIQUE INDEX idx_{staging['chaves']}_titulo ON {staging['chaves']} (titulo);")
+    cur.execute(f"ANALYZE {staging['chaves']};")
+
+def insertPonteAutor(cur, staging=STAGING_TEMP):
+    cur.execute(f"""
     INSERT INTO Ponte_Autor (chavePublicacao, chaveAutor)
-    SELECT 
-        fp.titulo AS chavePublicacao,
+    SELECT DISTINCT
+        cp.chavePublicacao,
         da.chaveAutor
-    FROM Fato_Publicacao fp
-    JOIN Temp_Publicacoes tp ON tp.title = fp.titulo
-    JOIN Dim_Autor da ON TRUE
-    JOIN LATERAL (
-        SELECT unnest(
-            string_to_array(
-                replace(replace(replace(tp.authors, '[', ''), ']', ''), '''', ''), 
-                ', '
-            )
-        ) AS autor
-    ) autor_extraido ON TRIM(da.nome_autor) = TRIM(autor_extraido.autor)
+    FROM {staging['autores']} ta
+    JOIN {staging['chaves']} cp ON cp.titulo = ta.title
+    JOIN Dim_Autor da ON da.nome_autor = ta.autor
     ON CONFLICT DO NOTHING;
-
     """)
 
-    cur.execute("""
+def insertPonteInstituicao(cur, staging=STAGING_TEMP):
+    cur.execute(f"""
     INSERT INTO Ponte_Instituicao (chavePublicacao, chaveInstituicao)
-    SELECT 
-        fp.titulo AS chavePublicacao,
+    SELECT DISTINCT
+        cp.chavePublicacao,
         di.chaveInstituicao
-    FROM Fato_Publicacao fp
-    JOIN Temp_Publicacoes tp ON tp.title = fp.titulo
-    JOIN LATERAL unnest(
-        string_to_array(tp.instituicao, ';')
-    ) AS instituicao_extraida(nome_instituicao) ON TRUE
-    JOIN Dim_Instituicao di 
-    ON TRIM(di.nome_instituicao) = TRIM(instituicao_extraida.nome_instituicao)
+    FROM {staging['instituicoes']} ti
+    JOIN {staging['chaves']} cp ON cp.titulo = ti.title
+    JOIN Dim_Instituicao di
+        ON di.nome_instituicao = ti.nome_instituicao
+        AND di.cidade = ti.cidade
+        AND di.estado = ti.estado
+        AND di.pais = ti.pais
     ON CONFLICT DO NOTHING;
-
     """)
 
-    cur.execute("""
+def insertPontePalavraChave(cur, staging=STAGING_TEMP):
+    cur.execute(f"""
     INSERT INTO Ponte_PalavraChave (chavePublicacao, chavePalavraChave)
-    SELECT 
-        fp.titulo AS chavePublicacao,
+    SELECT DISTINCT
+        cp.chavePublicacao,
         dpk.chavePalavraChave
-    FROM Fato_Publicacao fp
-    JOIN Temp_Publicacoes tp ON tp.title = fp.titulo
-    JOIN LATERAL unnest(
-        string_to_array(
-            regexp_replace(tp.keywords, E'[^\\\w\\\s,]', '', 'g'), 
-            E', '
-        )
-    ) AS palavra_extraida(palavraChave) ON TRUE
-    JOIN Dim_PalavraChave dpk 
-    ON TRIM(dpk.palavraChave) = TRIM(palavra_extraida.palavraChave)
+    FROM {staging['palavras']} tpk
+    JOIN {staging['chaves']} cp ON cp.titulo = tpk.title
+    JOIN Dim_PalavraChave dpk ON dpk.palavraChave = tpk.palavra
     ON CONFLICT DO NOTHING;
+    """)
 
+# Funções de carga de cada ponte; dependem apenas da fato, das dimensões e das chaves resolvidas
+FUNCOES_PONTES = [insertPonteAutor, insertPonteInstituicao, insertPontePalavraChave]
+
+"""
+Remove das pontes as linhas das publicações carregadas (resolvidas em Temp_ChavesPublicacao)
+
+Parâmetros:
+    cur (cursor): Cursor da conexão com o banco
+    staging (dict): Nomes e tipo das tabelas de staging (padrão: STAGING_TEMP)
+"""
+def deletePontesCarregadas(cur, staging=STAGING_TEMP):
+    for ponte in ["Ponte_Autor", "Ponte_Instituicao", "Ponte_PalavraChave"]:
+        cur.execute(f"""
+            DELETE FROM {ponte}
+            WHERE chavePublicacao IN (SELECT chavePublicacao FROM {staging['chaves']});
+        """)
+
+"""
+Insere as pontes de autores, instituições e palavras-chave das publicações carregadas
+
+Parâmetros:
+    cur (cursor): Cursor da conexão com o banco
+    chave_substituta (bool): Modelo do DW. Se None, é detectado com usaChaveSubstituta()
+    substituir (bool): Se True, remove antes as linhas das pontes das publicações carregadas, para que reflitam os dados
+                       atuais (usado na carga incremental) (padrão: False)
+    staging (dict): Nomes e tipo das tabelas de staging (padrão: STAGING_TEMP)
+"""
+@instrumentacao.cronometrar()
+def insertIntoPontes(cur, chave_substituta=None, substituir=False, staging=STAGING_TEMP):
+    resolverChavesPublicacao(cur, chave_substituta, staging)
+
+    if substituir:
+        deletePontesCarregadas(cur, staging)
+
+    # As pontes são joins por igualdade entre as tabelas explodidas, as chaves resolvidas e as dimensões
+    for funcao in FUNCOES_PONTES:
+        funcao(cur, staging)
+
+"""
+Carga incremental: carrega o CSV em Temp_Publicacoes, mantém apenas as publicações novas ou alteradas (comparando um hash
+de cada linha com o hash_registro gravado na fato), atualiza dimensões, fato (upsert de numero_acessos e demais atributos)
+e apenas as pontes das publicações afetadas, e registra a carga em Controle_Carga (marca d'água).
+O DW deve ter sido criado com gerar_sql_script(incremental=True) (estrutura.sql_script_incremental)
+
+Parâmetros:
+    cur (cursor): Cursor da conexão com o banco
+    data_csv (str): Caminho do CSV de entrada (ex.: "articles_dw.csv")
+    limpar (bool): Se True, aplica limpar_registro_dw() antes da carga (padrão: False)
+    atualizar_agregados (bool): Se True, recalcula as tabelas de agregados apenas para os anos afetados pelo delta
+                                (padrão: False)
+    staging (dict): Nomes e tipo das tabelas de staging (padrão: STAGING_TEMP)
+
+Retorna:
+    dict: Com chaves "novas", "alteradas", "anos" e "chaveCarga"
+"""
+@instrumentacao.cronometrar()
+def insertIncremental(cur, data_csv, limpar=False, atualizar_agregados=False, staging=STAGING_TEMP):
+    createTempPubli(cur, staging)
+    insertTempPubli(cur, data_csv, limpar=limpar, staging=staging)
+
+    # Delta: publicações ausentes da fato ou com hash diferente do registrado
+    cur.execute("DROP TABLE IF EXISTS Temp_Delta;")
+    cur.execute(f"""
+        CREATE TEMP TABLE Temp_Delta AS
+        SELECT 
+            h.title,
+            h.hash_registro,
+            fp.titulo IS NULL AS nova
+        FROM (
+            SELECT DISTINCT ON (tp.title) tp.title, md5(ROW(tp.*)::text) AS hash_registro
+            FROM {staging['publicacoes']} tp
+            WHERE tp.title IS NOT NULL AND tp.publication_date IS NOT NULL
+            ORDER BY {ORDEM_PUBLICACOES.format(p='tp')}
+        ) h
+        LEFT JOIN Fato_Publicacao fp ON fp.titulo = h.title
+        WHERE fp.titulo IS NULL OR fp.hash_registro IS DISTINCT FROM h.hash_registro;
+    """)
+    cur.execute("CREATE UNIQUE INDEX idx_Temp_Delta_title ON Temp_Delta (title);")
+    cur.execute("ANALYZE Temp_Delta;")
+    cur.execute(f"""
+        DELETE FROM {staging['publicacoes']} tp
+        WHERE NOT EXISTS (SELECT 1 FROM Temp_Delta d WHERE d.title = tp.title);
     """)
+    cur.execute("SELECT COUNT(*) FILTER (WHERE nova), COUNT(*) FILTER (WHERE NOT nova) FROM Temp_Delta;")
+    novas, alteradas = cur.fetchone()
+
+    # Anos afetados: os das publicações do delta e, para as alteradas, também o ano anterior à atualização
+    cur.execute(f"""
+        SELECT DISTINCT EXTRACT(YEAR FROM publication_date)::INT FROM {staging['publicacoes']}
+        UNION
+        SELECT DISTINCT EXTRACT(YEAR FROM fp.chaveTempo)::INT
+        FROM Fato_Publicacao fp
+        JOIN Temp_Delta d ON d.title = fp.titulo;
+    """)
+    anos = sorted(ano for (ano,) in cur.fetchall() if ano is not None)
+
+    if novas or alteradas:
+        explodirTempPubli(cur, staging)
+        insertIntoDimensions(cur, staging)
+        insertIntoFato(cur, atualizar=True, staging=staging)
+        cur.execute("""
+            UPDATE Fato_Publicacao fp
+            SET hash_registro = d.hash_registro
+            FROM Temp_Delta d
+            WHERE fp.titulo = d.title;
+        """)
+        insertIntoPontes(cur, substituir=True, staging=staging)
+        if atualizar_agregados:
+            atualizarAgregados(cur, anos)
+
+    chave_carga = registrarCarga(cur, data_csv, novas, alteradas)
+    print(f"Carga incremental {chave_carga}: {novas} publicações novas e {alteradas} alteradas")
+    return {"novas": novas, "alteradas": alteradas, "anos": anos, "chaveCarga": chave_carga}
+
+"""
+Registra uma carga em Controle_Carga, avançando a marca d'água que invalida o cache das análises (database/analises.py)
+Chamada por todas as cargas, na mesma transação dos dados; a tabela é criada se o DW for anterior a ela
+
+Parâmetros:
+    cur (cursor): Cursor da conexão com o banco
+    arquivo (str): CSV carregado
+    novas (int): Publicações novas. Se None, conta as publicações do arquivo presentes na fato (carga completa)
+    alteradas (int): Publicações alteradas (padrão: 0)
+    staging (dict): Tabelas de staging da carga, utilizadas na contagem das novas (padrão: STAGING_TEMP)
+
+Retorna:
+    int: chaveCarga da carga registrada
+"""
+def registrarCarga(cur, arquivo, novas=None, alteradas=0, staging=STAGING_TEMP):
+    cur.execute(sql_registro_carga)
+    if novas is None:
+        cur.execute(f"SELECT COUNT(*) FROM {staging['chaves']};")
+        novas = cur.fetchone()[0]
+    cur.execute("""
+        INSERT INTO Controle_Carga (arquivo, publicacoes_novas, publicacoes_alteradas)
+        VALUES (%s, %s, %s)
+        RETURNING chaveCarga;
+    """, (arquivo, novas, alteradas))
+    return cur.fetchone()[0]
+
+"""
+Retorna a marca d'água da última carga registrada em Controle_Carga
+
+Parâmetros:
+    cur (cursor): Cursor da conexão com o banco
+    verificar_tabela (bool): Se True, verifica antes se Controle_Carga existe (DW criado antes do registro das cargas)
+                             (padrão: True)
+
+Retorna:
+    tupla: (chaveCarga, data_carga) da última carga, ou None se nenhuma carga foi registrada
+"""
+def ultimaCarga(cur, verificar_tabela=True):
+    if verificar_tabela:
+        cur.execute("SELECT to_regclass('controle_carga') IS NOT NULL;")
+        if not cur.fetchone()[0]:
+            return None
+    cur.execute("SELECT chaveCarga, data_carga FROM Controle_Carga ORDER BY chaveCarga DESC LIMIT 1;")
+    return cur.fetchone()
+
+"""
+Atualiza as estatísticas do otimizador (ANALYZE) das tabelas do DW. Deve ser executado após cada carga, para que os planos
+das consultas analíticas considerem os volumes e índices atuais
+
+Parâmetros:
+    cur (cursor): Cursor da conexão com o banco
+"""
+def analyzeDW(cur):
+    for tabela in TABELAS_DW:
+        cur.execute(f"ANALYZE {tabela};")
+
+"""
+Recalcula as tabelas de agregados (estrutura.sql_agregados). Com anos informados, apenas as linhas desses anos são
+removidas e recalculadas; caso contrário, os agregados são reconstruídos por completo.
+As publicações são contadas uma única vez por célula do cubo, mesmo com várias palavras-chave/instituições na mesma célula
+
+Parâmetros:
+    cur (cursor): Cursor da conexão com o banco
+    anos (list): Anos a recalcular. Se None, recalcula todos
+    chave_substituta (bool): Modelo do DW. Se None, é detectado com usaChaveSubstituta()
+"""
+@instrumentacao.cronometrar()
+def atualizarAgregados(cur, anos=None, chave_substituta=None):
+    if chave_substituta is None:
+        chave_substituta = usaChaveSubstituta(cur)
+    chave_fato = "fp.chavePublicacao" if chave_substituta else "fp.titulo"
+
+    if anos is None:
+        cur.execute(f"TRUNCATE {', '.join(TABELAS_AGREGADOS)};")
+        filtro = "TRUE"
+    else:
+        anos = list(anos)
+        if not anos:
+            return
+        for tabela in TABELAS_AGREGADOS:
+            cur.execute(f"DELETE FROM {tabela} WHERE ano = ANY(%s);", (anos,))
+        filtro = "dt.ano = ANY(%(anos)s)"
+    parametros = {"anos": anos}
+
+    cur.execute(f"""
+        INSERT INTO Agg_Subarea_Ano (ano, subarea, total_publicacoes, total_acessos)
+        SELECT ano, subarea, COUNT(*), COALESCE(SUM(numero_acessos), 0)
+        FROM (
+            SELECT DISTINCT dt.ano, dp.subarea, {chave_fato} AS chave, fp.numero_acessos
+            FROM Fato_Publicacao fp
+            JOIN Dim_Tempo dt ON fp.chaveTempo = dt.chaveTempo
+            JOIN Ponte_PalavraChave pp ON pp.chavePublicacao = {chave_fato}
+            JOIN Dim_PalavraChave dp ON pp.chavePalavraChave = dp.chavePalavraChave
+            WHERE dp.subarea IS NOT NULL AND {filtro}
+        ) t
+        GROUP BY ano, subarea;
+    """, parametros)
+
+    cur.execute(f"""
+        INSERT INTO Agg_Estado_Ano (ano, estado, total_publicacoes, total_acessos)
+        SELECT ano, estado, COUNT(*), COALESCE(SUM(numero_acessos), 0)
+        FROM (
+            SELECT DISTINCT dt.ano, di.estado, {chave_fato} AS chave, fp.numero_acessos
+            FROM Fato_Publicacao fp
+            JOIN Dim_Tempo dt ON fp.chaveTempo = dt.chaveTempo
+            JOIN Ponte_Instituicao pi ON pi.chavePublicacao = {chave_fato}
+            JOIN Dim_Instituicao di ON pi.chaveInstituicao = di.chaveInstituicao
+            WHERE di.estado IS NOT NULL AND {filtro}
+        ) t
+        GROUP BY ano, estado;
+    """, parametros)
+
+    cur.execute(f"""
+        INSERT INTO Agg_Instituicao_Ano (ano, chaveInstituicao, nome_instituicao, estado, total_publicacoes, total_acessos)
+        SELECT dt.ano, di.chaveInstituicao, di.nome_instituicao, di.estado, COUNT(*), COALESCE(SUM(fp.numero_acessos), 0)
+        FROM Fato_Publicacao fp
+        JOIN Dim_Tempo dt ON fp.chaveTempo = dt.chaveTempo
+        JOIN Ponte_Instituicao pi ON pi.chavePublicacao = {chave_fato}
+        JOIN Dim_Instituicao di ON pi.chaveInstituicao = di.chaveInstituicao
+        WHERE {filtro}
+        GROUP BY dt.ano, di.chaveInstituicao, di.nome_instituicao, di.estado;
+    """, parametros)
+
+    for tabela in TABELAS_AGREGADOS:
+        cur.execute(f"ANALYZE {tabela};")
+
+"""
+Retorna o pool de conexões compartilhado do banco do DW (database/conexao.py), configurado pelas variáveis de ambiente (.env)
+
+Parâmetros:
+    conexoes (int): Número de conexões que o pool deve comportar
+
+Retorna:
+    ThreadedConnectionPool: Pool de conexões
+"""
+def criarPoolConexoes(conexoes):
+    return obter_pool(maximo=conexoes)
+
+"""
+Remove as tabelas de staging
+
+Parâmetros:
+    cur (cursor): Cursor da conexão com o banco
+    staging (dict): Nomes e tipo das tabelas de staging
+"""
+def dropStaging(cur, staging=STAGING_TEMP):
+    for chave in ["publicacoes", "autores", "palavras", "instituicoes", "chaves"]:
+        cur.execute(f"DROP TABLE IF EXISTS {staging[chave]};")
+
+"""
+Prepara as tabelas de staging: cria a tabela das publicações, carrega o CSV e explode autores, palavras-chave e instituições
+
+Parâmetros:
+    cur (cursor): Cursor da conexão com o banco
+    data_csv (str): Caminho do CSV de entrada
+    limpar (bool): Se True, aplica limpar_registro_dw() antes da carga
+    staging (dict): Nomes e tipo das tabelas de staging
+"""
+def prepararStaging(cur, data_csv, limpar=False, staging=STAGING_TEMP):
+    dropStaging(cur, staging)
+    createTempPubli(cur, staging)
+    insertTempPubli(cur, data_csv, limpar=limpar, staging=staging)
+    cur.execute(f"CREATE INDEX idx_{staging['publicacoes']}_title ON {staging['publicacoes']} (title); ANALYZE {staging['publicacoes']};")
+    explodirTempPubli(cur, staging)
+
+"""
+Executa tarefas de carga em paralelo, cada uma em uma conexão do pool e em sua própria transação, respeitando as
+dependências entre elas: uma tarefa só é iniciada quando todas as suas dependências terminaram
+
+Parâmetros:
+    pool (ThreadedConnectionPool): Pool de conexões
+    tarefas (dict): { nome: (funcao, argumentos, dependencias) }; funcao é chamada como funcao(cur, *argumentos)
+    max_workers (int): Número máximo de tarefas simultâneas (limitado ao tamanho do pool)
+
+Retorna:
+    dict: { nome: tempo de execução em segundos }
+"""
+def executarTarefasParalelas(pool, tarefas, max_workers):
+    def executar(nome, funcao, argumentos):
+        inicio = time.perf_counter()
+        conn = pool.getconn()
+        try:
+            cur = conn.cursor()
+            funcao(cur, *argumentos)
+            conn.commit()
+            cur.close()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            pool.putconn(conn)
+        duracao = time.perf_counter() - inicio
+        print(f"  {nome}: {duracao:.2f}s")
+        return duracao
+
+    tempos = {}
+    pendentes = dict(tarefas)
+    max_workers = min(max_workers, pool.maxconn)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        em_execucao = {}
+        while pendentes or em_execucao:
+            prontas = [n for n, (_, _, deps) in pendentes.items() if all(d in tempos for d in deps)]
+            for nome in prontas:
+                funcao, argumentos, _ = pendentes.pop(nome)
+                em_execucao[executor.submit(executar, nome, funcao, argumentos)] = nome
+            if not em_execucao:
+                raise ValueError(f"Dependências não satisfeitas: {sorted(pendentes)}")
+            concluidas, _ = concurrent.futures.wait(em_execucao, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in concluidas:
+                tempos[em_execucao.pop(future)] = future.result()
+    return tempos
+
+"""
+Carga paralela do DW: o CSV é carregado uma única vez em tabelas de staging UNLOGGED compartilhadas entre as conexões
+(com nomes próprios da execução, ver stagingCompartilhado) e as dimensões são carregadas concorrentemente em um pequeno
+pool de conexões. A fato é iniciada assim que Dim_Tempo e Dim_TipoPublicacao terminam, e cada ponte assim que a fato
+(com as chaves resolvidas) e sua dimensão terminam. Informa o tempo de parede de cada etapa e tarefa
+
+Parâmetros:
+    data_csv (str): Caminho do CSV de entrada (ex.: "articles_dw.csv")
+    conexoes (int): Tamanho do pool de conexões (padrão: 5)
+    limpar (bool): Se True, aplica limpar_registro_dw() antes da carga (padrão: False)
+    chave_substituta (bool): Modelo do DW. Se None, é detectado com usaChaveSubstituta()
+
+Retorna:
+    dict: { etapa/tarefa: tempo em segundos }, incluindo "staging", "carga_paralela" e "total"
+"""
+def cargaParalela(data_csv, conexoes=5, limpar=False, chave_substituta=None):
+    staging = stagingCompartilhado()
+    pool = criarPoolConexoes(conexoes)
+    inicio_total = time.perf_counter()
+    tempos = {}
+    try:
+        print("Etapa staging")
+        tempos.update(executarTarefasParalelas(pool, {
+            "staging": (prepararStaging, (data_csv, limpar, staging), [])
+        }, 1))
+
+        print("Etapa dimensões, fato e pontes")
+        inicio = time.perf_counter()
+        tarefas = {
+            "Dim_Tempo": (insertDimTempo, (staging,), []),
+            "Dim_TipoPublicacao": (insertDimTipoPublicacao, (staging,), []),
+            "Dim_Autor": (insertDimAutor, (staging,), []),
+            "Dim_Instituicao": (insertDimInstituicao, (staging,), []),
+            "Dim_PalavraChave": (insertDimPalavraChave, (staging,), []),
+            "Fato_Publicacao": (insertIntoFato, (False, staging), ["Dim_Tempo", "Dim_TipoPublicacao"]),
+            "chaves": (resolverChavesPublicacao, (chave_substituta, staging), ["Fato_Publicacao"]),
+            "Ponte_Autor": (insertPonteAutor, (staging,), ["chaves", "Dim_Autor"]),
+            "Ponte_Instituicao": (insertPonteInstituicao, (staging,), ["chaves", "Dim_Instituicao"]),
+            "Ponte_PalavraChave": (insertPontePalavraChave, (staging,), ["chaves", "Dim_PalavraChave"]),
+            # A marca d'água só avança depois que todas as tarefas confirmaram seus dados
+            "Controle_Carga": (registrarCarga, (data_csv, None, 0, staging),
+                               ["Ponte_Autor", "Ponte_Instituicao", "Ponte_PalavraChave"])
+        }
+        tempos.update(executarTarefasParalelas(pool, tarefas, conexoes))
+        tempos["carga_paralela"] = time.perf_counter() - inicio
+    finally:
+        executarTarefasParalelas(pool, {"limpeza": (dropStaging, (staging,), [])}, 1)
+
+    tempos["total"] = time.perf_counter() - inicio_total
+    print(f"Carga paralela concluída em {tempos['total']:.2f}s (dimensões, fato e pontes: {tempos['carga_paralela']:.2f}s)")
+    return tempos
+
+"""
+Lista os índices secundários (que não sustentam chaves primárias ou restrições UNIQUE) e as chaves estrangeiras das
+tabelas do DW, com as definições necessárias para recriá-los
+
+Parâmetros:
+    cur (cursor): Cursor da conexão com o banco
+
+Retorna:
+    tupla: (indices, chaves_estrangeiras), com indices = [(nome, definicao)] e
+           chaves_estrangeiras = [(tabela, nome, definicao)]
+"""
+def listarIndicesEChavesEstrangeiras(cur):
+    tabelas = [t.lower() for t in TABELAS_DW]
+    cur.execute("""
+        SELECT ci.relname, pg_get_indexdef(i.indexrelid)
+        FROM pg_index i
+        JOIN pg_class ct ON ct.oid = i.indrelid
+        JOIN pg_class ci ON ci.oid = i.indexrelid
+        WHERE ct.relname = ANY(%s)
+            AND ct.relnamespace = current_schema()::regnamespace
+            AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid);
+    """, (tabelas,))
+    indices = cur.fetchall()
+    cur.execute("""
+        SELECT ct.relname, c.conname, pg_get_constraintdef(c.oid)
+        FROM pg_constraint c
+        JOIN pg_class ct ON ct.oid = c.conrelid
+        WHERE c.contype = 'f'
+            AND ct.relname = ANY(%s)
+            AND ct.relnamespace = current_schema()::regnamespace;
+    """, (tabelas,))
+    chaves_estrangeiras = cur.fetchall()
+    return indices, chaves_estrangeiras
+
+"""
+Carga inicial rápida (construção do DW do zero): remove as chaves estrangeiras e os índices secundários, carrega os dados
+com tabelas de staging UNLOGGED e synchronous_commit desligado, recria todos os índices em uma única passada ao final,
+readiciona as chaves estrangeiras como NOT VALID e as valida (VALIDATE CONSTRAINT), e atualiza as estatísticas.
+As chaves primárias e restrições UNIQUE são mantidas, pois sustentam os ON CONFLICT da carga.
+Se a carga falhar, os índices e chaves estrangeiras removidos são recriados mesmo assim
+
+Parâmetros:
+    conn (connection): Conexão com o banco do DW
+    data_csv (str): Caminho do CSV de entrada (ex.: "articles_dw.csv")
+    limpar (bool): Se True, aplica limpar_registro_dw() antes da carga (padrão: False)
+    paralela (bool): Se True, carrega com cargaParalela() em vez de uma única conexão (padrão: False)
+    conexoes (int): Tamanho do pool de conexões da carga paralela (padrão: 5)
+    memoria_indices (str): maintenance_work_mem utilizado na recriação dos índices (padrão: "512MB")
+
+Retorna:
+    dict: { etapa: tempo em segundos }
+"""
+def cargaInicialRapida(conn, data_csv, limpar=False, paralela=False, conexoes=5, memoria_indices="512MB"):
+    tempos = {}
+    cur = conn.cursor()
+
+    inicio = time.perf_counter()
+    indices, chaves_estrangeiras = listarIndicesEChavesEstrangeiras(cur)
+    for tabela, nome, _ in chaves_estrangeiras:
+        cur.execute(f'ALTER TABLE {tabela} DROP CONSTRAINT "{nome}";')
+    for nome, _ in indices:
+        cur.execute(f'DROP INDEX IF EXISTS "{nome}";')
+    conn.commit()
+    tempos["remocao_restricoes"] = time.perf_counter() - inicio
+    print(f"{len(chaves_estrangeiras)} chaves estrangeiras e {len(indices)} índices secundários removidos")
+
+    try:
+        inicio = time.perf_counter()
+        if paralela:
+            cargaParalela(data_csv, conexoes=conexoes, limpar=limpar)
+        else:
+            staging = stagingCompartilhado()
+            cur.execute("SET synchronous_commit = off;")
+            prepararStaging(cur, data_csv, limpar, staging)
+            insertIntoDimensions(cur, staging)
+            insertIntoFato(cur, staging=staging)
+            insertIntoPontes(cur, staging=staging)
+            registrarCarga(cur, data_csv, staging=staging)
+            dropStaging(cur, staging)
+            conn.commit()
+            cur.execute("RESET synchronous_commit;")
+        tempos["carga"] = time.perf_counter() - inicio
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        # Recria índices e chaves estrangeiras em uma única passada, validando as restrições ao final
+        inicio = time.perf_counter()
+        cur.execute("SET maintenance_work_mem = %s;", (memoria_indices,))
+        for _, definicao in indices:
+            cur.execute(definicao + ";")
+        for tabela, nome, definicao in chaves_estrangeiras:
+            cur.execute(f'ALTER TABLE {tabela} ADD CONSTRAINT "{nome}" {definicao} NOT VALID;')
+        conn.commit()
+        tempos["recriacao_indices"] = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        for tabela, nome, _ in chaves_estrangeiras:
+            cur.execute(f'ALTER TABLE {tabela} VALIDATE CONSTRAINT "{nome}";')
+        cur.execute("RESET maintenance_work_mem;")
+        analyzeDW(cur)
+        conn.commit()
+        cur.close()
+        tempos["validacao"] = time.perf_counter() - inicio
+
+    print("Carga inicial rápida: " + ", ".join(f"{etapa} {t:.2f}s" for etapa, t in tempos.items()))
+    return tempos
+
+"""
+Carrega o CSV (ou Parquet) na tabela de staging das publicações de um banco DuckDB, lendo o arquivo diretamente com
+read_csv/read_parquet
+
+Parâmetros:
+    cur (cursor): Cursor da conexão com o DuckDB
+    arquivo (str): Caminho do CSV ou Parquet de entrada
+    staging (dict): Nomes e tipo das tabelas de staging (padrão: STAGING_TEMP)
+
+Retorna:
+    int: Número de linhas carregadas
+"""
+@instrumentacao.cronometrar(linhas=int)
+def insertTempPubliDuckDB(cur, arquivo, staging=STAGING_TEMP):
+    leitura = "read_parquet(?)" if arquivo.lower().endswith(".parquet") else "read_csv(?, header=true, all_varchar=true)"
+    cur.execute(f"INSERT INTO {staging['publicacoes']} SELECT {', '.join(COLUNAS_TEMP_PUBLI)} FROM {leitura};", [arquivo])
+    cur.execute(f"SELECT COUNT(*) FROM {staging['publicacoes']};")
+    return cur.fetchone()[0]
+
+"""
+Carrega o CSV (ou Parquet) no esquema estrela de um banco DuckDB embarcado, reutilizando as mesmas etapas SQL da carga
+no PostgreSQL. O arquivo é lido diretamente pelo DuckDB (read_csv/read_parquet), sem passar pelo Python. As tabelas
+devem ter sido criadas com sql_script_duckdb (database/estrutura.py)
+
+Parâmetros:
+    conn (duckdb.DuckDBPyConnection): Conexão retornada por connect_to_duckdb()
+    arquivo (str): Caminho do CSV ou Parquet de entrada (ex.: "articles_dw.csv")
+
+Retorna:
+    dict: { etapa: tempo de execução em segundos }
+"""
+def carregarDuckDB(conn, arquivo):
+    tempos = {}
+    staging = STAGING_TEMP
+    cur = conn.cursor()
+
+    inicio = time.perf_counter()
+    dropStaging(cur, staging)
+    createTempPubli(cur, staging)
+    linhas = insertTempPubliDuckDB(cur, arquivo, staging)
+    explodirTempPubli(cur, staging)
+    tempos["staging"] = time.perf_counter() - inicio
+
+    for etapa, funcao in [("dimensoes", insertIntoDimensions), ("fato", insertIntoFato), ("pontes", insertIntoPontes)]:
+        inicio = time.perf_counter()
+        funcao(cur, staging=staging)
+        tempos[etapa] = time.perf_counter() - inicio
+
+    dropStaging(cur, staging)
+    cur.close()
+    print(f"{linhas} linhas carregadas no DuckDB: " + ", ".join(f"{etapa} {t:.2f}s" for etapa, t in tempos.items()))
+    return tempos
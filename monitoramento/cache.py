@@ -0,0 +1,72 @@
+"""
+Cache LRU limitado e seguro para uso por várias threads, com estatísticas de acertos, falhas e remoções. É a base do
+cache das afiliações (scrapers/instituicoes.py) e do cache das consultas analíticas (database/analises.py)
+
+Uso:
+    cache = CacheLRU(tamanho_maximo=1000)
+    valor = cache.obter(chave)
+    if valor is None:
+        valor = calcular(chave)
+        cache.guardar(chave, valor)
+"""
+
+import threading
+from collections import OrderedDict
+
+"""
+Cache LRU: ao exceder tamanho_maximo, as entradas utilizadas há mais tempo são removidas
+
+Parâmetros:
+    tamanho_maximo (int): Número máximo de entradas mantidas em memória
+"""
+class CacheLRU:
+    def __init__(self, tamanho_maximo):
+        self.tamanho_maximo = tamanho_maximo
+        self.entradas = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+        self.lock = threading.Lock()
+
+    def obter(self, chave):
+        with self.lock:
+            valor = self.entradas.get(chave)
+            if valor is None:
+                self.falhas += 1
+                return None
+            self.entradas.move_to_end(chave)
+            self.acertos += 1
+            return valor
+
+    def guardar(self, chave, valor):
+        with self.lock:
+            self.entradas[chave] = valor
+            self.entradas.move_to_end(chave)
+            while len(self.entradas) > self.tamanho_maximo:
+                self.entradas.popitem(last=False)
+                self.remocoes += 1
+
+    def limpar(self):
+        with self.lock:
+            self.entradas.clear()
+            self.acertos = 0
+            self.falhas = 0
+            self.remocoes = 0
+
+    """
+    Retorna as estatísticas de uso do cache
+
+    Retorna:
+        dict: Com chaves "tamanho", "tamanho_maximo", "acertos", "falhas", "remocoes" e "taxa_acerto"
+    """
+    def estatisticas(self):
+        with self.lock:
+            consultas = self.acertos + self.falhas
+            return {
+                "tamanho": len(self.entradas),
+                "tamanho_maximo": self.tamanho_maximo,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "remocoes": self.remocoes,
+                "taxa_acerto": self.acertos / consultas if consultas else 0.0
+            }
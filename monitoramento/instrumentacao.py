@@ -0,0 +1,312 @@
+"""
+Instrumentação do pipeline: tempo de parede e de CPU por etapa e por função, histogramas de latência das requisições HTTP
+por host, bytes baixados, tempo de parse das páginas e linhas por segundo. As medições são sempre registradas (o custo é
+o de duas leituras de relógio por chamada); a captura com cProfile e tracemalloc é opcional, ativada pela variável de
+ambiente NTBD_PERFIL ("cprofile", "tracemalloc" ou "cprofile,tracemalloc"). O resultado é emitido em um relatório JSON
+
+Uso:
+    from monitoramento.instrumentacao import instrumentacao
+
+    @instrumentacao.cronometrar(linhas=len)
+    def extrair(...): ...
+
+    with instrumentacao.medir("tratamento", grupo="etapas") as medicao:
+        ...
+        medicao["linhas"] = len(df)
+
+    instrumentacao.salvar_relatorio("relatorio_execucao.json")
+"""
+
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlparse
+
+# Variável de ambiente que ativa a captura com cProfile e/ou tracemalloc
+VARIAVEL_PERFIL = "NTBD_PERFIL"
+
+# Limites superiores (em segundos) dos intervalos do histograma de latência HTTP
+LIMITES_LATENCIA = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, float("inf"))
+
+# Número de entradas nas listas do cProfile e do tracemalloc no relatório
+TOP_PERFIL = 25
+
+"""
+Histograma de latências com intervalos fixos (LIMITES_LATENCIA), no mesmo formato cumulativo dos histogramas do Prometheus
+"""
+class Histograma:
+    def __init__(self, limites=LIMITES_LATENCIA):
+        self.limites = limites
+        self.contagens = [0] * len(limites)
+        self.total = 0
+        self.soma = 0.0
+        self.maximo = 0.0
+
+    def observar(self, valor):
+        for i, limite in enumerate(self.limites):
+            if valor <= limite:
+                self.contagens[i] += 1
+                break
+        self.total += 1
+        self.soma += valor
+        self.maximo = max(self.maximo, valor)
+
+    """
+    Estima um percentil pelo limite superior do intervalo em que ele cai
+
+    Parâmetros:
+        q (float): Percentil entre 0 e 1 (ex.: 0.9)
+
+    Retorna:
+        float: Limite superior do intervalo (limitado ao máximo observado), ou None se o histograma estiver vazio
+    """
+    def percentil(self, q):
+        if not self.total:
+            return None
+        alvo, acumulado = q * self.total, 0
+        for limite, contagem in zip(self.limites, self.contagens):
+            acumulado += contagem
+            if acumulado >= alvo:
+                return min(limite, self.maximo)
+        return self.maximo
+
+    def resumo(self):
+        acumulado, intervalos = 0, {}
+        for limite, contagem in zip(self.limites, self.contagens):
+            acumulado += contagem
+            intervalos["+Inf" if limite == float("inf") else str(limite)] = acumulado
+        return {
+            "total": self.total,
+            "soma_s": self.soma,
+            "media_s": self.soma / self.total if self.total else None,
+            "max_s": self.maximo,
+            "p50_s": self.percentil(0.5),
+            "p90_s": self.percentil(0.9),
+            "p99_s": self.percentil(0.99),
+            "intervalos": intervalos
+        }
+
+"""
+Registro das medições de uma execução. Etapas medem CPU do processo (uma etapa pode usar várias threads); funções medem
+CPU da thread que as executa, já que são chamadas em paralelo pelos scrapers. Todas as operações são thread-safe
+"""
+class Instrumentacao:
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Funções chamadas a cada requisição registrada, com os mesmos argumentos (ex.: monitoramento/metricas.py)
+        self.observadores = []
+        self.limpar()
+
+    def limpar(self):
+        with self.lock:
+            self.inicio = datetime.now()
+            self.grupos = {"etapas": {}, "funcoes": {}}
+            self.http = {}
+            self.perfilador = None
+
+    """
+    Mede um bloco de código, acumulando chamadas, tempo de parede, tempo de CPU, linhas e erros no nome informado
+
+    Parâmetros:
+        nome (str): Nome da medição (ex.: "extracao", "get_soup")
+        grupo (str): "etapas" ou "funcoes" (padrão: "funcoes")
+
+    Retorna:
+        dict: Medição em andamento; a chave "linhas" pode ser preenchida pelo bloco para o cálculo de linhas/s
+    """
+    @contextmanager
+    def medir(self, nome, grupo="funcoes"):
+        relogio_cpu = time.process_time if grupo == "etapas" else time.thread_time
+        medicao = {"linhas": None}
+        inicio, inicio_cpu = time.perf_counter(), relogio_cpu()
+        erro = False
+        try:
+            yield medicao
+        except BaseException:
+            erro = True
+            raise
+        finally:
+            parede, cpu = time.perf_counter() - inicio, relogio_cpu() - inicio_cpu
+            with self.lock:
+                registro = self.grupos[grupo].setdefault(
+                    nome, {"chamadas": 0, "parede_s": 0.0, "cpu_s": 0.0, "max_s": 0.0, "linhas": 0, "erros": 0}
+                )
+                registro["chamadas"] += 1
+                registro["parede_s"] += parede
+                registro["cpu_s"] += cpu
+                registro["max_s"] = max(registro["max_s"], parede)
+                registro["linhas"] += medicao["linhas"] or 0
+                registro["erros"] += erro
+
+    """
+    Decorador que mede cada chamada da função com medir()
+
+    Parâmetros:
+        nome (str): Nome da medição (padrão: None, utiliza o nome da função)
+        grupo (str): "etapas" ou "funcoes" (padrão: "funcoes")
+        linhas (função): Função aplicada ao retorno para obter o número de linhas processadas (ex.: len, int)
+
+    Retorna:
+        função: Decorador
+    """
+    def cronometrar(self, nome=None, grupo="funcoes", linhas=None):
+        def decorador(funcao):
+            rotulo = nome or funcao.__name__
+
+            @functools.wraps(funcao)
+            def envolvida(*args, **kwargs):
+                with self.medir(rotulo, grupo) as medicao:
+                    resultado = funcao(*args, **kwargs)
+                    if linhas is not None and resultado is not None:
+                        medicao["linhas"] = linhas(resultado)
+                    return resultado
+            return envolvida
+        return decorador
+
+    def etapa(self, nome, linhas=None):
+        return self.cronometrar(nome, "etapas", linhas)
+
+    """
+    Registra uma requisição HTTP: latência no histograma do host, bytes recebidos e código de status
+
+    Parâmetros:
+        url (str): URL requisitada
+        duracao (float): Latência em segundos
+        tamanho (int): Bytes recebidos no corpo da resposta
+        status (int): Código de status HTTP, ou None se a requisição falhou sem resposta (timeout, conexão)
+    """
+    def registrar_requisicao(self, url, duracao, tamanho=0, status=None):
+        host = urlparse(url).netloc or url
+        with self.lock:
+            registro = self.http.setdefault(host, {"latencia": Histograma(), "bytes": 0, "status": {}, "erros": 0})
+            registro["latencia"].observar(duracao)
+            registro["bytes"] += tamanho
+            chave = str(status) if status is not None else "sem_resposta"
+            registro["status"][chave] = registro["status"].get(chave, 0) + 1
+            registro["erros"] += status is None or status >= 400
+        for observador in self.observadores:
+            observador(url, duracao, tamanho, status)
+
+    """
+    Inicia a captura com cProfile e/ou tracemalloc, conforme a variável de ambiente NTBD_PERFIL. O cProfile perfila apenas
+    a thread que chamou iniciar_perfil() (a thread principal do pipeline); as threads dos scrapers são cobertas pelas
+    medições por função
+
+    Retorna:
+        set: Capturas ativadas
+    """
+    def iniciar_perfil(self):
+        capturas = {c.strip().lower() for c in os.environ.get(VARIAVEL_PERFIL, "").split(",") if c.strip()}
+        if "tracemalloc" in capturas and not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+        if "cprofile" in capturas:
+            self.perfilador = cProfile.Profile()
+            self.perfilador.enable()
+        return capturas
+
+    """
+    Encerra as capturas ativas e retorna seus resumos
+
+    Parâmetros:
+        caminho_prof (str): Caminho do arquivo .prof com as estatísticas completas do cProfile (padrão: None, não salva)
+
+    Retorna:
+        dict: Com as chaves "cprofile" e/ou "tracemalloc", conforme as capturas ativas
+    """
+    def finalizar_perfil(self, caminho_prof=None):
+        perfil = {}
+        if self.perfilador is not None:
+            self.perfilador.disable()
+            if caminho_prof:
+                self.perfilador.dump_stats(caminho_prof)
+            estatisticas = pstats.Stats(self.perfilador, stream=io.StringIO()).sort_stats("cumulative")
+            perfil["cprofile"] = [
+                {
+                    "funcao": f"{arquivo}:{linha}({funcao})",
+                    "chamadas": chamadas,
+                    "tempo_proprio_s": proprio,
+                    "tempo_acumulado_s": acumulado
+                }
+                for (arquivo, linha, funcao), (_, chamadas, proprio, acumulado, _) in sorted(
+                    estatisticas.stats.items(), key=lambda item: item[1][3], reverse=True
+                )[:TOP_PERFIL]
+            ]
+            self.perfilador = None
+        if tracemalloc.is_tracing():
+            atual, pico = tracemalloc.get_traced_memory()
+            perfil["tracemalloc"] = {
+                "atual_bytes": atual,
+                "pico_bytes": pico,
+                "alocacoes": [
+                    {"origem": str(estatistica.traceback[0]), "bytes": estatistica.size, "blocos": estatistica.count}
+                    for estatistica in tracemalloc.take_snapshot().statistics("lineno")[:TOP_PERFIL]
+                ]
+            }
+            tracemalloc.stop()
+        return perfil
+
+    """
+    Monta o relatório da execução, com linhas/s por etapa e função e o resumo das requisições HTTP por host
+
+    Retorna:
+        dict: Relatório com as chaves "inicio", "fim", "duracao_s", "etapas", "funcoes" e "http"
+    """
+    def relatorio(self):
+        fim = datetime.now()
+        with self.lock:
+            grupos = {}
+            for grupo, medicoes in self.grupos.items():
+                grupos[grupo] = {
+                    nome: {
+                        **registro,
+                        "media_s": registro["parede_s"] / registro["chamadas"],
+                        "linhas_por_s": registro["linhas"] / registro["parede_s"] if registro["parede_s"] > 0 else None
+                    }
+                    for nome, registro in medicoes.items()
+                }
+            http = {
+                host: {
+                    "requisicoes": registro["latencia"].total,
+                    "bytes": registro["bytes"],
+                    "erros": registro["erros"],
+                    "status": dict(registro["status"]),
+                    "latencia": registro["latencia"].resumo()
+                }
+                for host, registro in self.http.items()
+            }
+        return {
+            "inicio": self.inicio.isoformat(),
+            "fim": fim.isoformat(),
+            "duracao_s": (fim - self.inicio).total_seconds(),
+            **grupos,
+            "http": http
+        }
+
+    """
+    Encerra as capturas ativas e salva o relatório da execução em JSON. As estatísticas completas do cProfile, quando
+    ativado, são salvas ao lado do relatório, com a extensão .prof
+
+    Parâmetros:
+        caminho (str): Caminho do relatório JSON
+
+    Retorna:
+        dict: Relatório salvo
+    """
+    def salvar_relatorio(self, caminho):
+        caminho_prof = os.path.splitext(caminho)[0] + ".prof"
+        relatorio = self.relatorio()
+        relatorio["perfil"] = self.finalizar_perfil(caminho_prof)
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=1)
+        return relatorio
+
+# Registro compartilhado pelos módulos do pipeline
+instrumentacao = Instrumentacao()
@@ -0,0 +1,297 @@
+"""
+Métricas em tempo real das extrações longas, expostas em um endpoint HTTP local no formato texto do Prometheus
+(http://127.0.0.1:<porta>/metrics). Cobre requisições em andamento, requisições por segundo por host, retentativas e erros
+por código de status, limite de concorrência por host, profundidade das filas, edições e artigos concluídos e a estimativa de tempo restante (ETA).
+O servidor é opcional: só é iniciado por iniciar_servidor(), com a porta informada ou definida na variável de ambiente
+NTBD_METRICAS_PORTA. Sem o servidor, as métricas são apenas mantidas em memória
+
+Uso:
+    NTBD_METRICAS_PORTA=9108 python pipeline.py --etapa extracao
+    curl http://127.0.0.1:9108/metrics
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+from monitoramento.instrumentacao import Histograma, instrumentacao
+
+# Variável de ambiente com a porta do endpoint de métricas
+VARIAVEL_PORTA = "NTBD_METRICAS_PORTA"
+
+# Janela, em segundos, do cálculo de requisições por segundo
+JANELA_TAXA = 60
+
+"""
+Formata os rótulos de uma série no formato do Prometheus (ex.: {host="www.scielo.br",status="200"})
+
+Parâmetros:
+    rotulos (tuple): Pares (nome, valor) ordenados
+
+Retorna:
+    str: Rótulos formatados, ou "" se não houver rótulos
+"""
+def formatar_rotulos(rotulos):
+    if not rotulos:
+        return ""
+    escapar = lambda valor: str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{nome}="{escapar(valor)}"' for nome, valor in rotulos) + "}"
+
+def formatar_valor(valor):
+    return "NaN" if valor != valor else str(valor)
+
+"""
+Métrica com séries identificadas por rótulos. Subclasses definem o tipo e a exportação de cada série
+"""
+class Metrica:
+    tipo = "untyped"
+
+    def __init__(self, nome, ajuda):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def chave(self, rotulos):
+        return tuple(sorted(rotulos.items()))
+
+    def linhas_series(self):
+        with self.lock:
+            return [f"{self.nome}{formatar_rotulos(chave)} {formatar_valor(valor)}" for chave, valor in self.series.items()]
+
+    def exportar(self):
+        return [f"# HELP {self.nome} {self.ajuda}", f"# TYPE {self.nome} {self.tipo}"] + self.linhas_series()
+
+class Contador(Metrica):
+    tipo = "counter"
+
+    def inc(self, valor=1, **rotulos):
+        chave = self.chave(rotulos)
+        with self.lock:
+            self.series[chave] = self.series.get(chave, 0) + valor
+
+    def valor(self, **rotulos):
+        with self.lock:
+            if rotulos:
+                return self.series.get(self.chave(rotulos), 0)
+            return sum(self.series.values())
+
+"""
+Medidor (gauge). Além de valores definidos diretamente, uma série pode ser calculada por uma função no momento da
+exportação (ex.: tamanho de uma fila)
+"""
+class Medidor(Metrica):
+    tipo = "gauge"
+
+    def __init__(self, nome, ajuda):
+        super().__init__(nome, ajuda)
+        self.funcoes = {}
+
+    def definir(self, valor, **rotulos):
+        with self.lock:
+            self.series[self.chave(rotulos)] = valor
+
+    def inc(self, valor=1, **rotulos):
+        chave = self.chave(rotulos)
+        with self.lock:
+            self.series[chave] = self.series.get(chave, 0) + valor
+
+    def dec(self, valor=1, **rotulos):
+        self.inc(-valor, **rotulos)
+
+    def definir_funcao(self, funcao, **rotulos):
+        with self.lock:
+            self.funcoes[self.chave(rotulos)] = funcao
+
+    def remover_funcao(self, **rotulos):
+        with self.lock:
+            self.funcoes.pop(self.chave(rotulos), None)
+
+    def linhas_series(self):
+        linhas = super().linhas_series()
+        with self.lock:
+            funcoes = list(self.funcoes.items())
+        for chave, funcao in funcoes:
+            try:
+                linhas.append(f"{self.nome}{formatar_rotulos(chave)} {formatar_valor(funcao())}")
+            except Exception:
+                continue
+        return linhas
+
+"""
+Histograma exportado no formato do Prometheus (séries _bucket, _sum e _count), com os intervalos de Histograma
+"""
+class HistogramaMetrica(Metrica):
+    tipo = "histogram"
+
+    def observar(self, valor, **rotulos):
+        chave = self.chave(rotulos)
+        with self.lock:
+            self.series.setdefault(chave, Histograma()).observar(valor)
+
+    def linhas_series(self):
+        linhas = []
+        with self.lock:
+            for chave, histograma in self.series.items():
+                acumulado = 0
+                for limite, contagem in zip(histograma.limites, histograma.contagens):
+                    acumulado += contagem
+                    le = "+Inf" if limite == float("inf") else str(limite)
+                    linhas.append(f"{self.nome}_bucket{formatar_rotulos(chave + (('le', le),))} {acumulado}")
+                linhas.append(f"{self.nome}_sum{formatar_rotulos(chave)} {histograma.soma}")
+                linhas.append(f"{self.nome}_count{formatar_rotulos(chave)} {histograma.total}")
+        return linhas
+
+"""
+Registro das métricas da extração. As requisições são recebidas da instrumentação (registrar_requisicao), de modo que
+get_soup() e os buscadores do Total Access alimentam as duas sem chamadas adicionais
+"""
+class RegistroMetricas:
+    def __init__(self):
+        self.inicio = time.time()
+        self.em_andamento = Medidor("ntbd_requisicoes_em_andamento", "Requisições HTTP em andamento por host")
+        self.requisicoes = Contador("ntbd_requisicoes_total", "Requisições HTTP concluídas por host e código de status")
+        self.erros = Contador("ntbd_erros_total", "Requisições HTTP com erro por host e código de status")
+        self.latencia = HistogramaMetrica("ntbd_latencia_requisicao_segundos", "Latência das requisições HTTP por host")
+        self.taxa = Medidor("ntbd_requisicoes_por_segundo", f"Requisições por segundo por host nos últimos {JANELA_TAXA}s")
+        self.retentativas = Contador("ntbd_retentativas_total", "Retentativas de processamento por tipo")
+        self.fila = Medidor("ntbd_fila_profundidade", "Itens aguardando processamento por fila")
+        self.edicoes_planejadas = Contador("ntbd_edicoes_planejadas_total", "Edições enviadas para processamento por revista")
+        self.edicoes_concluidas = Contador("ntbd_edicoes_concluidas_total", "Edições concluídas por revista")
+        self.edicoes_falhas = Contador("ntbd_edicoes_falhas_total", "Edições que falharam após as retentativas por revista")
+        self.artigos_concluidos = Contador("ntbd_artigos_concluidos_total", "Artigos extraídos por revista")
+        self.concorrencia = Medidor(
+            "ntbd_concorrencia_limite", "Limite de requisições simultâneas por host definido pelo controle adaptativo"
+        )
+        self.eta = Medidor("ntbd_eta_segundos", "Estimativa do tempo restante para concluir as edições planejadas")
+        self.eta.definir_funcao(self.estimar_eta)
+        self.metricas = [
+            self.em_andamento, self.requisicoes, self.erros, self.latencia, self.taxa, self.retentativas, self.fila,
+            self.edicoes_planejadas, self.edicoes_concluidas, self.edicoes_falhas, self.artigos_concluidos, self.concorrencia,
+            self.eta
+        ]
+        self.recentes = {}
+        self.lock = threading.Lock()
+
+    """
+    Marca uma requisição como em andamento durante o bloco
+
+    Parâmetros:
+        url (str): URL requisitada
+    """
+    @contextmanager
+    def requisicao(self, url):
+        host = urlparse(url).netloc or url
+        self.em_andamento.inc(host=host)
+        try:
+            yield
+        finally:
+            self.em_andamento.dec(host=host)
+
+    """
+    Registra uma requisição concluída (observador de instrumentacao.registrar_requisicao)
+
+    Parâmetros:
+        url (str): URL requisitada
+        duracao (float): Latência em segundos
+        tamanho (int): Bytes recebidos
+        status (int): Código de status HTTP, ou None se não houve resposta
+    """
+    def registrar_requisicao(self, url, duracao, tamanho=0, status=None):
+        host = urlparse(url).netloc or url
+        codigo = str(status) if status is not None else "sem_resposta"
+        self.requisicoes.inc(host=host, status=codigo)
+        self.latencia.observar(duracao, host=host)
+        if status is None or status >= 400:
+            self.erros.inc(host=host, status=codigo)
+        agora = time.time()
+        with self.lock:
+            if host not in self.recentes:
+                self.recentes[host] = deque()
+                self.taxa.definir_funcao(lambda h=host: self.taxa_host(h), host=host)
+            recentes = self.recentes[host]
+            recentes.append(agora)
+            # A janela é aparada também na escrita, para não crescer enquanto ninguém consulta a taxa
+            while recentes and recentes[0] < agora - JANELA_TAXA:
+                recentes.popleft()
+
+    def taxa_host(self, host):
+        limite = time.time() - JANELA_TAXA
+        with self.lock:
+            recentes = self.recentes[host]
+            while recentes and recentes[0] < limite:
+                recentes.popleft()
+            return len(recentes) / JANELA_TAXA
+
+    """
+    Estima o tempo restante a partir da taxa média de edições finalizadas (concluídas ou com falha) desde o início do registro
+
+    Retorna:
+        float: Segundos restantes, ou NaN se ainda não houver edições finalizadas
+    """
+    def estimar_eta(self):
+        concluidas = self.edicoes_concluidas.valor() + self.edicoes_falhas.valor()
+        restantes = self.edicoes_planejadas.valor() - concluidas
+        decorrido = time.time() - self.inicio
+        if concluidas <= 0 or decorrido <= 0:
+            return float("nan")
+        return max(restantes, 0) / (concluidas / decorrido)
+
+    def exportar(self):
+        linhas = []
+        for metrica in self.metricas:
+            linhas.extend(metrica.exportar())
+        return "\n".join(linhas) + "\n"
+
+# Registro compartilhado, alimentado pelas requisições registradas na instrumentação
+metricas = RegistroMetricas()
+instrumentacao.observadores.append(metricas.registrar_requisicao)
+
+class ManipuladorMetricas(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        corpo = metricas.exportar().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        pass
+
+servidor_metricas = None
+
+"""
+Inicia o endpoint de métricas em uma thread em segundo plano. Chamadas seguintes retornam o servidor já iniciado
+
+Parâmetros:
+    porta (int): Porta do endpoint; se None, utiliza NTBD_METRICAS_PORTA (sem a variável, o servidor não é iniciado)
+    endereco (str): Endereço de escuta (padrão: "127.0.0.1", apenas local)
+
+Retorna:
+    ThreadingHTTPServer: Servidor iniciado, ou None se nenhuma porta foi configurada
+"""
+def iniciar_servidor(porta=None, endereco="127.0.0.1"):
+    global servidor_metricas
+    if servidor_metricas is not None:
+        return servidor_metricas
+    porta = porta if porta is not None else os.environ.get(VARIAVEL_PORTA)
+    if not porta:
+        return None
+    servidor_metricas = ThreadingHTTPServer((endereco, int(porta)), ManipuladorMetricas)
+    servidor_metricas.daemon_threads = True
+    threading.Thread(target=servidor_metricas.serve_forever, daemon=True).start()
+    return servidor_metricas
+
+def parar_servidor():
+    global servidor_metricas
+    if servidor_metricas is not None:
+        servidor_metricas.shutdown()
+        servidor_metricas.server_close()
+        servidor_metricas = None
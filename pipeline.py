@@ -0,0 +1,364 @@
+"""
+Orquestrador do pipeline do projeto (extração -> Total Access -> tratamento -> instituições -> estrutura do DW -> carga),
+executável pela linha de comando, sem o notebook. As etapas formam um DAG com entradas e saídas declaradas; cada etapa
+tem uma impressão digital (hash do código e dos arquivos de entrada, mais a última execução das etapas declaradas em "apos")
+e só é executada novamente quando essa impressão muda ou uma de suas saídas não existe. As impressões ficam em um arquivo de estado
+
+Uso:
+    python pipeline.py                      # executa a cadeia inteira, pulando as etapas atualizadas
+    python pipeline.py --etapa tratamento   # executa apenas uma etapa
+    python pipeline.py --etapa documentos   # baixa os PDFs e textos completos (etapa opcional, scrapers/downloads.py)
+    python pipeline.py --ate instituicoes   # executa a cadeia até a etapa informada
+    python pipeline.py --listar             # mostra o estado de cada etapa
+    python pipeline.py --streaming          # extração à carga em fluxo, sem CSVs intermediários (pipeline_streaming)
+    NTBD_PERFIL=cprofile,tracemalloc python pipeline.py   # inclui cProfile e tracemalloc no relatório da execução
+    python pipeline.py --metricas-porta 9108  # métricas ao vivo em http://127.0.0.1:9108/metrics
+    python pipeline.py --etapa extracao --arquivo-paginas arquivo_paginas   # arquiva as páginas baixadas
+    python pipeline.py --reparse arquivo_paginas   # reconstrói articles.csv a partir do arquivo, sem acessar a rede
+    python pipeline.py --oai                 # atualiza articles.csv pela interface OAI-PMH da SciELO (scrapers/scraper_oai.py)
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from monitoramento.instrumentacao import instrumentacao
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
+)
+logger = logging.getLogger("Pipeline")
+
+# Arquivo com as impressões digitais das etapas já executadas
+ARQUIVO_ESTADO = ".pipeline_estado.json"
+
+# Relatório JSON da execução (monitoramento/instrumentacao.py); pode ser alterado pela variável de ambiente NTBD_RELATORIO
+ARQUIVO_RELATORIO = os.environ.get("NTBD_RELATORIO", "relatorio_execucao.json")
+
+def etapa_extracao():
+    from scrapers.scraper_basico import run_scraper, save_articles_csv
+    save_articles_csv(run_scraper(), "articles.csv")
+
+def etapa_documentos():
+    from scrapers.downloads import run_downloads
+    run_downloads()
+
+def etapa_total_access():
+    from scrapers.scraper_total_access import run_total_access
+    from tratamento.tratamento_dados import remover_sem_total_access
+    run_total_access("articles.csv", "articles_final.csv")
+    removidos = remover_sem_total_access("articles_final.csv", "articles_final.csv")
+    logger.info(f"{removidos} registros sem TotalAccess removidos")
+
+def etapa_tratamento():
+    from tratamento.tratamento_dados import tratar_dados
+    tratar_dados("articles_final.csv", "articles_tratamento.csv")
+
+def etapa_instituicoes():
+    from scrapers.instituicoes import process_institutions_csv
+    from tratamento.tratamento_dados import filtrar_localidades_consistentes
+    df = filtrar_localidades_consistentes(process_institutions_csv("articles_tratamento.csv", "articles_dw.csv"))
+    df.to_csv("articles_dw.csv", index=False, encoding="utf-8")
+    logger.info(f"{len(df)} registros salvos em articles_dw.csv")
+
+@instrumentacao.etapa("estrutura")
+def etapa_estrutura():
+    from database.estrutura import connect_to_db, create_database, run_sql_script, sql_script
+    from database.conexao import conectar
+    conn = connect_to_db()
+    create_database(conn)
+    conn.close()
+    conn = conectar()
+    run_sql_script(conn, sql_script)
+    conn.close()
+
+@instrumentacao.etapa("carga", linhas=int)
+def etapa_carga():
+    from database.conexao import conexao
+    from database.integracao import (
+        createTempPubli, insertTempPubli, explodirTempPubli, insertIntoDimensions, insertIntoFato, insertIntoPontes,
+        registrarCarga, dropStaging
+    )
+    with conexao() as conn:
+        cur = conn.cursor()
+        createTempPubli(cur)
+        linhas = insertTempPubli(cur, "articles_dw.csv")
+        explodirTempPubli(cur)
+        insertIntoDimensions(cur)
+        insertIntoFato(cur)
+        insertIntoPontes(cur)
+        registrarCarga(cur, "articles_dw.csv")
+        dropStaging(cur)
+        cur.close()
+    return linhas
+
+# Etapas do pipeline, na ordem de execução. As dependências são as etapas que produzem as entradas, mais as declaradas
+# em "apos" (ex.: a carga depende da estrutura, que recria as tabelas, sem trocar arquivos)
+ETAPAS = {
+    "extracao": {
+        "funcao": etapa_extracao,
+        "entradas": [],
+        "saidas": ["articles.csv", "article_links.csv"],
+        "codigo": ["scrapers/scraper_basico.py"],
+        "apos": []
+    },
+    # Opcional: executada apenas quando pedida em --etapa ou --ate
+    "documentos": {
+        "funcao": etapa_documentos,
+        "entradas": ["article_links.csv"],
+        "saidas": [],
+        "codigo": ["scrapers/downloads.py"],
+        "apos": [],
+        "opcional": True
+    },
+    "total_access": {
+        "funcao": etapa_total_access,
+        "entradas": ["articles.csv"],
+        "saidas": ["articles_final.csv"],
+        "codigo": ["scrapers/scraper_total_access.py", "tratamento/tratamento_dados.py"],
+        "apos": []
+    },
+    "tratamento": {
+        "funcao": etapa_tratamento,
+        "entradas": ["articles_final.csv"],
+        "saidas": ["articles_tratamento.csv"],
+        "codigo": ["tratamento/tratamento_dados.py"],
+        "apos": []
+    },
+    "instituicoes": {
+        "funcao": etapa_instituicoes,
+        "entradas": ["articles_tratamento.csv", "data/municipios_brasil.csv"],
+        "saidas": ["articles_dw.csv"],
+        "codigo": ["scrapers/instituicoes.py", "tratamento/tratamento_dados.py"],
+        "apos": []
+    },
+    # A estrutura recria as tabelas do DW: depende do CSV carregado para que um CSV alterado seja carregado em um DW
+    # vazio (a carga ignora as publicações já existentes e não remove as que saíram do CSV)
+    "estrutura": {
+        "funcao": etapa_estrutura,
+        "entradas": ["articles_dw.csv"],
+        "saidas": [],
+        "codigo": ["database/estrutura.py"],
+        "apos": []
+    },
+    "carga": {
+        "funcao": etapa_carga,
+        "entradas": ["articles_dw.csv"],
+        "saidas": [],
+        "codigo": ["database/integracao.py", "database/conexao.py"],
+        "apos": ["estrutura"]
+    }
+}
+
+"""
+Calcula o hash SHA-256 de um arquivo, lendo-o em blocos
+
+Parâmetros:
+    caminho (str): Caminho do arquivo
+
+Retorna:
+    str: Hash em hexadecimal, ou "ausente" se o arquivo não existir
+"""
+def hash_arquivo(caminho):
+    if not os.path.exists(caminho):
+        return "ausente"
+    h = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+"""
+Retorna as etapas das quais uma etapa depende: as que produzem suas entradas e as declaradas em "apos"
+
+Parâmetros:
+    nome (str): Nome da etapa
+
+Retorna:
+    list: Nomes das etapas
+"""
+def dependencias(nome):
+    etapa = ETAPAS[nome]
+    produtoras = [
+        outra for outra, definicao in ETAPAS.items()
+        if outra != nome and set(definicao["saidas"]) & set(etapa["entradas"])
+    ]
+    return produtoras + [d for d in etapa["apos"] if d not in produtoras]
+
+"""
+Calcula a impressão digital de uma etapa a partir do código e das entradas. As dependências declaradas em "apos", que não
+produzem arquivos, entram com a data da última execução registrada no estado, de modo que executá-las novamente
+invalida a etapa (as demais dependências já são refletidas pelo hash das entradas)
+
+Parâmetros:
+    nome (str): Nome da etapa
+    estado (dict): Estado atual do pipeline
+
+Retorna:
+    str: Impressão digital em hexadecimal
+"""
+def impressao_digital(nome, estado):
+    etapa = ETAPAS[nome]
+    h = hashlib.sha256(nome.encode())
+    for caminho in etapa["codigo"] + etapa["entradas"]:
+        h.update(f"{caminho}:{hash_arquivo(caminho)}".encode())
+    for dependencia in etapa["apos"]:
+        h.update(f"{dependencia}:{estado.get(dependencia, {}).get('data', '')}".encode())
+    return h.hexdigest()
+
+"""
+Carrega o estado do pipeline
+
+Parâmetros:
+    caminho (str): Caminho do arquivo de estado
+
+Retorna:
+    dict: { etapa: {"impressao", "data", "duracao_s"} }
+"""
+def carregar_estado(caminho):
+    if not os.path.exists(caminho):
+        return {}
+    with open(caminho, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def salvar_estado(estado, caminho):
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(estado, f, ensure_ascii=False, indent=1)
+
+"""
+Verifica se uma etapa está atualizada: a impressão digital é a mesma da última execução e todas as saídas existem
+
+Parâmetros:
+    nome (str): Nome da etapa
+    estado (dict): Estado atual do pipeline
+
+Retorna:
+    bool: True se a etapa pode ser pulada
+"""
+def etapa_atualizada(nome, estado):
+    registro = estado.get(nome)
+    if not registro or registro["impressao"] != impressao_digital(nome, estado):
+        return False
+    return all(os.path.exists(saida) for saida in ETAPAS[nome]["saidas"])
+
+"""
+Seleciona as etapas a executar, na ordem do DAG
+
+Parâmetros:
+    etapas (list): Etapas pedidas explicitamente (executadas sem as anteriores); se None, todas as não opcionais
+    ate (str): Última etapa da cadeia; são executadas ela e todas das quais depende, direta ou indiretamente
+
+Retorna:
+    list: Nomes das etapas, em ordem de execução
+"""
+def selecionar_etapas(etapas=None, ate=None):
+    if etapas:
+        return [nome for nome in ETAPAS if nome in etapas]
+    if ate:
+        necessarias, pendentes = set(), [ate]
+        while pendentes:
+            nome = pendentes.pop()
+            if nome not in necessarias:
+                necessarias.add(nome)
+                pendentes.extend(dependencias(nome))
+        return [nome for nome in ETAPAS if nome in necessarias]
+    return [nome for nome in ETAPAS if not ETAPAS[nome].get("opcional")]
+
+"""
+Executa as etapas selecionadas, pulando as atualizadas, e registra o estado após cada etapa concluída
+
+Parâmetros:
+    etapas (list): Nomes das etapas, em ordem de execução
+    forcar (bool): Executa as etapas mesmo se estiverem atualizadas (padrão: False)
+    caminho_estado (str): Caminho do arquivo de estado (padrão: ARQUIVO_ESTADO)
+
+Retorna:
+    dict: { etapa: "executada" | "atualizada" }
+"""
+def executar_pipeline(etapas, forcar=False, caminho_estado=ARQUIVO_ESTADO):
+    estado = carregar_estado(caminho_estado)
+    resultado = {}
+    for nome in etapas:
+        if not forcar and etapa_atualizada(nome, estado):
+            logger.info(f"Etapa {nome} atualizada. Pulando.")
+            resultado[nome] = "atualizada"
+            continue
+        logger.info(f"Executando etapa {nome}...")
+        inicio = time.perf_counter()
+        ETAPAS[nome]["funcao"]()
+        duracao = time.perf_counter() - inicio
+        estado[nome] = {
+            "impressao": impressao_digital(nome, estado),
+            "data": datetime.now().isoformat(),
+            "duracao_s": round(duracao, 2)
+        }
+        salvar_estado(estado, caminho_estado)
+        logger.info(f"Etapa {nome} concluída em {duracao:.2f}s")
+        resultado[nome] = "executada"
+    return resultado
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pipeline de extração, tratamento e carga do DW")
+    parser.add_argument("--etapa", action="append", choices=list(ETAPAS), help="Executa apenas esta etapa (repetível)")
+    parser.add_argument("--ate", choices=list(ETAPAS), help="Executa a cadeia até esta etapa")
+    parser.add_argument("--forcar", action="store_true", help="Executa as etapas mesmo se estiverem atualizadas")
+    parser.add_argument("--listar", action="store_true", help="Mostra o estado das etapas, sem executá-las")
+    parser.add_argument("--estado", default=ARQUIVO_ESTADO, help="Arquivo de estado do pipeline")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Executa da extração à carga em fluxo (pipeline_streaming), com o DW já estruturado")
+    parser.add_argument("--relatorio", default=ARQUIVO_RELATORIO, help="Relatório JSON de tempos e requisições da execução")
+    parser.add_argument("--metricas-porta", type=int,
+                        help="Expõe métricas no formato do Prometheus em http://127.0.0.1:PORTA/metrics durante a execução")
+    parser.add_argument("--arquivo-paginas", metavar="DIRETORIO",
+                        help="Arquiva as páginas baixadas pelo scraper neste diretório (scrapers/arquivo_paginas.py)")
+    parser.add_argument("--reparse", metavar="DIRETORIO",
+                        help="Reconstrói articles.csv a partir do arquivo de páginas, sem acessar a rede, e encerra")
+    parser.add_argument("--processos", type=int, help="Número de processos do --reparse (padrão: um por núcleo)")
+    parser.add_argument("--oai", action="store_true",
+                        help="Atualiza articles.csv pela interface OAI-PMH, de forma incremental, e encerra")
+    parser.add_argument("--oai-desde", metavar="AAAA-MM-DD", help="Coleta OAI-PMH dos registros alterados desde a data")
+    parser.add_argument("--oai-completa", action="store_true",
+                        help="Coleta OAI-PMH completa, sem o estado da coleta anterior nem o articles.csv existente")
+    args = parser.parse_args()
+
+    selecionadas = selecionar_etapas(args.etapa, args.ate)
+    if args.listar:
+        estado = carregar_estado(args.estado)
+        for nome in selecionadas:
+            situacao = "atualizada" if etapa_atualizada(nome, estado) else "pendente"
+            ultima = estado.get(nome, {}).get("data", "nunca executada")
+            print(f"{nome:<14} {situacao:<11} última execução: {ultima} | depende de: {', '.join(dependencias(nome)) or '-'}")
+        sys.exit(0)
+
+    instrumentacao.iniciar_perfil()
+    if args.metricas_porta:
+        from monitoramento.metricas import iniciar_servidor
+        iniciar_servidor(args.metricas_porta)
+    if args.arquivo_paginas:
+        from scrapers.arquivo_paginas import ativar_arquivo
+        ativar_arquivo(args.arquivo_paginas)
+    codigo_saida = 0
+    try:
+        if args.oai:
+            from scrapers.scraper_oai import run_oai
+            run_oai(args.oai_desde, incremental=not args.oai_completa, output_csv="articles.csv")
+        elif args.reparse:
+            from scrapers.scraper_basico import run_reparse, save_articles_csv
+            save_articles_csv(run_reparse(args.reparse, args.processos), "articles.csv")
+        elif args.streaming:
+            from pipeline_streaming import executar_pipeline_streaming
+            executar_pipeline_streaming()
+        else:
+            executar_pipeline(selecionadas, args.forcar, args.estado)
+    except Exception:
+        logger.exception("Falha na execução do pipeline")
+        codigo_saida = 1
+    finally:
+        instrumentacao.salvar_relatorio(args.relatorio)
+        logger.info(f"Relatório da execução salvo em {args.relatorio}")
+    sys.exit(codigo_saida)
@@ -0,0 +1,350 @@
+"""
+Pipeline em fluxo, sem CSVs intermediários: os artigos de cada edição passam, em lotes, pelas etapas scraper -> Total Access
+-> tratamento -> instituições -> COPY na tabela de staging, cada etapa em sua própria thread e ligadas por filas limitadas.
+A memória fica constante (no máximo tamanho_fila lotes entre duas etapas) e os artigos de uma edição chegam ao DW sem
+esperar o fim da extração: a cada publicar_a_cada linhas, a staging é carregada nas dimensões, fato e pontes e a transação
+é confirmada. Cada lote leva as edições que encerra, e uma edição só é registrada em processed_editions.txt depois da
+confirmação da transação que contém seus artigos (entrega ao menos uma vez: após uma falha, a edição é extraída de novo)
+
+Uso:
+    python pipeline_streaming.py                        # extrai as edições novas e carrega o DW em fluxo
+    python pipeline_streaming.py --articles articles.csv  # usa um articles.csv já extraído como fonte
+"""
+
+import argparse
+import csv
+import logging
+import queue
+import threading
+import time
+import pandas as pd
+from monitoramento.metricas import metricas
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
+)
+logger = logging.getLogger("PipelineStreaming")
+
+# Marca o fim do fluxo em uma fila
+FIM = object()
+
+"""
+Lote de artigos que leva as edições encerradas por ele (edicoes), para o registro da edição após a carga no DW. As etapas
+repassam as edições mesmo quando todos os artigos do lote são descartados
+"""
+class Lote(list):
+    def __init__(self, artigos=(), edicoes=()):
+        super().__init__(artigos)
+        self.edicoes = list(edicoes)
+
+"""
+Cria o lote de saída de uma etapa, com as edições do lote de entrada
+
+Parâmetros:
+    origem (list): Lote de entrada
+    artigos (list): Artigos de saída
+
+Retorna:
+    Lote: Lote de saída, ou None se não houver artigos nem edições a repassar
+"""
+def derivar_lote(origem, artigos):
+    edicoes = getattr(origem, "edicoes", [])
+    if not artigos and not edicoes:
+        return None
+    return Lote(artigos, edicoes)
+
+"""
+Converte as edições geradas por iter_scraper_editions() em lotes
+
+Parâmetros:
+    edicoes (iterável): Tuplas (URL da edição, artigos)
+
+Retorna:
+    generator: Objetos Lote, um por edição
+"""
+def lotes_por_edicao(edicoes):
+    for ed_link, artigos in edicoes:
+        yield Lote(artigos, [ed_link])
+
+"""
+Coloca um item em uma fila limitada, desistindo se o pipeline for interrompido enquanto a fila estiver cheia
+
+Parâmetros:
+    fila (queue.Queue): Fila de destino
+    item: Item a colocar
+    parar (threading.Event): Sinal de interrupção do pipeline
+
+Retorna:
+    bool: True se o item foi colocado
+"""
+def colocar(fila, item, parar):
+    while not parar.is_set():
+        try:
+            fila.put(item, timeout=0.5)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+"""
+Gera os itens de uma fila até o marcador FIM ou até a interrupção do pipeline
+
+Parâmetros:
+    fila (queue.Queue): Fila de origem
+    parar (threading.Event): Sinal de interrupção do pipeline
+
+Retorna:
+    generator: Itens da fila
+"""
+def iterar_fila(fila, parar):
+    while not parar.is_set():
+        try:
+            item = fila.get(timeout=0.5)
+        except queue.Empty:
+            continue
+        if item is FIM:
+            return
+        yield item
+
+"""
+Lê um articles.csv já extraído em lotes, no mesmo formato gerado pelo scraper (listas separadas por "; ")
+
+Parâmetros:
+    articles_csv (str): Caminho do CSV
+    tamanho_lote (int): Número de artigos por lote (padrão: 200)
+
+Retorna:
+    generator: Listas de dicionários
+"""
+def ler_lotes_csv(articles_csv, tamanho_lote=200):
+    with open(articles_csv, "r", encoding="utf-8", newline="") as f:
+        lote = []
+        for registro in csv.DictReader(f):
+            lote.append(registro)
+            if len(lote) >= tamanho_lote:
+                yield lote
+                lote = []
+        if lote:
+            yield lote
+
+"""
+Etapa Total Access: adiciona a métrica a cada artigo e descarta os artigos sem ela (como remover_sem_total_access)
+
+Parâmetros:
+    lotes (iterável): Lotes de artigos
+
+Retorna:
+    generator: Lotes de artigos com a chave "TotalAccess"
+"""
+def etapa_total_access(lotes):
+    from scrapers.scraper_total_access import BuscadorTotalAccess
+    buscador = BuscadorTotalAccess()
+    for lote in lotes:
+        enriquecidos = []
+        for art in lote:
+            valor = pd.to_numeric(
+                buscador.obter(art.get("journal"), art.get("year"), art.get("volume"), art.get("edition_number"), art.get("title")),
+                errors="coerce"
+            )
+            if pd.notnull(valor):
+                art["TotalAccess"] = float(valor)
+                enriquecidos.append(art)
+        saida = derivar_lote(lote, enriquecidos)
+        if saida is not None:
+            yield saida
+
+"""
+Etapa de tratamento: aplica tratar_registro() a cada artigo, descartando títulos repetidos ao longo de todo o fluxo
+
+Parâmetros:
+    lotes (iterável): Lotes de artigos
+
+Retorna:
+    generator: Lotes de artigos tratados
+"""
+def etapa_tratamento(lotes):
+    from tratamento.tratamento_dados import tratar_registro
+    titulos_vistos = set()
+    for lote in lotes:
+        tratados = [r for r in (tratar_registro(art, titulos_vistos) for art in lote) if r is not None]
+        saida = derivar_lote(lote, tratados)
+        if saida is not None:
+            yield saida
+
+"""
+Etapa de instituições: processa as instituições do lote de uma vez (process_institutions_batch) e aplica a mesma limpeza
+de localidades da carga (limpar_registro_dw)
+
+Parâmetros:
+    lotes (iterável): Lotes de artigos tratados
+
+Retorna:
+    generator: Lotes de artigos com "Instituicao", "Cidade", "Estado" e "Pais"
+"""
+def etapa_instituicoes(lotes):
+    from scrapers.instituicoes import process_institutions_batch
+    from database.integracao import limpar_registro_dw
+    for lote in lotes:
+        localidades = process_institutions_batch(pd.Series([art.pop("institutions") for art in lote], dtype=object))
+        processados = []
+        for art, (instituicao, cidade, estado, pais) in zip(lote, localidades.itertuples(index=False)):
+            art.update({"Instituicao": instituicao, "Cidade": cidade, "Estado": estado, "Pais": pais.lower() if pais else pais})
+            if limpar_registro_dw(art) is not None:
+                processados.append(art)
+        saida = derivar_lote(lote, processados)
+        if saida is not None:
+            yield saida
+
+"""
+Converte um artigo processado em uma linha de Temp_Publicacoes (ordem de COLUNAS_TEMP_PUBLI). As listas são gravadas na
+mesma representação do articles_dw.csv, esperada por explodirTempPubli()
+
+Parâmetros:
+    art (dict): Artigo processado
+
+Retorna:
+    list: Valores da linha
+"""
+def linha_staging(art):
+    from database.integracao import COLUNAS_TEMP_PUBLI
+    campos = {chave.lower(): valor for chave, valor in art.items()}
+    return [str(v) if isinstance(v, list) else v for v in (campos.get(c.lower()) for c in COLUNAS_TEMP_PUBLI)]
+
+"""
+Etapa final: envia cada lote para a staging com COPY e, a cada publicar_a_cada linhas (e no fim do fluxo), carrega a staging
+no DW e confirma a transação. As edições dos lotes publicados são passadas a confirmar_edicao apenas após o commit
+
+Parâmetros:
+    lotes (iterável): Lotes de artigos processados
+    publicar_a_cada (int): Número de linhas na staging que dispara a carga no DW (padrão: 5000)
+    confirmar_edicao (função): Chamada com a URL de cada edição cujos artigos foram confirmados no DW (padrão: None)
+
+Retorna:
+    dict: Totais de linhas e de cargas realizadas
+"""
+def etapa_carga(lotes, publicar_a_cada=5000, confirmar_edicao=None):
+    from database.conexao import conexao
+    from database.integracao import (
+        createTempPubli, copyLinhasTempPubli, explodirTempPubli, insertIntoDimensions, insertIntoFato,
+        insertIntoPontes, registrarCarga, dropStaging, STAGING_TEMP
+    )
+    totais = {"linhas": 0, "cargas": 0}
+    with conexao() as conn:
+        cur = conn.cursor()
+        dropStaging(cur)
+        createTempPubli(cur)
+        pendentes = 0
+        edicoes_pendentes = []
+
+        def publicar():
+            if pendentes:
+                inicio = time.perf_counter()
+                explodirTempPubli(cur)
+                insertIntoDimensions(cur)
+                insertIntoFato(cur)
+                insertIntoPontes(cur)
+                registrarCarga(cur, "pipeline_streaming")
+                cur.execute(f"TRUNCATE {STAGING_TEMP['publicacoes']};")
+                conn.commit()
+                totais["cargas"] += 1
+                logger.info(f"{pendentes} linhas publicadas no DW em {time.perf_counter() - inicio:.2f}s")
+            # Só após o commit: uma falha antes deste ponto mantém as edições pendentes para a próxima execução
+            if confirmar_edicao is not None:
+                for ed_link in edicoes_pendentes:
+                    confirmar_edicao(ed_link)
+            edicoes_pendentes.clear()
+
+        for lote in lotes:
+            if lote:
+                copyLinhasTempPubli(cur, (linha_staging(art) for art in lote))
+            pendentes += len(lote)
+            totais["linhas"] += len(lote)
+            edicoes_pendentes.extend(getattr(lote, "edicoes", []))
+            if pendentes >= publicar_a_cada:
+                publicar()
+                pendentes = 0
+        if pendentes or edicoes_pendentes:
+            publicar()
+        dropStaging(cur)
+        cur.close()
+    return totais
+
+"""
+Executa uma etapa em uma thread, lendo os lotes da fila de entrada e colocando os lotes gerados na fila de saída
+
+Parâmetros:
+    etapa (função): Função geradora que recebe um iterável de lotes
+    entrada (iterável): Lotes de entrada
+    saida (queue.Queue): Fila de saída
+    parar (threading.Event): Sinal de interrupção; é acionado se a etapa falhar
+    erros (list): Lista onde as exceções das etapas são registradas
+"""
+def executar_etapa(etapa, entrada, saida, parar, erros):
+    try:
+        for lote in etapa(entrada):
+            if not colocar(saida, lote, parar):
+                break
+    except Exception as e:
+        logger.exception(f"Falha na etapa {etapa.__name__}")
+        erros.append(e)
+        parar.set()
+    finally:
+        colocar(saida, FIM, parar)
+
+"""
+Executa o pipeline em fluxo: cada etapa em uma thread, ligadas por filas limitadas, com a carga no DW na thread principal
+
+Parâmetros:
+    fonte (iterável): Lotes de artigos; se None, utiliza iter_scraper_editions() (extração das edições novas), com as
+        edições registradas em processed_editions.txt após a carga no DW
+    tamanho_fila (int): Número máximo de lotes em cada fila entre etapas (padrão: 4)
+    publicar_a_cada (int): Número de linhas que dispara a carga da staging no DW (padrão: 5000)
+
+Retorna:
+    dict: Totais de linhas e de cargas realizadas
+"""
+def executar_pipeline_streaming(fonte=None, tamanho_fila=4, publicar_a_cada=5000):
+    confirmar_edicao = None
+    if fonte is None:
+        from scrapers.scraper_basico import iter_scraper_editions, save_processed_edition
+        fonte = lotes_por_edicao(iter_scraper_editions())
+        confirmar_edicao = save_processed_edition
+
+    parar = threading.Event()
+    erros = []
+    threads = []
+    entrada = fonte
+    for etapa in [etapa_total_access, etapa_tratamento, etapa_instituicoes]:
+        saida = queue.Queue(maxsize=tamanho_fila)
+        metricas.fila.definir_funcao(saida.qsize, fila=etapa.__name__)
+        thread = threading.Thread(target=executar_etapa, args=(etapa, entrada, saida, parar, erros), daemon=True)
+        thread.start()
+        threads.append(thread)
+        entrada = iterar_fila(saida, parar)
+
+    inicio = time.perf_counter()
+    try:
+        totais = etapa_carga(entrada, publicar_a_cada, confirmar_edicao)
+    finally:
+        parar.set()
+        for thread in threads:
+            thread.join()
+        for etapa in [etapa_total_access, etapa_tratamento, etapa_instituicoes]:
+            metricas.fila.remover_funcao(fila=etapa.__name__)
+    if erros:
+        raise erros[0]
+
+    duracao = time.perf_counter() - inicio
+    logger.info(f"Pipeline em fluxo concluído: {totais['linhas']} linhas em {duracao:.2f}s, {totais['cargas']} cargas no DW")
+    return totais
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pipeline em fluxo, do scraper ao DW, sem CSVs intermediários")
+    parser.add_argument("--articles", help="Usa um articles.csv já extraído como fonte, em vez do scraper")
+    parser.add_argument("--tamanho-fila", type=int, default=4)
+    parser.add_argument("--publicar-a-cada", type=int, default=5000)
+    args = parser.parse_args()
+
+    fonte = ler_lotes_csv(args.articles) if args.articles else None
+    executar_pipeline_streaming(fonte, args.tamanho_fila, args.publicar_a_cada)
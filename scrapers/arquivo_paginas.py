@@ -0,0 +1,159 @@
+"""
+Arquivo das páginas brutas baixadas pelo scraper, no estilo WARC: cada página é um membro gzip independente (cabeçalho JSON
+em uma linha seguido do corpo original) acrescentado ao fim do segmento atual (paginas-00000.gz, paginas-00001.gz, ...),
+e um índice JSONL, também apenas acrescentado, registra a URL, o segmento, o deslocamento e o tamanho de cada registro.
+Nada é reescrito: uma URL baixada de novo gera um novo registro, e o índice aponta para o mais recente. Com o arquivo,
+uma correção nos parsers pode ser aplicada aos dados históricos sem acessar a rede (ver scraper_basico.run_reparse)
+
+Uso:
+    NTBD_ARQUIVO_PAGINAS=arquivo_paginas python pipeline.py --etapa extracao   # arquiva as páginas durante a extração
+    python pipeline.py --reparse arquivo_paginas                               # reconstrói articles.csv do arquivo
+"""
+
+import gzip
+import json
+import os
+import threading
+from datetime import datetime
+
+# Variável de ambiente com o diretório do arquivo; se definida, get_soup() arquiva todas as páginas baixadas
+VARIAVEL_ARQUIVO = "NTBD_ARQUIVO_PAGINAS"
+
+# Tamanho máximo de um segmento antes de iniciar o próximo (em bytes)
+TAMANHO_SEGMENTO = 1 << 30
+
+ARQUIVO_INDICE = "indice.jsonl"
+
+"""
+Arquivo append-only de páginas, seguro para uso por várias threads. A compressão é feita fora do lock; apenas a escrita
+no segmento e no índice é serializada
+
+Parâmetros:
+    diretorio (str): Diretório do arquivo (criado se não existir)
+    tamanho_segmento (int): Tamanho máximo de cada segmento (padrão: TAMANHO_SEGMENTO)
+"""
+class ArquivoPaginas:
+    def __init__(self, diretorio, tamanho_segmento=TAMANHO_SEGMENTO):
+        self.diretorio = diretorio
+        self.tamanho_segmento = tamanho_segmento
+        self.lock = threading.Lock()
+        self.indice = {}
+        self.segmento_atual = 0
+        self.leitores = {}
+        os.makedirs(diretorio, exist_ok=True)
+        self.carregar_indice()
+
+    def caminho_segmento(self, numero):
+        return os.path.join(self.diretorio, f"paginas-{numero:05d}.gz")
+
+    """
+    Carrega o índice, ignorando entradas que apontam além do fim do segmento (escrita interrompida)
+    """
+    def carregar_indice(self):
+        caminho = os.path.join(self.diretorio, ARQUIVO_INDICE)
+        if not os.path.exists(caminho):
+            return
+        tamanhos = {}
+        with open(caminho, "r", encoding="utf-8") as f:
+            for linha in f:
+                try:
+                    entrada = json.loads(linha)
+                except json.JSONDecodeError:
+                    continue
+                segmento = entrada["segmento"]
+                if segmento not in tamanhos:
+                    existe = os.path.exists(self.caminho_segmento(segmento))
+                    tamanhos[segmento] = os.path.getsize(self.caminho_segmento(segmento)) if existe else 0
+                if entrada["offset"] + entrada["tamanho"] <= tamanhos[segmento]:
+                    self.indice[entrada["url"]] = entrada
+                    self.segmento_atual = max(self.segmento_atual, segmento)
+
+    """
+    Acrescenta uma página ao arquivo
+
+    Parâmetros:
+        url (str): URL requisitada
+        conteudo (bytes): Corpo da resposta, sem decodificação
+        status (int): Código de status HTTP
+        encoding (str): Codificação informada na resposta (resp.encoding), utilizada na releitura
+
+    Retorna:
+        dict: Entrada do índice
+    """
+    def guardar(self, url, conteudo, status=200, encoding=None):
+        data = datetime.now().isoformat()
+        cabecalho = json.dumps({"url": url, "status": status, "encoding": encoding, "data": data}, ensure_ascii=False)
+        registro = gzip.compress(cabecalho.encode("utf-8") + b"\n" + conteudo, compresslevel=6)
+        with self.lock:
+            caminho = self.caminho_segmento(self.segmento_atual)
+            if os.path.exists(caminho) and os.path.getsize(caminho) + len(registro) > self.tamanho_segmento:
+                self.segmento_atual += 1
+                caminho = self.caminho_segmento(self.segmento_atual)
+            with open(caminho, "ab") as f:
+                offset = f.tell()
+                f.write(registro)
+            entrada = {
+                "url": url, "segmento": self.segmento_atual, "offset": offset, "tamanho": len(registro),
+                "status": status, "data": data
+            }
+            with open(os.path.join(self.diretorio, ARQUIVO_INDICE), "a", encoding="utf-8") as f:
+                f.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+            self.indice[url] = entrada
+        return entrada
+
+    def __contains__(self, url):
+        return url in self.indice
+
+    def __len__(self):
+        return len(self.indice)
+
+    """
+    Lê a versão mais recente de uma página
+
+    Parâmetros:
+        url (str): URL da página
+
+    Retorna:
+        tupla: (cabeçalho (dict), conteúdo (bytes)), ou None se a URL não estiver no arquivo
+    """
+    def ler(self, url):
+        entrada = self.indice.get(url)
+        if entrada is None:
+            return None
+        with self.lock:
+            leitor = self.leitores.get(entrada["segmento"])
+            if leitor is None:
+                leitor = self.leitores[entrada["segmento"]] = open(self.caminho_segmento(entrada["segmento"]), "rb")
+            leitor.seek(entrada["offset"])
+            comprimido = leitor.read(entrada["tamanho"])
+        dados = gzip.decompress(comprimido)
+        cabecalho, _, conteudo = dados.partition(b"\n")
+        return json.loads(cabecalho), conteudo
+
+    def fechar(self):
+        for leitor in self.leitores.values():
+            leitor.close()
+        self.leitores = {}
+
+arquivo_ativo = None
+lock_ativacao = threading.Lock()
+
+"""
+Retorna o arquivo de páginas ativo na extração: o informado em ativar_arquivo() ou, na primeira chamada, o diretório de
+NTBD_ARQUIVO_PAGINAS
+
+Retorna:
+    ArquivoPaginas: Arquivo ativo, ou None se o arquivamento estiver desativado
+"""
+def obter_arquivo():
+    global arquivo_ativo
+    if arquivo_ativo is None and os.environ.get(VARIAVEL_ARQUIVO):
+        with lock_ativacao:
+            if arquivo_ativo is None:
+                arquivo_ativo = ArquivoPaginas(os.environ[VARIAVEL_ARQUIVO])
+    return arquivo_ativo
+
+def ativar_arquivo(diretorio):
+    global arquivo_ativo
+    arquivo_ativo = ArquivoPaginas(diretorio) if diretorio else None
+    return arquivo_ativo
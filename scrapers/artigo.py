@@ -0,0 +1,202 @@
+"""
+Registro compacto de um artigo extraído da SciELO, utilizado pelo scraper no lugar de um dicionário por artigo. A classe
+usa __slots__ (sem __dict__ por instância) e interna os valores que se repetem entre os artigos (revista, ano, volume,
+número, tipo, data, edição, autores e palavras-chave), de modo que cada string repetida é armazenada uma única vez.
+Mantém o acesso no estilo de dicionário (artigo["title"], get, pop) e inclui os serializadores para CSV e JSONL
+"""
+
+import csv
+import json
+import sys
+
+# Colunas do arquivo 'articles.csv', na ordem do arquivo
+CAMPOS_CSV = (
+    "journal", "year", "volume", "edition_number", "publication_date", "publication_type", "title", "authors",
+    "keywords", "institutions"
+)
+
+# Campos internos da extração (não vão para o CSV)
+CAMPOS_LINKS = ("edition_url", "pid", "abstract_link", "text_link", "pdf_link")
+
+# Campos com valores repetidos entre artigos, armazenados com sys.intern
+CAMPOS_INTERNADOS = frozenset((
+    "journal", "year", "volume", "edition_number", "publication_date", "publication_type", "edition_url"
+))
+
+# Campos com listas, armazenadas como tuplas (autores e palavras-chave internados)
+CAMPOS_LISTA = frozenset(("authors", "keywords", "institutions"))
+
+"""
+Normaliza o valor de um campo: interna as strings repetidas e converte as listas em tuplas
+
+Parâmetros:
+    campo (str): Nome do campo
+    valor: Valor informado
+
+Retorna:
+    Valor normalizado
+"""
+def normalizar_campo(campo, valor):
+    if campo in CAMPOS_LISTA:
+        if not valor:
+            return ()
+        if isinstance(valor, str):
+            valor = [v.strip() for v in valor.split(";") if v.strip()]
+        if campo == "institutions":
+            return tuple(valor)
+        return tuple(sys.intern(v) if isinstance(v, str) else v for v in valor)
+    if campo in CAMPOS_INTERNADOS and isinstance(valor, str):
+        return sys.intern(valor)
+    return valor
+
+class Artigo:
+    __slots__ = CAMPOS_CSV + CAMPOS_LINKS
+
+    def __init__(self, **campos):
+        for campo in self.__slots__:
+            setattr(self, campo, normalizar_campo(campo, campos.pop(campo, None)))
+        if campos:
+            raise TypeError(f"Campos desconhecidos para Artigo: {', '.join(campos)}")
+
+    def __getitem__(self, campo):
+        if campo not in self.__slots__:
+            raise KeyError(campo)
+        return getattr(self, campo)
+
+    def __setitem__(self, campo, valor):
+        if campo not in self.__slots__:
+            raise KeyError(campo)
+        setattr(self, campo, normalizar_campo(campo, valor))
+
+    def __contains__(self, campo):
+        return campo in self.__slots__
+
+    def __eq__(self, outro):
+        return isinstance(outro, Artigo) and all(getattr(self, c) == getattr(outro, c) for c in self.__slots__)
+
+    def __repr__(self):
+        return f"Artigo({', '.join(f'{c}={getattr(self, c)!r}' for c in CAMPOS_CSV)})"
+
+    def get(self, campo, padrao=None):
+        valor = getattr(self, campo, None) if campo in self.__slots__ else None
+        return padrao if valor is None else valor
+
+    """
+    Remove o valor de um campo (que passa a ser None) e o retorna, como dict.pop
+
+    Parâmetros:
+        campo (str): Nome do campo
+        padrao: Valor retornado se o campo estiver vazio (padrão: None)
+
+    Retorna:
+        Valor do campo
+    """
+    def pop(self, campo, padrao=None):
+        valor = self.get(campo, padrao)
+        if campo in self.__slots__:
+            setattr(self, campo, () if campo in CAMPOS_LISTA else None)
+        return valor
+
+    def keys(self):
+        return self.__slots__
+
+    def items(self):
+        return ((campo, getattr(self, campo)) for campo in self.__slots__)
+
+    """
+    Descarta os campos internos da extração (links e PID), que não vão para o CSV
+    """
+    def descartar_links(self):
+        for campo in CAMPOS_LINKS:
+            setattr(self, campo, None)
+
+    """
+    Converte o artigo em um dicionário, com as listas como list
+
+    Parâmetros:
+        campos (tuple): Campos incluídos (padrão: CAMPOS_CSV)
+
+    Retorna:
+        dict: Dados do artigo
+    """
+    def como_dict(self, campos=CAMPOS_CSV):
+        return {c: list(v) if isinstance(v, tuple) else v for c, v in ((c, getattr(self, c)) for c in campos)}
+
+    """
+    Gera a linha do artigo em 'articles.csv', com autores, palavras-chave e instituições separados por "; "
+
+    Retorna:
+        list: Valores na ordem de CAMPOS_CSV
+    """
+    def linha_csv(self):
+        return [
+            "; ".join(valor) if isinstance(valor, tuple) else ("" if valor is None else valor)
+            for valor in (getattr(self, c) for c in CAMPOS_CSV)
+        ]
+
+    """
+    Cria um artigo a partir de um dicionário (ex.: linha de 'articles.csv' ou de um JSONL), ignorando chaves extras
+
+    Parâmetros:
+        registro (dict): Dados do artigo
+
+    Retorna:
+        Artigo: Registro criado
+    """
+    @classmethod
+    def de_dict(cls, registro):
+        return cls(**{c: registro[c] for c in cls.__slots__ if c in registro})
+
+"""
+Salva os artigos em um CSV no formato de 'articles.csv'
+
+Parâmetros:
+    artigos (iterável): Objetos Artigo ou dicionários
+    caminho (str): Caminho do CSV de saída
+
+Retorna:
+    int: Número de artigos salvos
+"""
+def salvar_csv(artigos, caminho):
+    total = 0
+    with open(caminho, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(CAMPOS_CSV)
+        for artigo in artigos:
+            writer.writerow((artigo if isinstance(artigo, Artigo) else Artigo.de_dict(artigo)).linha_csv())
+            total += 1
+    return total
+
+"""
+Salva os artigos em JSON Lines (um objeto JSON por linha), mantendo as listas como listas
+
+Parâmetros:
+    artigos (iterável): Objetos Artigo
+    caminho (str): Caminho do arquivo de saída
+    campos (tuple): Campos incluídos (padrão: CAMPOS_CSV)
+
+Retorna:
+    int: Número de artigos salvos
+"""
+def salvar_jsonl(artigos, caminho, campos=CAMPOS_CSV):
+    total = 0
+    with open(caminho, "w", encoding="utf-8") as f:
+        for artigo in artigos:
+            f.write(json.dumps(artigo.como_dict(campos), ensure_ascii=False) + "\n")
+            total += 1
+    return total
+
+"""
+Lê os artigos de um arquivo JSON Lines gerado por salvar_jsonl()
+
+Parâmetros:
+    caminho (str): Caminho do arquivo
+
+Retorna:
+    generator: Objetos Artigo
+"""
+def ler_jsonl(caminho):
+    with open(caminho, "r", encoding="utf-8") as f:
+        for linha in f:
+            if linha.strip():
+                yield Artigo.de_dict(json.loads(linha))
@@ -0,0 +1,181 @@
+"""
+Controle adaptativo de concorrência por host (AIMD). Cada host tem um limite de requisições simultâneas que cresce de um
+em um enquanto o servidor responde bem e é reduzido pela metade quando ele mostra sobrecarga: p90 da latência acima do
+alvo ou taxa de respostas 429/5xx (e falhas sem resposta) acima do tolerado. Respostas 429 e 503 reduzem o limite
+imediatamente, sem esperar o fim da janela. O alvo de latência é relativo à latência de base do host (a menor p90
+observada, que acompanha lentamente as janelas seguintes), limitado a LATENCIA_MAXIMA
+
+As amostras chegam pela instrumentação (registrar_requisicao), como em monitoramento/metricas.py; as funções de requisição
+apenas envolvem a chamada HTTP em controle.requisicao(url). Os pools de threads dos scrapers são dimensionados pelo limite
+máximo, e o número efetivo de requisições simultâneas é o definido aqui
+
+Uso:
+    with controle.requisicao(url):
+        resp = session.get(url, timeout=30)
+
+    NTBD_CONCORRENCIA_MAXIMA=16 python pipeline.py --etapa extracao
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from monitoramento.instrumentacao import instrumentacao
+from monitoramento.metricas import metricas
+
+logger = logging.getLogger("ConcorrenciaAdaptativa")
+
+# Limites de requisições simultâneas por host
+LIMITE_INICIAL = 8
+LIMITE_MINIMO = 1
+LIMITE_MAXIMO = int(os.environ.get("NTBD_CONCORRENCIA_MAXIMA", 64))
+
+# Número de requisições avaliadas a cada ajuste do limite
+JANELA_AMOSTRAS = 20
+
+# Fator aplicado ao limite em caso de sobrecarga (redução multiplicativa)
+FATOR_REDUCAO = 0.5
+
+# A p90 de uma janela indica sobrecarga se for maior que TOLERANCIA_LATENCIA vezes a latência de base (ou que LATENCIA_MAXIMA)
+TOLERANCIA_LATENCIA = 2.0
+LATENCIA_MAXIMA = 5.0
+
+# Peso de cada janela na atualização da latência de base quando a p90 sobe (quando desce, a base passa a ser a p90)
+SUAVIZACAO_BASE = 0.1
+
+# Fração máxima de respostas 429/5xx ou sem resposta em uma janela
+TAXA_ERRO_MAXIMA = 0.05
+
+# Intervalo mínimo, em segundos, entre duas reduções imediatas (429/503)
+INTERVALO_REDUCAO = 2.0
+
+"""
+Indica se o status de uma resposta é um sinal de sobrecarga do servidor
+
+Parâmetros:
+    status (int): Código de status HTTP, ou None se a requisição falhou sem resposta (timeout, conexão)
+
+Retorna:
+    bool: True para 429, 5xx e falhas sem resposta
+"""
+def indica_sobrecarga(status):
+    return status is None or status == 429 or status >= 500
+
+"""
+Limite adaptativo de requisições simultâneas de um host
+
+Parâmetros:
+    inicial (int): Limite inicial (padrão: LIMITE_INICIAL)
+    minimo (int): Limite mínimo (padrão: LIMITE_MINIMO)
+    maximo (int): Limite máximo (padrão: LIMITE_MAXIMO)
+"""
+class LimitadorAdaptativo:
+    def __init__(self, inicial=LIMITE_INICIAL, minimo=LIMITE_MINIMO, maximo=LIMITE_MAXIMO):
+        self.minimo = minimo
+        self.maximo = maximo
+        self.limite = float(min(max(inicial, minimo), maximo))
+        self.em_uso = 0
+        self.amostras = []
+        self.latencia_base = None
+        self.ultima_reducao = 0.0
+        self.condicao = threading.Condition()
+
+    def adquirir(self):
+        with self.condicao:
+            while self.em_uso >= int(self.limite):
+                self.condicao.wait()
+            self.em_uso += 1
+
+    def liberar(self):
+        with self.condicao:
+            self.em_uso -= 1
+            self.condicao.notify()
+
+    """
+    Registra uma requisição concluída e, ao completar a janela (ou em uma resposta 429/503), ajusta o limite
+
+    Parâmetros:
+        duracao (float): Latência em segundos
+        status (int): Código de status HTTP, ou None se não houve resposta
+    """
+    def registrar(self, duracao, status):
+        with self.condicao:
+            self.amostras.append((duracao, indica_sobrecarga(status)))
+            if status in (429, 503) and time.monotonic() - self.ultima_reducao >= INTERVALO_REDUCAO:
+                self.reduzir(f"status {status}")
+                return
+            if len(self.amostras) < JANELA_AMOSTRAS:
+                return
+            latencias = sorted(duracao for duracao, _ in self.amostras)
+            p90 = latencias[int(0.9 * (len(latencias) - 1))]
+            taxa_erro = sum(erro for _, erro in self.amostras) / len(self.amostras)
+            self.amostras = []
+
+            if self.latencia_base is None or p90 < self.latencia_base:
+                self.latencia_base = p90
+            else:
+                self.latencia_base += (p90 - self.latencia_base) * SUAVIZACAO_BASE
+            alvo = min(self.latencia_base * TOLERANCIA_LATENCIA, LATENCIA_MAXIMA)
+
+            if taxa_erro > TAXA_ERRO_MAXIMA:
+                self.reduzir(f"taxa de erro {taxa_erro:.0%}")
+            elif p90 > alvo:
+                self.reduzir(f"p90 {p90:.2f}s acima do alvo {alvo:.2f}s")
+            elif self.limite < self.maximo:
+                self.limite = min(self.limite + 1, self.maximo)
+                self.condicao.notify_all()
+
+    """
+    Reduz o limite pelo FATOR_REDUCAO (chamado com a condição adquirida). As requisições em andamento não são
+    interrompidas; novas requisições aguardam até o número em uso ficar abaixo do novo limite
+    """
+    def reduzir(self, motivo):
+        anterior = self.limite
+        self.limite = max(self.limite * FATOR_REDUCAO, self.minimo)
+        self.ultima_reducao = time.monotonic()
+        self.amostras = []
+        logger.info(f"Concorrência reduzida de {int(anterior)} para {int(self.limite)} ({motivo})")
+
+"""
+Limitadores adaptativos de todos os hosts, criados no primeiro acesso a cada um
+"""
+class ControleConcorrencia:
+    def __init__(self):
+        self.limitadores = {}
+        self.lock = threading.Lock()
+
+    def limitador(self, host):
+        with self.lock:
+            if host not in self.limitadores:
+                limitador = self.limitadores[host] = LimitadorAdaptativo()
+                metricas.concorrencia.definir_funcao(lambda: int(limitador.limite), host=host)
+            return self.limitadores[host]
+
+    """
+    Ocupa uma das vagas de requisição do host durante o bloco, aguardando se o limite estiver atingido
+
+    Parâmetros:
+        url (str): URL requisitada
+    """
+    @contextmanager
+    def requisicao(self, url):
+        limitador = self.limitador(urlparse(url).netloc or url)
+        limitador.adquirir()
+        try:
+            yield
+        finally:
+            limitador.liberar()
+
+    """
+    Registra uma requisição concluída no limitador do host (observador de instrumentacao.registrar_requisicao)
+    """
+    def registrar_requisicao(self, url, duracao, tamanho=0, status=None):
+        limitador = self.limitadores.get(urlparse(url).netloc or url)
+        if limitador is not None:
+            limitador.registrar(duracao, status)
+
+# Controle compartilhado pelos scrapers, alimentado pelas requisições registradas na instrumentação
+controle = ControleConcorrencia()
+instrumentacao.observadores.append(controle.registrar_requisicao)
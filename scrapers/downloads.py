@@ -0,0 +1,284 @@
+"""
+Etapa opcional de download dos PDFs e textos completos dos artigos, a partir dos links registrados pela extração em
+'article_links.csv'. Os downloads são feitos em paralelo, sob o mesmo controle de concorrência por host dos scrapers
+(scrapers/concorrencia.py), e cada corpo é gravado em disco em blocos, sem ser mantido em memória. Um download
+interrompido continua de onde parou (requisição com Range) na execução seguinte
+
+Os arquivos ficam em um armazenamento endereçado pelo conteúdo: objetos/<2 primeiros caracteres do sha256>/<sha256>.<ext>,
+de modo que documentos idênticos (ex.: o mesmo PDF em dois links) são guardados uma única vez. O índice JSONL
+(apenas acrescentado) associa cada URL ao seu hash; URLs já indexadas, cujo objeto existe, não são baixadas novamente
+
+Uso:
+    python pipeline.py --etapa documentos
+"""
+
+import concurrent.futures
+import csv
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import requests
+from monitoramento.instrumentacao import instrumentacao
+from monitoramento.metricas import metricas
+from scrapers.concorrencia import controle, LIMITE_MAXIMO
+from scrapers.scraper_basico import create_session, random_sleep, LINKS_CSV, MAX_RETRIES
+
+logger = logging.getLogger("DownloadDocumentos")
+
+# Diretório do armazenamento dos documentos
+DIRETORIO_DOCUMENTOS = "documentos"
+
+ARQUIVO_INDICE = "indice.jsonl"
+
+# Tamanho dos blocos lidos da resposta e gravados em disco (em bytes)
+TAMANHO_BLOCO = 1 << 16
+
+# Colunas de 'article_links.csv' com os links baixados, e o tipo de documento de cada uma
+COLUNAS_LINKS = {"pdf_link": "pdf", "text_link": "text"}
+
+# Extensão dos arquivos pelo Content-Type da resposta
+EXTENSOES = {"application/pdf": ".pdf", "text/html": ".html", "application/xml": ".xml", "text/xml": ".xml"}
+
+"""
+Calcula o hash SHA-256 de um arquivo, lendo-o em blocos
+
+Parâmetros:
+    caminho (str): Caminho do arquivo
+    h (hashlib._Hash): Hash a atualizar (padrão: None, cria um novo)
+
+Retorna:
+    hashlib._Hash: Hash atualizado com o conteúdo do arquivo
+"""
+def hash_arquivo(caminho, h=None):
+    h = h or hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloco)
+    return h
+
+"""
+Armazenamento dos documentos endereçado pelo conteúdo, com o índice URL -> sha256. Seguro para uso por várias threads
+
+Parâmetros:
+    diretorio (str): Diretório do armazenamento (criado se não existir)
+"""
+class ArmazemDocumentos:
+    def __init__(self, diretorio=DIRETORIO_DOCUMENTOS):
+        self.diretorio = diretorio
+        self.lock = threading.Lock()
+        self.indice = {}
+        os.makedirs(os.path.join(diretorio, "objetos"), exist_ok=True)
+        os.makedirs(os.path.join(diretorio, "parciais"), exist_ok=True)
+        caminho = os.path.join(diretorio, ARQUIVO_INDICE)
+        if os.path.exists(caminho):
+            with open(caminho, "r", encoding="utf-8") as f:
+                for linha in f:
+                    try:
+                        entrada = json.loads(linha)
+                    except json.JSONDecodeError:
+                        continue
+                    self.indice[entrada["url"]] = entrada
+
+    def caminho_objeto(self, sha256, extensao):
+        return os.path.join(self.diretorio, "objetos", sha256[:2], sha256 + extensao)
+
+    def caminho_parcial(self, url):
+        return os.path.join(self.diretorio, "parciais", hashlib.sha1(url.encode("utf-8")).hexdigest() + ".part")
+
+    def caminho_tipo_parcial(self, parcial):
+        return parcial + ".tipo"
+
+    """
+    Verifica se uma URL já foi baixada e o seu objeto ainda existe
+    """
+    def contem(self, url):
+        entrada = self.indice.get(url)
+        return entrada is not None and os.path.exists(os.path.join(self.diretorio, entrada["caminho"]))
+
+    """
+    Move um download concluído para o armazenamento e o registra no índice. Se o conteúdo já existir, o arquivo parcial é
+    descartado
+
+    Parâmetros:
+        url (str): URL do documento
+        parcial (str): Caminho do arquivo baixado
+        sha256 (str): Hash do conteúdo
+        extensao (str): Extensão do objeto
+        metadados (dict): Campos adicionais da entrada do índice (ex.: title, pid, tipo)
+
+    Retorna:
+        tupla: (entrada do índice (dict), True se o conteúdo já existia no armazenamento)
+    """
+    def guardar(self, url, parcial, sha256, extensao, metadados):
+        destino = self.caminho_objeto(sha256, extensao)
+        if os.path.exists(self.caminho_tipo_parcial(parcial)):
+            os.remove(self.caminho_tipo_parcial(parcial))
+        with self.lock:
+            duplicado = os.path.exists(destino)
+            if duplicado:
+                os.remove(parcial)
+            else:
+                os.makedirs(os.path.dirname(destino), exist_ok=True)
+                os.replace(parcial, destino)
+            entrada = {
+                "url": url, "sha256": sha256, "tamanho": os.path.getsize(destino),
+                "caminho": os.path.relpath(destino, self.diretorio), **metadados
+            }
+            with open(os.path.join(self.diretorio, ARQUIVO_INDICE), "a", encoding="utf-8") as f:
+                f.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+            self.indice[url] = entrada
+        return entrada, duplicado
+
+"""
+Define a extensão do documento pelo Content-Type da resposta ou, se desconhecido, pela URL
+
+Parâmetros:
+    content_type (str): Cabeçalho Content-Type
+    url (str): URL do documento
+
+Retorna:
+    str: Extensão com o ponto (ex.: ".pdf"), ou "" se não for possível determinar
+"""
+def extensao_documento(content_type, url):
+    tipo = (content_type or "").split(";")[0].strip().lower()
+    if tipo in EXTENSOES:
+        return EXTENSOES[tipo]
+    _, extensao = os.path.splitext(url.split("?")[0])
+    return extensao.lower() if len(extensao) <= 5 else ""
+
+"""
+Baixa um documento para o arquivo parcial, continuando um download anterior com uma requisição Range. O Content-Type é
+gravado ao lado do arquivo parcial (tipo_parcial), pois a resposta 416 de um download já completo não o informa. A
+latência registrada é o tempo até o início da resposta (o corpo de um PDF não reflete a carga do servidor); a vaga do
+host fica ocupada durante todo o download
+
+Parâmetros:
+    session (requests.Session): Sessão HTTP
+    url (str): URL do documento
+    parcial (str): Caminho do arquivo parcial
+    tipo_parcial (str): Caminho do arquivo com o Content-Type do download parcial
+
+Retorna:
+    tupla: (sha256 do conteúdo completo, Content-Type do documento)
+"""
+def baixar_para_parcial(session, url, parcial, tipo_parcial):
+    inicial = os.path.getsize(parcial) if os.path.exists(parcial) else 0
+    cabecalhos = {"Range": f"bytes={inicial}-"} if inicial else {}
+    random_sleep()
+    with controle.requisicao(url):
+        inicio = time.perf_counter()
+        try:
+            with metricas.requisicao(url):
+                resp = session.get(url, headers=cabecalhos, stream=True, timeout=60)
+        except requests.RequestException:
+            instrumentacao.registrar_requisicao(url, time.perf_counter() - inicio)
+            raise
+        latencia, recebidos = time.perf_counter() - inicio, 0
+        try:
+            with resp:
+                # 416: o arquivo parcial já contém o documento inteiro
+                if resp.status_code == 416 and inicial:
+                    content_type = None
+                    if os.path.exists(tipo_parcial):
+                        with open(tipo_parcial, "r", encoding="utf-8") as f:
+                            content_type = f.read().strip() or None
+                    return hash_arquivo(parcial).hexdigest(), content_type
+                resp.raise_for_status()
+                content_type = resp.headers.get("Content-Type")
+                if content_type:
+                    with open(tipo_parcial, "w", encoding="utf-8") as f:
+                        f.write(content_type)
+                # 206: o servidor aceitou o Range e o conteúdo é acrescentado; 200: o download recomeça do início
+                continuar = resp.status_code == 206
+                h = hash_arquivo(parcial) if continuar else hashlib.sha256()
+                with open(parcial, "ab" if continuar else "wb") as f:
+                    for bloco in resp.iter_content(TAMANHO_BLOCO):
+                        f.write(bloco)
+                        h.update(bloco)
+                        recebidos += len(bloco)
+                return h.hexdigest(), content_type
+        finally:
+            instrumentacao.registrar_requisicao(url, latencia, recebidos, resp.status_code)
+
+"""
+Baixa um documento, com até MAX_RETRIES tentativas, e o guarda no armazenamento
+
+Parâmetros:
+    session (requests.Session): Sessão HTTP
+    armazem (ArmazemDocumentos): Armazenamento dos documentos
+    link (dict): Com as chaves "url", "tipo", "title" e "pid"
+
+Retorna:
+    str: "baixado", "duplicado" ou "falha"
+"""
+@instrumentacao.cronometrar()
+def baixar_documento(session, armazem, link):
+    url = link["url"]
+    parcial = armazem.caminho_parcial(url)
+    for tentativa in range(1, MAX_RETRIES + 1):
+        try:
+            sha256, content_type = baixar_para_parcial(session, url, parcial, armazem.caminho_tipo_parcial(parcial))
+            metadados = {"tipo": link["tipo"], "title": link["title"], "pid": link["pid"]}
+            _, duplicado = armazem.guardar(url, parcial, sha256, extensao_documento(content_type, url), metadados)
+            return "duplicado" if duplicado else "baixado"
+        except Exception as e:
+            logger.warning(f"Erro ao baixar {url} (tentativa {tentativa}/{MAX_RETRIES}): {e}")
+            if tentativa < MAX_RETRIES:
+                metricas.retentativas.inc(tipo="documento")
+                time.sleep(5)
+    logger.error(f"Download de {url} falhou após {MAX_RETRIES} tentativas. O arquivo parcial é mantido.")
+    return "falha"
+
+"""
+Lê os links de 'article_links.csv'
+
+Parâmetros:
+    links_csv (str): Caminho do CSV
+    tipos (tuple): Tipos de documento baixados ("pdf" e/ou "text")
+
+Retorna:
+    list: Dicionários com as chaves "url", "tipo", "title" e "pid", sem URLs repetidas
+"""
+def carregar_links(links_csv, tipos):
+    links, vistos = [], set()
+    with open(links_csv, "r", encoding="utf-8", newline="") as f:
+        for linha in csv.DictReader(f):
+            for coluna, tipo in COLUNAS_LINKS.items():
+                url = (linha.get(coluna) or "").strip()
+                if tipo in tipos and url and url not in vistos:
+                    vistos.add(url)
+                    links.append({"url": url, "tipo": tipo, "title": linha.get("title"), "pid": linha.get("pid")})
+    return links
+
+"""
+Baixa os documentos dos artigos listados em 'article_links.csv' para o armazenamento
+
+Parâmetros:
+    links_csv (str): CSV gerado pela extração (padrão: LINKS_CSV)
+    diretorio (str): Diretório do armazenamento (padrão: DIRETORIO_DOCUMENTOS)
+    tipos (tuple): Tipos de documento baixados (padrão: ("pdf", "text"))
+    max_workers (int): Número de threads (padrão: LIMITE_MAXIMO; as requisições simultâneas são limitadas por host)
+
+Retorna:
+    dict: Contagem de documentos por resultado ("baixado", "duplicado", "existente", "falha")
+"""
+@instrumentacao.etapa("documentos", linhas=lambda contagem: contagem["baixado"] + contagem["duplicado"])
+def run_downloads(links_csv=LINKS_CSV, diretorio=DIRETORIO_DOCUMENTOS, tipos=("pdf", "text"), max_workers=LIMITE_MAXIMO):
+    armazem = ArmazemDocumentos(diretorio)
+    links = carregar_links(links_csv, tipos)
+    pendentes = [link for link in links if not armazem.contem(link["url"])]
+    contagem = {"baixado": 0, "duplicado": 0, "existente": len(links) - len(pendentes), "falha": 0}
+    logger.info(f"{len(links)} documentos listados, {len(pendentes)} a baixar.")
+
+    session = create_session()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for resultado in executor.map(lambda link: baixar_documento(session, armazem, link), pendentes):
+            contagem[resultado] += 1
+    logger.info(
+        f"Documentos: {contagem['baixado']} baixados, {contagem['duplicado']} duplicados, "
+        f"{contagem['existente']} já existentes, {contagem['falha']} falhas"
+    )
+    return contagem
@@ -1,7 +1,12 @@
 import pandas as pd
 import ast
 import re
+import os
+import json
 from unidecode import unidecode
+from rapidfuzz import fuzz, process
+from monitoramento.cache import CacheLRU
+from monitoramento.instrumentacao import instrumentacao
 
 # Crição de dicionário de municípios de acordo com municipios_brasil.csv
 
@@ -16,21 +21,199 @@ df_municipios["sigla_estado_normalizada"] = df_municipios["uf"].str.upper().str.
 # Cria o dicionário de cidades com nome do município normalizado e sigla do estado
 cidades_estados = dict(zip(df_municipios["municipio_normalizado"], df_municipios["sigla_estado_normalizada"]))
 
+# Resolução de cidade/UF
+
+"""
+Resolve o estado (UF) de uma cidade a partir da tabela de municípios. Mantém:
+    - Um índice composto (cidade, UF), utilizado quando a afiliação já informa a UF, para distinguir municípios homônimos
+    - Um índice por cidade, com a mesma prioridade do dicionário cidades_estados
+    - Listas de escolhas pré-computadas (por UF e por letra inicial) para o fallback aproximado com rapidfuzz, de modo que
+      uma cidade com erro de grafia é comparada apenas com os municípios do seu bloco. Os resultados aproximados são memorizados
+
+Parâmetros:
+    df (pd.DataFrame): Tabela de municípios com as colunas "municipio_normalizado" e "sigla_estado_normalizada"
+    limiar (int): Pontuação mínima (fuzz.ratio) para aceitar uma correspondência aproximada (padrão: 90)
+"""
+class ResolvedorLocalidades:
+    def __init__(self, df, limiar=90):
+        self.limiar = limiar
+        pares = [
+            (cidade, uf)
+            for cidade, uf in zip(df["municipio_normalizado"], df["sigla_estado_normalizada"])
+            if cidade and isinstance(uf, str)
+        ]
+        self.indice_composto = set(pares)
+        self.indice_cidade = dict(pares)
+        self.ufs = {uf for _, uf in pares}
+        self.escolhas_por_uf = {}
+        self.escolhas_por_inicial = {}
+        for cidade, uf in pares:
+            self.escolhas_por_uf.setdefault(uf, []).append(cidade)
+            self.escolhas_por_inicial.setdefault(cidade[0], []).append(cidade)
+        self.memoria_aproximada = {}
+
+    """
+    Normaliza o nome de uma cidade (sem acentos, minúsculas e sem espaços extras)
+    """
+    @staticmethod
+    def normalizar(cidade):
+        return unidecode(str(cidade)).lower().strip()
+
+    """
+    Resolve a cidade para (cidade normalizada do município, UF)
+
+    Parâmetros:
+        cidade (str): Nome da cidade
+        uf (str): UF extraída da afiliação, se houver
+
+    Retorna:
+        tupla: (cidade, UF) – strings vazias se a cidade não for encontrada
+    """
+    def resolver(self, cidade, uf=""):
+        cidade_norm = self.normalizar(cidade)
+        if not cidade_norm:
+            return "", ""
+        uf = (uf or "").strip().upper()
+        if uf not in self.ufs:
+            uf = ""
+        if uf and (cidade_norm, uf) in self.indice_composto:
+            return cidade_norm, uf
+        if cidade_norm in self.indice_cidade:
+            return cidade_norm, self.indice_cidade[cidade_norm]
+        return self.resolver_aproximado(cidade_norm, uf)
+
+    """
+    Fallback aproximado: procura a cidade entre os municípios da UF informada ou, sem UF, entre os municípios com a mesma
+    letra inicial
+
+    Parâmetros:
+        cidade_norm (str): Nome da cidade normalizado
+        uf (str): UF válida ou string vazia
+
+    Retorna:
+        tupla: (cidade, UF) – strings vazias se nenhuma correspondência atingir o limiar
+    """
+    def resolver_aproximado(self, cidade_norm, uf=""):
+        chave = (cidade_norm, uf)
+        if chave in self.memoria_aproximada:
+            return self.memoria_aproximada[chave]
+        if uf:
+            escolhas = self.escolhas_por_uf.get(uf, [])
+        else:
+            escolhas = self.escolhas_por_inicial.get(cidade_norm[0], [])
+        resultado = ("", "")
+        melhor = process.extractOne(cidade_norm, escolhas, scorer=fuzz.ratio, score_cutoff=self.limiar) if escolhas else None
+        if melhor:
+            cidade_encontrada = melhor[0]
+            resultado = (cidade_encontrada, uf or self.indice_cidade[cidade_encontrada])
+        self.memoria_aproximada[chave] = resultado
+        return resultado
+
+# Resolvedor padrão, construído a partir de municipios_brasil.csv
+resolvedor_localidades = ResolvedorLocalidades(df_municipios)
+
 # Processamento das instituições
 
+# Expressões regulares pré-compiladas utilizadas na análise das afiliações
+RE_CEP = re.compile(r'\d{5}-\d{3}')
+RE_CIDADE_UF = re.compile(r'([a-zA-Z\s]+)-([a-zA-Z]+)')
+RE_SOMENTE_LETRAS = re.compile(r'^[a-zA-Z\s]+$')
+RE_PARENTESES = re.compile(r'\s*\([^)]*\)')
+RE_ESPACOS = re.compile(r'\s+')
+
+INCLUDE_KEYWORDS = ("universidade", "instituto", "faculdade", "escola", "centro")
+EXCLUDE_KEYWORDS = ("departamento", "curso", "laboratório", "programa")
+
+"""
+Cache LRU (monitoramento/cache.py) dos resultados de parse_institution_detail, indexado pela string de afiliação
+normalizada. Pode ser persistido em um arquivo JSON entre execuções
+
+Parâmetros:
+    tamanho_maximo (int): Número máximo de afiliações mantidas em memória (padrão: 50000)
+"""
+class CacheAfiliacoes(CacheLRU):
+    def __init__(self, tamanho_maximo=50000):
+        super().__init__(tamanho_maximo)
+
+    """
+    Salva as entradas do cache em um arquivo JSON, da menos para a mais recentemente utilizada
+
+    Parâmetros:
+        caminho (str): Caminho do arquivo de cache
+    """
+    def salvar(self, caminho):
+        with self.lock:
+            dados = [[chave, list(valor)] for chave, valor in self.entradas.items()]
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(dados, f, ensure_ascii=False)
+
+    """
+    Carrega as entradas de um arquivo JSON salvo por salvar(), se ele existir
+
+    Parâmetros:
+        caminho (str): Caminho do arquivo de cache
+
+    Retorna:
+        int: Número de entradas carregadas
+    """
+    def carregar(self, caminho):
+        if not os.path.exists(caminho):
+            return 0
+        with open(caminho, "r", encoding="utf-8") as f:
+            dados = json.load(f)
+        for chave, valor in dados:
+            self.guardar(chave, tuple(valor))
+        return len(dados)
+
+# Cache padrão utilizado por parse_institution_detail
+cache_afiliacoes = CacheAfiliacoes()
+
+"""
+Normaliza uma string de afiliação para uso como chave do cache (remove espaços extras)
+
+Parâmetros:
+    inst_str (str): String com detalhes da instituição
+
+Retorna:
+    str: String normalizada
+"""
+def normalizar_afiliacao(inst_str):
+    return RE_ESPACOS.sub(' ', str(inst_str)).strip()
+
 """
 Processa uma string com os detalhes de uma instituição e extrai:
     - Nome da IES: token que contenha palavras-chave institucionais
     - Cidade e UF: Se houver um token com CEP, utiliza-o para extrair “cidade-estado”. Caso contrário, tenta obter esses dados a partir dos últimos tokens.
     - País: Utiliza o último token se composto apenas por letras.
+Os resultados são memorizados em cache_afiliacoes, de modo que afiliações repetidas são apenas consultadas
     
 Parâmetros:
     inst_str (str): String com detalhes da instituição, com itens separados por vírgula
+    cache (CacheAfiliacoes): Cache a ser utilizado (padrão: cache_afiliacoes). Se None, não utiliza cache
     
 Retorna:
     tupla: (instituição, cidade, UF, país) – strings
 """
-def parse_institution_detail(inst_str):
+def parse_institution_detail(inst_str, cache=cache_afiliacoes):
+    chave = normalizar_afiliacao(inst_str)
+    if cache is None:
+        return extrair_detalhes_instituicao(chave)
+    resultado = cache.obter(chave)
+    if resultado is None:
+        resultado = extrair_detalhes_instituicao(chave)
+        cache.guardar(chave, resultado)
+    return resultado
+
+"""
+Realiza a extração propriamente dita de parse_institution_detail, sem consultar o cache
+
+Parâmetros:
+    inst_str (str): String normalizada com detalhes da instituição
+
+Retorna:
+    tupla: (instituição, cidade, UF, país) – strings
+"""
+def extrair_detalhes_instituicao(inst_str):
     tokens = [t.strip() for t in inst_str.split(',') if t.strip()]
     
     institution = ""
@@ -41,12 +224,12 @@ def parse_institution_detail(inst_str):
     # Procura um token contendo CEP 
     location_token = None
     for token in tokens:
-        if re.search(r'\d{5}-\d{3}', token):
+        if RE_CEP.search(token):
             location_token = token
             break
     if location_token:
-        cleaned = re.sub(r'\d{5}-\d{3}', '', location_token).strip()
-        m = re.match(r'([a-zA-Z\s]+)-([a-zA-Z]+)', cleaned)
+        cleaned = RE_CEP.sub('', location_token).strip()
+        m = RE_CIDADE_UF.match(cleaned)
         if m:
             city = m.group(1).strip().lower()
             state = m.group(2).strip().upper()
@@ -55,7 +238,7 @@ def parse_institution_detail(inst_str):
         rev_tokens = tokens[::-1]
         if rev_tokens:
             last = rev_tokens[0]
-            if re.match(r'^[a-zA-Z\s]+$', last):
+            if RE_SOMENTE_LETRAS.match(last):
                 country = last.lower()
             if len(rev_tokens) >= 2:
                 possible_state = rev_tokens[1]
@@ -73,28 +256,22 @@ def parse_institution_detail(inst_str):
     
     if not country and tokens:
         last = tokens[-1]
-        if re.match(r'^[a-zA-Z\s]+$', last):
+        if RE_SOMENTE_LETRAS.match(last):
             country = last.lower()
     
     # Extração do nome da instituição
-    include_keywords = ["universidade", "instituto", "faculdade", "escola", "centro"]
-    exclude_keywords = ["departamento", "curso", "laboratório", "programa"]
+    tokens_lower = [token.lower() for token in tokens]
     inst_candidates = []
-    for token in tokens:
-        token_lower = token.lower()
-        if any(kw in token_lower for kw in include_keywords) and not any(ex_kw in token_lower for ex_kw in exclude_keywords):
+    for token, token_lower in zip(tokens, tokens_lower):
+        if any(kw in token_lower for kw in INCLUDE_KEYWORDS) and not any(ex_kw in token_lower for ex_kw in EXCLUDE_KEYWORDS):
             inst_candidates.append(token)
+    if not inst_candidates:
+        for token, token_lower in zip(tokens, tokens_lower):
+            if any(kw in token_lower for kw in INCLUDE_KEYWORDS):
+                inst_candidates.append(token)
     if inst_candidates:
         institution = max(inst_candidates, key=len).lower()
-        institution = re.sub(r'\s*\([^)]*\)', '', institution).strip()
-    else:
-        for token in tokens:
-            token_lower = token.lower()
-            if any(kw in token_lower for kw in include_keywords):
-                inst_candidates.append(token)
-        if inst_candidates:
-            institution = max(inst_candidates, key=len).lower()
-            institution = re.sub(r'\s*\([^)]*\)', '', institution).strip()
+        institution = RE_PARENTESES.sub('', institution).strip()
     
     return institution, city, state, country
 
@@ -103,11 +280,12 @@ Processa a coluna "institutions" de uma publicação. A string de entrada é ava
 
 Parâmetros:
     inst_str (str): String representando uma lista de instituições
+    cache (CacheAfiliacoes): Cache repassado a parse_institution_detail (padrão: cache_afiliacoes)
     
 Retorna:
     dict: Com chaves "Instituicao", "Cidade", "Estado" e "Pais"
 """
-def process_institutions_column(inst_str):
+def process_institutions_column(inst_str, cache=cache_afiliacoes):
     try:
         institutions = ast.literal_eval(inst_str)
     except Exception:
@@ -119,7 +297,7 @@ def process_institutions_column(inst_str):
     countries = []
     
     for inst in institutions:
-        nome, cidade, uf, pais = parse_institution_detail(inst)
+        nome, cidade, uf, pais = parse_institution_detail(inst, cache)
         if pais != "brazil":
             continue
         if nome:
@@ -139,7 +317,8 @@ def process_institutions_column(inst_str):
     }
 
 """
-Para uma string de cidades separadas por ";", utiliza exclusivamente o dicionário de cidades (baseado no arquivo de municípios) para retornar a sigla do estado de cada cidade
+Para uma string de cidades separadas por ";", utiliza exclusivamente a tabela de municípios (via resolvedor_localidades, com
+fallback aproximado para nomes com erro de grafia) para retornar a sigla do estado de cada cidade
 
 Parâmetros:
     city_str (str): Cidades separadas por ";"
@@ -154,8 +333,7 @@ def map_state_from_city(city_str):
     cities = [c.strip() for c in city_str.split(";") if c.strip()]
     states = []
     for city in cities:
-        city_norm = unidecode(city).lower().strip()
-        state = cidades_estados.get(city_norm, "")
+        _, state = resolvedor_localidades.resolver(city)
         if state:
             states.append(state)
         else:
@@ -163,3 +341,174 @@ def map_state_from_city(city_str):
     # Remove entradas vazias e junta com ";"
     states = [s for s in states if s]
     return "; ".join(states)
+
+# Processamento em lote
+
+# Tabela de municípios sem duplicatas, mantendo a mesma prioridade do dicionário cidades_estados (a última ocorrência vence)
+df_cidades_estados = (
+    df_municipios[["municipio_normalizado", "sigla_estado_normalizada"]]
+    .drop_duplicates(subset="municipio_normalizado", keep="last")
+    .set_index("municipio_normalizado")
+)
+
+"""
+Converte um valor da coluna "institutions" em lista, avaliando a string apenas quando necessário
+
+Parâmetros:
+    valor: String representando uma lista de instituições, lista ou valor nulo
+
+Retorna:
+    list: Lista de instituições (vazia se o valor for inválido)
+"""
+def avaliar_lista_instituicoes(valor):
+    if isinstance(valor, (list, tuple)):
+        return list(valor)
+    try:
+        institutions = ast.literal_eval(valor)
+    except Exception:
+        return []
+    return list(institutions) if isinstance(institutions, (list, tuple)) else []
+
+# Pares (cidade, UF) da tabela de municípios, para o join composto
+df_cidades_ufs = (
+    df_municipios[["municipio_normalizado", "sigla_estado_normalizada"]]
+    .drop_duplicates()
+    .assign(encontrado=True)
+)
+
+"""
+Versão vetorizada de map_state_from_city: mapeia uma série de cidades (uma cidade por linha) para a sigla do estado.
+Quando a UF extraída da afiliação é informada, o join é feito primeiro pelo par (cidade, UF), o que resolve municípios
+homônimos; em seguida pela cidade. Apenas os pares distintos não encontrados passam pelo fallback aproximado do
+resolvedor_localidades
+
+Parâmetros:
+    cidades (pd.Series): Série com o nome de uma cidade por linha
+    ufs (pd.Series): UFs extraídas das afiliações, alinhadas com cidades (opcional)
+
+Retorna:
+    pd.Series: Siglas dos estados, com o mesmo índice de cidades ("" quando a cidade não for encontrada)
+"""
+def map_state_from_city_batch(cidades, ufs=None):
+    if cidades.empty:
+        return pd.Series("", index=cidades.index, dtype=object)
+    ufs_valores = ufs.fillna("").astype(str).values if ufs is not None else ""
+    pares = pd.DataFrame({"cidade": cidades.astype(str).values, "uf": ufs_valores}).drop_duplicates()
+    pares["cidade_norm"] = pares["cidade"].map(ResolvedorLocalidades.normalizar)
+    pares["uf_norm"] = pares["uf"].str.strip().str.upper()
+
+    # Join composto (cidade, UF)
+    pares = pares.merge(
+        df_cidades_ufs,
+        how="left",
+        left_on=["cidade_norm", "uf_norm"],
+        right_on=["municipio_normalizado", "sigla_estado_normalizada"]
+    )
+    siglas = pares["uf_norm"].where(pares["encontrado"].fillna(False).astype(bool), "")
+
+    # Join apenas pela cidade
+    sem_uf = siglas == ""
+    siglas = siglas.mask(sem_uf, pares["cidade_norm"].map(df_cidades_estados["sigla_estado_normalizada"]).fillna(""))
+    siglas = siglas.where(pares["cidade_norm"] != "", "")
+
+    # Fallback aproximado para os pares restantes
+    for i in pares.index[siglas == ""]:
+        cidade_norm = pares.at[i, "cidade_norm"]
+        if cidade_norm:
+            uf = pares.at[i, "uf_norm"]
+            _, sigla = resolvedor_localidades.resolver_aproximado(cidade_norm, uf if uf in resolvedor_localidades.ufs else "")
+            siglas.at[i] = sigla
+
+    mapa = dict(zip(zip(pares["cidade"], pares["uf"]), siglas))
+    chaves = zip(cidades.astype(str).values, ufs_valores if ufs is not None else [""] * len(cidades))
+    return pd.Series([mapa[chave] for chave in chaves], index=cidades.index, dtype=object)
+
+"""
+Processa a coluna "institutions" inteira de uma só vez. Cada string distinta é avaliada uma única vez, a coluna é explodida,
+apenas as afiliações distintas passam por parse_institution_detail() e os estados são obtidos por joins vetorizados com a
+tabela de municípios (map_state_from_city_batch), utilizando a UF da afiliação, quando houver, para desambiguar a cidade
+
+Parâmetros:
+    coluna (pd.Series ou iterável): Valores da coluna "institutions"
+    cache (CacheAfiliacoes): Cache repassado a parse_institution_detail (padrão: cache_afiliacoes)
+    mapa_canonico (dict): Mapa alias -> nome canônico (ver tratamento/canonicalizacao_instituicoes.py) aplicado aos nomes
+                          das instituições. Se None, os nomes são mantidos como extraídos
+
+Retorna:
+    pd.DataFrame: Com colunas "Instituicao", "Cidade", "Estado" e "Pais", com o mesmo índice da série de entrada
+"""
+@instrumentacao.cronometrar(linhas=len)
+def process_institutions_batch(coluna, cache=cache_afiliacoes, mapa_canonico=None):
+    serie = coluna if isinstance(coluna, pd.Series) else pd.Series(list(coluna), dtype=object)
+    colunas = ["Instituicao", "Cidade", "Estado", "Pais"]
+    resultado = pd.DataFrame("", index=serie.index, columns=colunas)
+    if serie.empty:
+        return resultado
+
+    # Avalia cada string distinta uma única vez e trabalha com posições (o índice de entrada pode ter repetições)
+    posicional = serie.reset_index(drop=True)
+    avaliadas = {}
+    listas = []
+    for valor in posicional:
+        if isinstance(valor, str):
+            if valor not in avaliadas:
+                avaliadas[valor] = avaliar_lista_instituicoes(valor)
+            listas.append(avaliadas[valor])
+        else:
+            listas.append(avaliar_lista_instituicoes(valor))
+
+    afiliacoes = pd.Series(listas, dtype=object).explode().dropna()
+    if afiliacoes.empty:
+        return resultado
+
+    # Apenas as afiliações distintas são analisadas
+    unicas = afiliacoes.unique()
+    detalhes_unicos = pd.DataFrame(
+        [parse_institution_detail(inst, cache) for inst in unicas],
+        index=unicas,
+        columns=["Instituicao", "Cidade", "Estado", "Pais"]
+    )
+    if mapa_canonico:
+        detalhes_unicos["Instituicao"] = detalhes_unicos["Instituicao"].map(lambda n: mapa_canonico.get(n, n))
+    detalhes = detalhes_unicos.reindex(afiliacoes.values)
+    detalhes.index = afiliacoes.index
+    detalhes = detalhes[detalhes["Pais"] == "brazil"]
+
+    # O estado é obtido a partir da tabela de municípios, usando a UF da afiliação apenas para desambiguar a cidade
+    com_cidade = detalhes["Cidade"] != ""
+    cidades = detalhes.loc[com_cidade, "Cidade"]
+    estados = map_state_from_city_batch(cidades, detalhes.loc[com_cidade, "Estado"])
+
+    agregados = {
+        "Instituicao": detalhes.loc[detalhes["Instituicao"] != "", "Instituicao"],
+        "Cidade": cidades,
+        "Estado": estados[estados != ""],
+        "Pais": detalhes["Pais"]
+    }
+    for nome_coluna, valores in agregados.items():
+        juntos = valores.groupby(level=0, sort=False).agg("; ".join)
+        coluna_resultado = pd.Series("", index=posicional.index, dtype=object)
+        coluna_resultado.loc[juntos.index] = juntos.values
+        resultado[nome_coluna] = coluna_resultado.values
+    return resultado
+
+"""
+Processa a coluna "institutions" de um CSV tratado ('articles_tratamento.csv') e salva o CSV com as colunas "Instituicao",
+"Cidade", "Estado" e "Pais" no lugar da coluna original ('articles_dw.csv')
+
+Parâmetros:
+    input_csv (str): Caminho do CSV de entrada
+    output_csv (str): Caminho do CSV de saída
+    mapa_canonico (dict): Mapa alias -> nome canônico repassado a process_institutions_batch (padrão: None)
+
+Retorna:
+    pd.DataFrame: DataFrame salvo
+"""
+@instrumentacao.etapa("instituicoes", linhas=len)
+def process_institutions_csv(input_csv, output_csv, mapa_canonico=None):
+    df = pd.read_csv(input_csv, encoding="utf-8")
+    df = pd.concat([df, process_institutions_batch(df["institutions"], mapa_canonico=mapa_canonico)], axis=1)
+    df["Pais"] = df["Pais"].apply(lambda x: x.lower() if x else x)
+    df.drop(columns=["institutions"], inplace=True)
+    df.to_csv(output_csv, index=False, encoding="utf-8")
+    return df
@@ -8,11 +8,16 @@ import time
 import random
 import re
 import logging
-import csv
 from datetime import datetime
 import concurrent.futures
 from requests.adapters import HTTPAdapter
 import os
+import csv
+from monitoramento.instrumentacao import instrumentacao
+from monitoramento.metricas import metricas, iniciar_servidor
+from scrapers.artigo import Artigo, salvar_csv
+from scrapers.arquivo_paginas import ArquivoPaginas, obter_arquivo
+from scrapers.concorrencia import controle, LIMITE_MAXIMO
 
 # Configurações da URL
 BASE_URL = "https://www.scielo.br"
@@ -30,6 +35,9 @@ MAX_WAIT = 0.7
 # Arquivo que armazena as edições já processadas
 PROGRESS_FILE = "processed_editions.txt"
 
+# Links do texto completo e do PDF de cada artigo, utilizados pela etapa de download (scrapers/downloads.py)
+LINKS_CSV = "article_links.csv"
+
 # Configuração do Logger
 logging.basicConfig(
     level=logging.INFO,  # Altere para DEBUG para mais detalhes
@@ -107,7 +115,8 @@ def parse_date_yyyymmdd(date_str):
         return None
 
 """
-Realiza uma requisição GET usando a sessão fornecida e retorna um objeto BeautifulSoup do HTML
+Realiza uma requisição GET usando a sessão fornecida e retorna um objeto BeautifulSoup do HTML. Se o arquivo de páginas
+estiver ativo (NTBD_ARQUIVO_PAGINAS), a resposta é guardada nele antes do parse
 
 Parâmetros:
     session (requests.Session): Sessão HTTP configurada
@@ -120,9 +129,44 @@ def get_soup(session, url):
 
     logger.debug(f"Requisitando: {url}")
     random_sleep()
-    resp = session.get(url, timeout=30)
+    # A latência é medida após obter a vaga do host, sem incluir a espera no controle de concorrência
+    with controle.requisicao(url):
+        inicio = time.perf_counter()
+        try:
+            with metricas.requisicao(url):
+                resp = session.get(url, timeout=30)
+        except requests.RequestException:
+            instrumentacao.registrar_requisicao(url, time.perf_counter() - inicio)
+            raise
+        instrumentacao.registrar_requisicao(url, time.perf_counter() - inicio, len(resp.content), resp.status_code)
     resp.raise_for_status()
-    return BeautifulSoup(resp.text, "html.parser")
+    arquivo = obter_arquivo()
+    if arquivo is not None:
+        arquivo.guardar(url, resp.content, resp.status_code, resp.encoding)
+    with instrumentacao.medir("parse_html"):
+        return BeautifulSoup(resp.text, "html.parser")
+
+"""
+Lê uma página do arquivo de páginas e retorna um objeto BeautifulSoup, decodificando o corpo com a codificação registrada
+na requisição original (como resp.text em get_soup)
+
+Parâmetros:
+    arquivo (ArquivoPaginas): Arquivo de páginas
+    url (str): URL da página
+
+Retorna:
+    BeautifulSoup: Objeto com o conteúdo HTML da página, ou None se a URL não estiver no arquivo
+"""
+def get_soup_archived(arquivo, url):
+    registro = arquivo.ler(url)
+    if registro is None:
+        logger.warning(f"Página ausente no arquivo: {url}")
+        return None
+    cabecalho, conteudo = registro
+    with instrumentacao.medir("parse_html"):
+        if cabecalho.get("encoding"):
+            return BeautifulSoup(conteudo.decode(cabecalho["encoding"], errors="replace"), "html.parser")
+        return BeautifulSoup(conteudo, "html.parser")
 
 """
 Carrega as edições já processadas a partir do arquivo PROGRESS_FILE
@@ -197,7 +241,18 @@ Retorna:
 def extract_issues_links(session, url):
     
     logger.info(f"Extraindo issues (anos/volumes) de {url}")
-    soup = get_soup(session, url)
+    return parse_issues(get_soup(session, url))
+
+"""
+Interpreta a página de grid de uma revista (ver extract_issues_links)
+
+Parâmetros:
+    soup (BeautifulSoup): Página de grid
+
+Retorna:
+    list: Lista de dicionários com as chaves "year", "volume" e "edition_links".
+"""
+def parse_issues(soup):
     
     table = soup.find("table", class_="table-hover")
     if not table:
@@ -229,24 +284,21 @@ def extract_issues_links(session, url):
     return result
 
 """
-Extrai os dados dos artigos de uma edição específica
+Interpreta a página de uma edição
 
 Parâmetros:
-    session (requests.Session): Sessão HTTP para realizar as requisições
-    edition_url (str): Caminho relativo da edição (ex.: "/j/qn/i/2025.v48n1/")
+    soup (BeautifulSoup): Página da edição
+    edition_url (str): Caminho relativo da edição
 
 Retorna:
-    list: Lista de dicionários com os dados extraídos do artigo (data de publicação, tipo título, autores, PID, e links para abstract, texto e PDF)
+    list: Lista de objetos Artigo com os dados extraídos
 """
-def extract_articles_from_edition(session, edition_url):
-    
-    full_url = BASE_URL + edition_url
-    logger.debug(f"Extraindo artigos da edição: {full_url}")
-    soup = get_soup(session, full_url)
+@instrumentacao.cronometrar(linhas=len)
+def parse_edition(soup, edition_url):
     
     articles_table = soup.find("table", class_="table-journal-list")
     if not articles_table:
-        logger.warning(f"Não foi encontrada a table-journal-list em {full_url}")
+        logger.warning(f"Não foi encontrada a table-journal-list em {BASE_URL + edition_url}")
         return []
     
     tbody = articles_table.find("tbody")
@@ -302,39 +354,34 @@ def extract_articles_from_edition(session, edition_url):
                     elif any(word in label_lower for word in ['pdf']):
                         pdf_link = full_link
 
-        article_info = {
-            "edition_url": edition_url, 
-            "publication_date": publication_date,
-            "publication_type": publication_type,
-            "title": title,
-            "authors": authors,
-            "pid": pid,
-            "abstract_link": abstract_link,
-            "text_link": text_link,
-            "pdf_link": pdf_link,
-        }
+        article_info = Artigo(
+            edition_url=edition_url,
+            publication_date=publication_date,
+            publication_type=publication_type,
+            title=title,
+            authors=authors,
+            pid=pid,
+            abstract_link=abstract_link,
+            text_link=text_link,
+            pdf_link=pdf_link,
+        )
         articles_data.append(article_info)
     
     logger.info(f"Encontrados {len(articles_data)} artigos na edição {edition_url}")
     return articles_data
 
 """
-Extrai as palavras-chave do abstract de um artigo
+Interpreta as palavras-chave da página do abstract
 
 Parâmetros:
-    session (requests.Session): Sessão HTTP para realizar a requisição
-    abstract_url (str): URL do abstract do artigo
+    soup (BeautifulSoup): Página do abstract
 
 Retorna:
-    list: Lista de palavras-chave extraídas. Retorna uma lista vazia se a URL for inválida ou não contiver keywords
+    list: Lista de palavras-chave extraídas
 """
-def extract_keywords_etc(session, abstract_url):
-    
-    if not abstract_url:
-        return []
+@instrumentacao.cronometrar()
+def parse_keywords(soup):
     
-    logger.debug(f"Extraindo keywords de: {abstract_url}")
-    soup = get_soup(session, abstract_url)
     keywords = []
     paragraphs = soup.find_all("p")
     for p in paragraphs:
@@ -353,21 +400,17 @@ def extract_keywords_etc(session, abstract_url):
     return keywords
 
 """
-Extrai as informações institucionais a partir do abstract do artigo
+Interpreta as instituições da página do abstract
 
 Parâmetros:
-    session (requests.Session): Sessão HTTP para realizar a requisição
-    abstract_url (str): URL do abstract do artigo
+    soup (BeautifulSoup): Página do abstract
 
 Retorna:
-    list: Lista com as descrições das instituições extraídas. Retorna uma lista vazia se não houver dados
+    list: Lista com as descrições das instituições extraídas
 """
-def extract_institutions_from_article_page(session, abstract_url):
+@instrumentacao.cronometrar()
+def parse_institutions(soup):
     
-    if not abstract_url:
-        return []
-    logger.debug(f"Extraindo instituições de: {abstract_url}")
-    soup = get_soup(session, abstract_url)
     institutions = []
     modals = soup.find_all("div", class_="modal-body")
     for modal in modals:
@@ -382,6 +425,40 @@ def extract_institutions_from_article_page(session, abstract_url):
 
 MAX_RETRIES = 3
 
+"""
+Extrai os artigos de uma edição, completando cada um com ano, volume, número da edição, revista, palavras-chave e
+instituições. As páginas são obtidas pela função informada, o que permite a mesma extração pela rede (get_soup) ou a
+partir do arquivo de páginas (get_soup_archived). A página do abstract é obtida uma única vez por artigo, para as
+palavras-chave e as instituições
+
+Parâmetros:
+    ed_link (str): URL da edição
+    year (int): Ano da edição
+    volume (int): Volume da edição
+    journal_name (str): Nome da revista
+    fetch (função): Recebe uma URL e retorna o BeautifulSoup da página (ou None se indisponível)
+
+Retorna:
+    list: Lista de objetos Artigo com os dados dos artigos extraídos
+"""
+def extract_edition(ed_link, year, volume, journal_name, fetch):
+
+    logger.debug(f"Extraindo artigos da edição: {BASE_URL + ed_link}")
+    soup = fetch(BASE_URL + ed_link)
+    articles = parse_edition(soup, ed_link) if soup is not None else []
+    # Extração do número da edição a partir da URL: exemplo "/j/qn/i/2025.v48n1/" -> "1"
+    match = re.search(r'n(\d+)', ed_link)
+    edition_number = match.group(1) if match else ""
+    for art in articles:
+        art["year"] = year
+        art["volume"] = volume
+        art["edition_number"] = edition_number
+        art["journal"] = journal_name
+        abstract_soup = fetch(art["abstract_link"]) if art["abstract_link"] else None
+        art["keywords"] = parse_keywords(abstract_soup) if abstract_soup is not None else []
+        art["institutions"] = parse_institutions(abstract_soup) if abstract_soup is not None else []
+    return articles
+
 """
 Tenta processar uma edição múltiplas (MAX_RETRIES) vezes antes de desistir e retorna os artigos extraídos
 
@@ -393,35 +470,24 @@ Parâmetros:
     session (requests.Session): Sessão HTTP utilizada para as requisições
 
 Retorna:
-    list: Lista de dicionários com os dados dos artigos extraídos
-    Se todas as tentativas falharem, retorna uma lista vazia
+    list: Lista de objetos Artigo com os dados dos artigos extraídos
+    Se todas as tentativas falharem, lança o erro da última tentativa (a edição é contada como falha por quem a chamou)
 """
+@instrumentacao.cronometrar(linhas=len)
 def process_edition_with_retries(ed_link, year, volume, journal_name, session):
     
     for attempt in range(1, MAX_RETRIES + 1):
         try:
             logger.info(f"Tentando processar edição {ed_link} (Tentativa {attempt}/{MAX_RETRIES})")
-            articles = extract_articles_from_edition(session, ed_link)
-            # Extração do número da edição a partir da URL: exemplo "/j/qn/i/2025.v48n1/" -> "1"
-            match = re.search(r'n(\d+)', ed_link)
-            edition_number = match.group(1) if match else ""
-            for art in articles:
-                art["year"] = year
-                art["volume"] = volume
-                art["edition_number"] = edition_number
-                art["journal"] = journal_name
-                kws = extract_keywords_etc(session, art["abstract_link"])
-                art["keywords"] = kws
-                insts = extract_institutions_from_article_page(session, art["abstract_link"])
-                art["institutions"] = insts
-            return articles
+            return extract_edition(ed_link, year, volume, journal_name, lambda url: get_soup(session, url))
         except Exception as e:
             logger.warning(f"Erro ao processar edição {ed_link} na tentativa {attempt}: {e}")
             if attempt < MAX_RETRIES:
+                metricas.retentativas.inc(tipo="edicao")
                 time.sleep(5)
             else:
                 logger.error(f"Edição {ed_link} falhou após {MAX_RETRIES} tentativas.")
-                return []
+                raise
 
 """
 Processa uma revista (journal), extraindo os issues (anos/volumes) e os artigos de cada edição,
@@ -433,8 +499,9 @@ Parâmetros:
     processed_editions (set): Conjunto contendo as URLs das edições já processadas
 
 Retorna:
-    list: Lista de dicionários com os dados dos artigos extraídos da revista
+    list: Lista de objetos Artigo com os dados dos artigos extraídos da revista
 """
+@instrumentacao.cronometrar(linhas=len)
 def process_journal(journal, session, processed_editions):
     
     journal_name = journal["name"]
@@ -449,7 +516,8 @@ def process_journal(journal, session, processed_editions):
         grouped_issues.setdefault(key, []).extend(issue["edition_links"])
     
     journal_articles = []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=30) as executor:
+    # O número de requisições simultâneas é limitado por host em scrapers/concorrencia.py; o pool apenas comporta o limite máximo
+    with concurrent.futures.ThreadPoolExecutor(max_workers=LIMITE_MAXIMO) as executor:
         future_to_edition = {}
         for (year, volume), edition_links in grouped_issues.items():
             logger.info(f"Revista {journal_name} - Processando Year={year}, Volume={volume}. {len(edition_links)} edições encontradas.")
@@ -460,18 +528,28 @@ def process_journal(journal, session, processed_editions):
                     continue
                 future = executor.submit(process_edition_with_retries, ed_link, year, volume, journal_name, session)
                 future_to_edition[future] = ed_link
+
+        # Edições aguardando uma thread livre
+        metricas.edicoes_planejadas.inc(len(future_to_edition), revista=journal_name)
+        metricas.fila.definir_funcao(
+            lambda: sum(not f.running() and not f.done() for f in future_to_edition), fila=f"edicoes_{journal_name}"
+        )
                 
         for future in concurrent.futures.as_completed(future_to_edition):
             ed = future_to_edition[future]
             try:
                 articles = future.result()
+                metricas.edicoes_concluidas.inc(revista=journal_name)
                 if articles:
+                    metricas.artigos_concluidos.inc(len(articles), revista=journal_name)
                     journal_articles.extend(articles)
                     # Após sucesso, salva a edição como processada
                     save_processed_edition(ed)
                     processed_editions.add(ed)
             except Exception as exc:
+                metricas.edicoes_falhas.inc(revista=journal_name)
                 logger.error(f"Erro ao processar edição {ed} mesmo após retentativas: {exc}")
+        metricas.fila.remover_funcao(fila=f"edicoes_{journal_name}")
     return journal_articles
 
 # Pipeline Principal
@@ -482,9 +560,12 @@ processando as edições de cada revista de forma paralela e utilizando retentat
 Remove publicações duplicadas (baseado no título) e retorna a lista final de artigos
 
 Retorna:
-    list: Lista de dicionários com os dados dos artigos extraídos.
+    list: Lista de objetos Artigo com os dados dos artigos extraídos.
 """
+@instrumentacao.etapa("extracao", linhas=len)
 def run_scraper():
+    # Endpoint de métricas, se NTBD_METRICAS_PORTA estiver definida
+    iniciar_servidor()
     session = create_session()
     all_articles = []
     
@@ -493,7 +574,7 @@ def run_scraper():
     logger.info(f"{len(processed_editions)} edições já processadas anteriormente.")
     
     # Processamento paralelo das revistas
-    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as journal_executor:
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(JOURNALS)) as journal_executor:
         future_to_journal = {
             journal_executor.submit(process_journal, journal, session, processed_editions): journal 
             for journal in JOURNALS
@@ -507,20 +588,196 @@ def run_scraper():
             except Exception as exc:
                 logger.error(f"Erro ao processar a revista {journal['name']}: {exc}")
     
-    # Remover duplicatas de publicações com o mesmo título
+    save_article_links(all_articles)
+    return remove_duplicates(all_articles)
+
+"""
+Remove publicações duplicadas (baseado no título), mantendo a primeira ocorrência, e descarta os links e o PID dos artigos
+
+Parâmetros:
+    all_articles (list): Lista de objetos Artigo
+
+Retorna:
+    list: Lista de objetos Artigo sem duplicatas
+"""
+def remove_duplicates(all_articles):
     unique_articles = {}
     for article in all_articles:
-        # Remove a chave 'edition_url' e 'abstract_link' se existir  para não salvar no CSV
-        article.pop("edition_url", None)
-        article.pop("abstract_link", None)
-        article.pop("pdf_link", None)
-        article.pop("text_link", None)
-        article.pop("pid", None)
-        title = article.get("title", "").strip()
+        # Descarta os links e o PID, que não vão para o CSV
+        article.descartar_links()
+        title = (article.title or "").strip()
         if title not in unique_articles:
             unique_articles[title] = article
         else:
             logger.info(f"Artigo duplicado encontrado: {title}. Ignorando duplicata.")
     all_articles = list(unique_articles.values())
     
-    return all_articles
\ No newline at end of file
+    return all_articles
+
+"""
+Salva os links do texto completo e do PDF dos artigos em LINKS_CSV, antes de serem descartados por remove_duplicates().
+Artigos com o mesmo título são mantidos, já que os documentos são deduplicados pelo conteúdo no download. Os links já
+registrados são preservados (uma execução incremental coleta apenas as edições novas); um artigo já presente, pelo PID
+ou, sem PID, pelos links, tem a sua linha atualizada
+
+Parâmetros:
+    artigos (list): Lista de objetos Artigo
+    output_csv (str): Caminho do CSV de saída (padrão: LINKS_CSV)
+
+Retorna:
+    None
+"""
+def save_article_links(artigos, output_csv=LINKS_CSV):
+    colunas = ["journal", "title", "pid", "edition_url", "text_link", "pdf_link"]
+    linhas = {}
+    if os.path.exists(output_csv):
+        with open(output_csv, "r", encoding="utf-8", newline="") as f:
+            for linha in csv.DictReader(f):
+                linhas[linha.get("pid") or (linha.get("text_link"), linha.get("pdf_link"))] = linha
+    anteriores, total = len(linhas), 0
+    for artigo in artigos:
+        if artigo.text_link or artigo.pdf_link:
+            linhas[artigo.pid or (artigo.text_link or "", artigo.pdf_link or "")] = {c: artigo.get(c, "") for c in colunas}
+            total += 1
+    with open(output_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=colunas, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(linhas.values())
+    logger.info(f"Links de {total} artigos salvos em {output_csv} ({len(linhas) - anteriores} novos, {len(linhas)} no total)")
+
+"""
+Salva os artigos retornados por run_scraper() em um CSV ('articles.csv'), convertendo as listas de autores, palavras-chave
+e instituições em strings separadas por "; "
+
+Parâmetros:
+    artigos (list): Lista de objetos Artigo (ou dicionários) com os dados dos artigos
+    output_csv (str): Caminho do CSV de saída (padrão: "articles.csv")
+
+Retorna:
+    None
+"""
+def save_articles_csv(artigos, output_csv="articles.csv"):
+    total = salvar_csv(artigos, output_csv)
+    logger.info(f"{total} artigos salvos em {output_csv}")
+
+"""
+Versão em fluxo de run_scraper(): processa as edições de todas as revistas em paralelo e gera os artigos de cada edição
+assim que ela é concluída, sem esperar o fim da extração. Os artigos com título já gerado são descartados. As edições não
+são registradas em PROGRESS_FILE aqui: cabe ao consumidor chamar save_processed_edition() depois de persistir os artigos,
+para que uma falha antes disso faça a edição ser extraída de novo na próxima execução
+
+Parâmetros:
+    max_workers (int): Número de edições processadas simultaneamente (padrão: LIMITE_MAXIMO; as requisições simultâneas
+        são limitadas por scrapers/concorrencia.py)
+
+Retorna:
+    generator: Tuplas (URL da edição, lista de dicionários com os artigos da edição), apenas para edições com artigos
+    extraídos (a lista pode ficar vazia se todos os títulos forem repetidos)
+"""
+def iter_scraper_editions(max_workers=LIMITE_MAXIMO):
+    iniciar_servidor()
+    session = create_session()
+    processed_editions = load_processed_editions()
+    logger.info(f"{len(processed_editions)} edições já processadas anteriormente.")
+    titles = set()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        future_to_edition = {}
+        for journal in JOURNALS:
+            for issue in extract_issues_links(session, journal["grid_url"]):
+                for ed_link in issue["edition_links"]:
+                    if ed_link in processed_editions:
+                        continue
+                    future = executor.submit(
+                        process_edition_with_retries, ed_link, issue["year"], issue["volume"], journal["name"], session
+                    )
+                    future_to_edition[future] = (ed_link, journal["name"])
+                    metricas.edicoes_planejadas.inc(revista=journal["name"])
+        metricas.fila.definir_funcao(
+            lambda: sum(not f.running() and not f.done() for f in future_to_edition), fila="edicoes"
+        )
+
+        for future in concurrent.futures.as_completed(future_to_edition):
+            ed, journal_name = future_to_edition[future]
+            try:
+                extracted = future.result() or []
+            except Exception as exc:
+                # A edição não é entregue nem registrada: será tentada novamente na próxima execução
+                metricas.edicoes_falhas.inc(revista=journal_name)
+                logger.error(f"Erro ao processar edição {ed} mesmo após retentativas: {exc}")
+                continue
+            metricas.edicoes_concluidas.inc(revista=journal_name)
+            metricas.artigos_concluidos.inc(len(extracted), revista=journal_name)
+            articles = []
+            for article in extracted:
+                title = (article.title or "").strip()
+                if title in titles:
+                    logger.info(f"Artigo duplicado encontrado: {title}. Ignorando duplicata.")
+                    continue
+                titles.add(title)
+                articles.append(article.como_dict())
+            # Assim como em process_journal, apenas edições com artigos extraídos são entregues para registro
+            if extracted:
+                yield ed, articles
+        metricas.fila.remover_funcao(fila="edicoes")
+
+# Reprocessamento a partir do arquivo de páginas
+
+# Arquivo de páginas aberto em cada processo do reprocessamento (definido por init_reparse_worker)
+reparse_archive = None
+
+def init_reparse_worker(diretorio):
+    global reparse_archive
+    reparse_archive = ArquivoPaginas(diretorio)
+
+"""
+Reprocessa uma edição a partir do arquivo de páginas (executada nos processos de run_reparse)
+
+Parâmetros:
+    task (tuple): (ed_link, year, volume, journal_name)
+
+Retorna:
+    list: Lista de objetos Artigo com os dados dos artigos extraídos
+"""
+def reparse_edition(task):
+    ed_link, year, volume, journal_name = task
+    return extract_edition(ed_link, year, volume, journal_name, lambda url: get_soup_archived(reparse_archive, url))
+
+"""
+Reconstrói os artigos a partir do arquivo de páginas, sem acessar a rede: lê as páginas de grid das revistas em JOURNALS
+e reprocessa cada edição arquivada em um pool de processos (o parse do HTML é limitado pela CPU). Páginas ausentes no
+arquivo são ignoradas com um aviso
+
+Parâmetros:
+    diretorio (str): Diretório do arquivo de páginas
+    processes (int): Número de processos (padrão: None, um por núcleo)
+
+Retorna:
+    list: Lista de objetos Artigo com os dados dos artigos, sem duplicatas
+"""
+@instrumentacao.etapa("reprocessamento", linhas=len)
+def run_reparse(diretorio, processes=None):
+    arquivo = ArquivoPaginas(diretorio)
+    logger.info(f"Reprocessando {len(arquivo)} páginas arquivadas em {diretorio}")
+    tasks = []
+    for journal in JOURNALS:
+        soup = get_soup_archived(arquivo, journal["grid_url"])
+        if soup is None:
+            continue
+        for issue in parse_issues(soup):
+            for ed_link in issue["edition_links"]:
+                if BASE_URL + ed_link not in arquivo:
+                    logger.warning(f"Edição {ed_link} ausente no arquivo. Pulando.")
+                    continue
+                tasks.append((ed_link, issue["year"], issue["volume"], journal["name"]))
+    arquivo.fechar()
+
+    all_articles = []
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=processes or os.cpu_count(), initializer=init_reparse_worker, initargs=(diretorio,)
+    ) as executor:
+        for articles in executor.map(reparse_edition, tasks, chunksize=4):
+            all_articles.extend(articles)
+    logger.info(f"{len(tasks)} edições reprocessadas, {len(all_articles)} artigos encontrados.")
+    save_article_links(all_articles)
+    return remove_duplicates(all_articles)
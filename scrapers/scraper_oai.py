@@ -0,0 +1,362 @@
+"""
+Coleta alternativa dos metadados das publicações pela interface OAI-PMH da SciELO, em vez do HTML de cada edição e do
+abstract de cada artigo. Os registros são baixados em páginas (ListRecords), seguindo os resumptionTokens, e cada página é
+interpretada com um parser XML em fluxo (iterparse), descartando cada registro após convertê-lo em Artigo. São aceitos
+registros em Dublin Core (oai_dc) e em XML JATS (<article>, com palavras-chave e afiliações). A coleta pode ser
+incremental: a data da última coleta de cada revista fica em ARQUIVO_ESTADO_OAI e é enviada como from= na seguinte
+
+Uso:
+    python pipeline.py --oai                          # coleta incremental e atualiza articles.csv
+    python pipeline.py --oai --oai-desde 2024-01-01   # coleta os registros alterados desde a data
+    NTBD_OAI_URL=http://127.0.0.1:8080/oai python pipeline.py --oai
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+import requests
+from monitoramento.instrumentacao import instrumentacao
+from monitoramento.metricas import metricas, iniciar_servidor
+from scrapers.artigo import Artigo, CAMPOS_CSV
+from scrapers.concorrencia import controle
+from scrapers.scraper_basico import create_session, remove_duplicates, save_articles_csv, MAX_RETRIES
+
+logger = logging.getLogger("ScraperOAI")
+
+# Endpoint OAI-PMH da SciELO Brasil
+OAI_URL = os.environ.get("NTBD_OAI_URL", "https://www.scielo.br/oai/scielo-oai.php")
+
+# Conjuntos (sets) OAI de cada revista, identificados pelo ISSN
+OAI_SETS = {"QN": "0100-4042", "JBCS": "0103-5053"}
+
+# Formato dos metadados solicitado (oai_dc é suportado por todo repositório OAI-PMH)
+METADATA_PREFIX = "oai_dc"
+
+# Arquivo com a data da última coleta de cada revista, utilizada como from= na coleta incremental
+ARQUIVO_ESTADO_OAI = "oai_estado.json"
+
+# Tipos de artigo (vocabulário do JATS) convertidos nos rótulos exibidos no site (os demais são mantidos como informados)
+TIPOS_PUBLICACAO = {"research-article": "Artigo", "review-article": "Revisão", "editorial": "Editorial"}
+
+def nome_local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+def texto(elemento):
+    return " ".join("".join(elemento.itertext()).split())
+
+"""
+Extrai volume, número e ano da referência bibliográfica da edição (dc:source), ex.: "Química Nova v.47 n.1 2024"
+
+Parâmetros:
+    fonte (str): Referência da edição
+
+Retorna:
+    tupla: (volume, número, ano), com "" nos valores não encontrados
+"""
+def analisar_fonte(fonte):
+    volume = re.search(r"v\.?\s*(\d+)", fonte or "")
+    numero = re.search(r"n\.?\s*(\d+)", fonte or "")
+    ano = re.search(r"(\d{4})\s*$", (fonte or "").strip())
+    return (
+        volume.group(1) if volume else "",
+        numero.group(1) if numero else "",
+        ano.group(1) if ano else ""
+    )
+
+"""
+Converte uma data ISO (YYYY-MM-DD, YYYY-MM ou YYYY) para 'YYYY-MM', como parse_date_yyyymmdd em scraper_basico
+
+Parâmetros:
+    data (str): Data informada no registro
+
+Retorna:
+    str: Data formatada como 'YYYY-MM', ou None se o mês não for informado
+"""
+def formatar_data(data):
+    match = re.match(r"(\d{4})-?(\d{2})", (data or "").strip())
+    return f"{match.group(1)}-{match.group(2)}" if match else None
+
+"""
+Converte um registro Dublin Core (oai_dc) em Artigo. O Dublin Core não traz afiliações, de modo que "institutions" fica
+vazio (o formato JATS as inclui)
+
+Parâmetros:
+    metadados (Element): Elemento <oai_dc:dc>
+    journal (str): Sigla da revista
+
+Retorna:
+    Artigo: Registro convertido
+"""
+def mapear_dublin_core(metadados, journal):
+    campos = {}
+    for elemento in metadados:
+        valor = texto(elemento)
+        if valor:
+            campos.setdefault(nome_local(elemento.tag), []).append(valor)
+    volume, numero, ano = analisar_fonte((campos.get("source") or [""])[0])
+    data = (campos.get("date") or [""])[0]
+    tipo = (campos.get("type") or [None])[0]
+    keywords = [kw.strip() for assunto in campos.get("subject", []) for kw in assunto.split(";") if kw.strip()]
+    return Artigo(
+        journal=journal,
+        year=ano or data[:4],
+        volume=volume,
+        edition_number=numero,
+        publication_date=formatar_data(data),
+        publication_type=TIPOS_PUBLICACAO.get(tipo, tipo),
+        title=(campos.get("title") or [None])[0],
+        authors=campos.get("creator", []),
+        keywords=keywords,
+        institutions=[],
+    )
+
+"""
+Converte um registro JATS (<article>) em Artigo, com autores no formato "Sobrenome, Nomes", palavras-chave e afiliações
+
+Parâmetros:
+    metadados (Element): Elemento <article>
+    journal (str): Sigla da revista
+
+Retorna:
+    Artigo: Registro convertido
+"""
+def mapear_jats(metadados, journal):
+    meta = next((e for e in metadados.iter() if nome_local(e.tag) == "article-meta"), metadados)
+    titulo, volume, numero, data = None, "", "", None
+    authors, keywords, institutions = [], [], []
+    for elemento in meta.iter():
+        nome = nome_local(elemento.tag)
+        if nome == "article-title" and titulo is None:
+            titulo = texto(elemento)
+        elif nome == "contrib" and elemento.get("contrib-type", "author") == "author":
+            partes = {nome_local(e.tag): texto(e) for e in elemento.iter()}
+            if partes.get("surname"):
+                authors.append(", ".join(p for p in (partes["surname"], partes.get("given-names")) if p))
+        elif nome == "kwd":
+            keywords.append(texto(elemento))
+        elif nome == "aff":
+            rotulo = next((texto(e) for e in elemento if nome_local(e.tag) == "label"), "")
+            afiliacao = texto(elemento)
+            if rotulo and afiliacao.startswith(rotulo):
+                afiliacao = afiliacao[len(rotulo):].strip()
+            if afiliacao and afiliacao not in institutions:
+                institutions.append(afiliacao)
+        elif nome == "volume" and not volume:
+            volume = texto(elemento)
+        elif nome == "issue" and not numero:
+            match = re.search(r"\d+", texto(elemento))
+            numero = match.group(0) if match else ""
+        elif nome == "pub-date" and data is None:
+            partes = {nome_local(e.tag): texto(e) for e in elemento}
+            if partes.get("year"):
+                data = partes["year"] + (f"-{int(partes['month']):02d}" if partes.get("month", "").isdigit() else "")
+    tipo = metadados.get("article-type")
+    return Artigo(
+        journal=journal,
+        year=(data or "")[:4],
+        volume=volume,
+        edition_number=numero,
+        publication_date=formatar_data(data),
+        publication_type=TIPOS_PUBLICACAO.get(tipo, tipo),
+        title=titulo,
+        authors=authors,
+        keywords=keywords,
+        institutions=institutions,
+    )
+
+MAPEADORES = {"dc": mapear_dublin_core, "article": mapear_jats}
+
+"""
+Interpreta uma página de resposta do ListRecords com iterparse. Cada <record> é convertido e descartado em seguida, e
+registros removidos (status="deleted") são ignorados
+
+Parâmetros:
+    conteudo (bytes): XML da resposta
+    journal (str): Sigla da revista
+
+Retorna:
+    tupla: (lista de objetos Artigo, resumptionToken ou None, responseDate)
+"""
+@instrumentacao.cronometrar(linhas=lambda resultado: len(resultado[0]))
+def analisar_pagina(conteudo, journal):
+    artigos, token, data_resposta = [], None, None
+    for _, elemento in ET.iterparse(io.BytesIO(conteudo), events=("end",)):
+        nome = nome_local(elemento.tag)
+        if nome == "record":
+            cabecalho = next((e for e in elemento if nome_local(e.tag) == "header"), None)
+            metadata = next((e for e in elemento if nome_local(e.tag) == "metadata"), None)
+            if cabecalho is not None and cabecalho.get("status") == "deleted" or metadata is None or not len(metadata):
+                elemento.clear()
+                continue
+            metadados = metadata[0]
+            mapeador = MAPEADORES.get(nome_local(metadados.tag))
+            if mapeador is None:
+                logger.warning(f"Formato de metadados não suportado: {metadados.tag}")
+            else:
+                artigos.append(mapeador(metadados, journal))
+            elemento.clear()
+        elif nome == "resumptionToken":
+            token = (elemento.text or "").strip() or None
+        elif nome == "responseDate":
+            data_resposta = (elemento.text or "").strip()
+        elif nome == "error":
+            codigo = elemento.get("code")
+            if codigo != "noRecordsMatch":
+                raise ValueError(f"Erro OAI-PMH {codigo}: {(elemento.text or '').strip()}")
+    return artigos, token, data_resposta
+
+"""
+Realiza uma requisição ao endpoint OAI-PMH, com as mesmas métricas, instrumentação e controle de concorrência de
+get_soup(), e com até MAX_RETRIES tentativas
+
+Parâmetros:
+    session (requests.Session): Sessão HTTP
+    params (dict): Parâmetros da requisição (verb, metadataPrefix, set, from, resumptionToken)
+
+Retorna:
+    bytes: Corpo da resposta
+"""
+def requisitar_oai(session, params):
+    for tentativa in range(1, MAX_RETRIES + 1):
+        with controle.requisicao(OAI_URL):
+            inicio = time.perf_counter()
+            try:
+                with metricas.requisicao(OAI_URL):
+                    resp = session.get(OAI_URL, params=params, timeout=60)
+            except requests.RequestException as e:
+                instrumentacao.registrar_requisicao(OAI_URL, time.perf_counter() - inicio)
+                erro = e
+            else:
+                instrumentacao.registrar_requisicao(
+                    OAI_URL, time.perf_counter() - inicio, len(resp.content), resp.status_code
+                )
+                if resp.ok:
+                    return resp.content
+                erro = requests.HTTPError(f"{resp.status_code} em {resp.url}")
+        logger.warning(f"Erro na requisição OAI-PMH (tentativa {tentativa}/{MAX_RETRIES}): {erro}")
+        if tentativa == MAX_RETRIES:
+            raise erro
+        metricas.retentativas.inc(tipo="oai")
+        time.sleep(5)
+
+"""
+Coleta os registros de uma revista, página a página, seguindo os resumptionTokens
+
+Parâmetros:
+    session (requests.Session): Sessão HTTP
+    journal (str): Sigla da revista (chave de OAI_SETS)
+    desde (str): Data inicial (from=) no formato YYYY-MM-DD (padrão: None, coleta completa)
+    prefixo (str): metadataPrefix solicitado (padrão: METADATA_PREFIX)
+
+Retorna:
+    generator: Tuplas (lista de objetos Artigo, responseDate), uma por página
+"""
+def colher_revista(session, journal, desde=None, prefixo=METADATA_PREFIX):
+    params = {"verb": "ListRecords", "metadataPrefix": prefixo, "set": OAI_SETS[journal]}
+    if desde:
+        params["from"] = desde
+    paginas = 0
+    while True:
+        artigos, token, data_resposta = analisar_pagina(requisitar_oai(session, params), journal)
+        paginas += 1
+        metricas.artigos_concluidos.inc(len(artigos), revista=journal)
+        logger.info(f"Revista {journal}: página {paginas} com {len(artigos)} registros")
+        yield artigos, data_resposta
+        if not token:
+            break
+        params = {"verb": "ListRecords", "resumptionToken": token}
+
+def carregar_estado_oai(caminho=ARQUIVO_ESTADO_OAI):
+    if os.path.exists(caminho):
+        with open(caminho, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+def salvar_estado_oai(estado, caminho=ARQUIVO_ESTADO_OAI):
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(estado, f, indent=1)
+
+"""
+Lê os artigos de um 'articles.csv' já existente, para a atualização incremental
+
+Parâmetros:
+    caminho (str): Caminho do CSV
+
+Retorna:
+    list: Lista de objetos Artigo (vazia se o arquivo não existir)
+"""
+def carregar_artigos_csv(caminho):
+    if not os.path.exists(caminho):
+        return []
+    with open(caminho, "r", encoding="utf-8", newline="") as f:
+        return [Artigo.de_dict(linha) for linha in csv.DictReader(f)]
+
+"""
+Completa os registros coletados com os artigos já existentes de mesmo título: campos vazios no registro OAI (ex.: as
+instituições, ausentes no oai_dc) mantêm o valor da coleta anterior, e os demais são atualizados pelo registro novo
+
+Parâmetros:
+    coletados (list): Objetos Artigo da coleta OAI-PMH
+    anteriores (list): Objetos Artigo já existentes
+
+Retorna:
+    list: Lista de objetos Artigo, sem duplicatas, com os registros coletados antes dos anteriores
+"""
+def mesclar_artigos(coletados, anteriores):
+    por_titulo = {(artigo.title or "").strip(): artigo for artigo in anteriores}
+    for artigo in coletados:
+        anterior = por_titulo.get((artigo.title or "").strip())
+        if anterior is None:
+            continue
+        for campo in CAMPOS_CSV:
+            if artigo[campo] in (None, "", ()) and anterior[campo] not in (None, "", ()):
+                artigo[campo] = anterior[campo]
+    return remove_duplicates(coletados + anteriores)
+
+"""
+Executa a coleta OAI-PMH das revistas em OAI_SETS. Na coleta incremental, cada revista é coletada a partir da data da
+coleta anterior e os registros novos ou alterados substituem, pelo título, os artigos já presentes em existing_csv
+(mantendo os campos que o registro OAI não informa). O estado da coleta só é gravado depois que os artigos são salvos
+em output_csv, para que uma falha ao salvá-los não faça a próxima coleta pular os registros desta
+
+Parâmetros:
+    desde (str): Data inicial (from=) para todas as revistas (padrão: None, utiliza o estado da coleta anterior)
+    incremental (bool): Utiliza e atualiza ARQUIVO_ESTADO_OAI e mescla com existing_csv (padrão: True)
+    prefixo (str): metadataPrefix solicitado (padrão: METADATA_PREFIX)
+    existing_csv (str): CSV com os artigos da coleta anterior (padrão: "articles.csv")
+    output_csv (str): CSV em que os artigos são salvos (padrão: "articles.csv")
+
+Retorna:
+    list: Lista de objetos Artigo, sem duplicatas
+"""
+@instrumentacao.etapa("extracao_oai", linhas=len)
+def run_oai(
+    desde=None, incremental=True, prefixo=METADATA_PREFIX, existing_csv="articles.csv", output_csv="articles.csv"
+):
+    iniciar_servidor()
+    session = create_session()
+    estado = carregar_estado_oai() if incremental else {}
+    coletados = []
+    for journal in OAI_SETS:
+        inicio_revista = desde or estado.get(journal)
+        logger.info(f"Coletando {journal} via OAI-PMH" + (f" desde {inicio_revista}" if inicio_revista else ""))
+        data_coleta = None
+        for artigos, data_resposta in colher_revista(session, journal, inicio_revista, prefixo):
+            # A data da primeira resposta é o from= da próxima coleta (registros alterados durante a coleta são repetidos)
+            data_coleta = data_coleta or data_resposta
+            coletados.extend(artigos)
+        if data_coleta:
+            estado[journal] = data_coleta[:10]
+
+    anteriores = carregar_artigos_csv(existing_csv) if incremental else []
+    artigos = mesclar_artigos(coletados, anteriores)
+    save_articles_csv(artigos, output_csv)
+    if incremental:
+        salvar_estado_oai(estado)
+    logger.info(f"{len(coletados)} registros coletados via OAI-PMH, {len(artigos)} artigos no total.")
+    return artigos
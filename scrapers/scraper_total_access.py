@@ -7,6 +7,13 @@ from bs4 import BeautifulSoup
 import re
 import csv
 import time
+import concurrent.futures
+import logging
+from monitoramento.instrumentacao import instrumentacao
+from monitoramento.metricas import metricas
+from scrapers.concorrencia import controle, LIMITE_MAXIMO
+
+logger = logging.getLogger("ScraperTotalAccess")
 
 """
 Converte o título para letras minúsculas e remove espaços extras
@@ -22,6 +29,31 @@ def normalizar_titulo(titulo):
     titulo = re.sub(r'\s+', ' ', titulo)
     return titulo
 
+"""
+Realiza uma requisição GET registrando a latência, os bytes recebidos e o status na instrumentação
+
+Parâmetros:
+    url (str): URL a ser requisitada
+
+Retorna:
+    requests.Response: Resposta da requisição
+"""
+def requisitar(url):
+    with controle.requisicao(url):
+        inicio = time.perf_counter()
+        try:
+            with metricas.requisicao(url):
+                r = requests.get(url, timeout=30)
+        except requests.RequestException:
+            instrumentacao.registrar_requisicao(url, time.perf_counter() - inicio)
+            raise
+        instrumentacao.registrar_requisicao(url, time.perf_counter() - inicio, len(r.content), r.status_code)
+    return r
+
+def analisar_html(texto):
+    with instrumentacao.medir("parse_html"):
+        return BeautifulSoup(texto, 'html.parser')
+
 """
 Realiza o scraping da página de edições anteriores, da Química Nova no portal SBQ
 Cada chave do dicionário é uma tupla contendo (ano, volume) (ambos inteiros) e o valor é uma lista de tuplas,onde cada tupla representa uma edição e contém:
@@ -33,18 +65,19 @@ Cada chave do dicionário é uma tupla contendo (ano, volume) (ambos inteiros) e
         Se a tabela não for encontrada ou ocorrer algum erro, retorna um dicionário vazio
     
 """
+@instrumentacao.cronometrar(linhas=len)
 def get_edicoes_anteriores_qn():
     print("[QN] Iniciando o scraping das edições anteriores (Química Nova)...")
     base_url = 'https://quimicanova.sbq.org.br/'
     url = base_url + 'edicoes_anteriores.asp'
     try:
-        r = requests.get(url)
+        r = requisitar(url)
         r.raise_for_status()
     except Exception as e:
         print(f"[QN] Erro ao acessar {url}: {e}")
         return {}
     
-    soup = BeautifulSoup(r.text, 'html.parser')
+    soup = analisar_html(r.text)
     edicoes_dict = {}
     tabela = soup.find('table', {'border': '0', 'align': 'center'})
     if not tabela:
@@ -83,17 +116,18 @@ Parâmetros:
 Retorna:
     dict: { titulo_normalizado (str): total_access (int ou None) }
 """
+@instrumentacao.cronometrar(linhas=len)
 def get_artigos_de_uma_edicao_qn(url_edicao):
     print(f"[QN] Buscando artigos em {url_edicao}")
     artigos = {}
     try:
-        r = requests.get(url_edicao)
+        r = requisitar(url_edicao)
         r.raise_for_status()
     except Exception as e:
         print(f"[QN] Erro ao acessar {url_edicao}: {e}")
         return artigos
     
-    soup = BeautifulSoup(r.text, 'html.parser')
+    soup = analisar_html(r.text)
     divs_artigos = soup.find_all('div', class_='artigosLista')
     for div in divs_artigos:
         h3_titulo = div.find('h3')
@@ -129,18 +163,19 @@ Retorna:
     dict: { (ano: int, volume: int): [(numero_edição: str, url_edição: str), ...] }
             Se ocorrer um erro ou a tabela não for encontrada, retorna um dicionário vazio
 """
+@instrumentacao.cronometrar(linhas=len)
 def get_edicoes_anteriores_jbcs():
     print("[JBCS] Iniciando o scraping das edições anteriores (JBCS)...")
     base_url = 'https://jbcs.sbq.org.br/'
     url = base_url + 'past_issues'
     try:
-        r = requests.get(url)
+        r = requisitar(url)
         r.raise_for_status()
     except Exception as e:
         print(f"[JBCS] Erro ao acessar {url}: {e}")
         return {}
     
-    soup = BeautifulSoup(r.text, 'html.parser')
+    soup = analisar_html(r.text)
     edicoes_dict = {}
     tabela = None
     for table in soup.find_all('table'):
@@ -189,17 +224,18 @@ Retorna:
     dict: { titulo_normalizado (str): total_access (int ou None) }
     Se ocorrer erro durante o acesso, retorna um dicionário vazio
 """
+@instrumentacao.cronometrar(linhas=len)
 def get_artigos_de_uma_edicao_jbcs(url_edicao):
     print(f"[JBCS] Buscando artigos em {url_edicao}")
     artigos = {}
     try:
-        r = requests.get(url_edicao)
+        r = requisitar(url_edicao)
         r.raise_for_status()
     except Exception as e:
         print(f"[JBCS] Erro ao acessar {url_edicao}: {e}")
         return artigos
     
-    soup = BeautifulSoup(r.text, 'html.parser')
+    soup = analisar_html(r.text)
     divs_artigos = soup.find_all('div', class_='artigosLista')
     for div in divs_artigos:
         h3_titulo = div.find('h3')
@@ -222,6 +258,132 @@ def get_artigos_de_uma_edicao_jbcs(url_edicao):
         artigos[titulo_norm] = total_access
     return artigos
 
+"""
+Busca o "Total Access" de artigos individuais. As listas de edições de cada revista são obtidas na primeira consulta e
+os artigos de cada edição são baixados uma única vez e mantidos em cache, o que permite enriquecer os artigos um a um,
+à medida que são extraídos, ou baixar antes todas as edições de um lote em paralelo (precarregar). Uma edição cujo
+download falhou não é tentada novamente na mesma execução. O ritmo das requisições a cada site é definido pelo controle
+adaptativo de concorrência (scrapers/concorrencia.py)
+"""
+class BuscadorTotalAccess:
+    def __init__(self):
+        self.edicoes = {}
+        self.cache = {}
+        self.falhas = set()
+
+    def edicoes_revista(self, journal):
+        if journal not in self.edicoes:
+            self.edicoes[journal] = get_edicoes_anteriores_qn() if journal == 'QN' else get_edicoes_anteriores_jbcs()
+        return self.edicoes[journal]
+
+    """
+    Localiza a edição de um artigo na lista de edições da revista
+
+    Parâmetros:
+        journal (str): Sigla da revista ("QN" ou "JBCS")
+        year (str): Ano da edição
+        volume (str): Volume da edição
+        edition_number (str): Número da edição
+
+    Retorna:
+        tupla: (chave do cache (journal, ano, volume, número), URL da edição), ou None se a edição não for encontrada
+    """
+    def localizar_edicao(self, journal, year, volume, edition_number):
+        journal = str(journal or '').strip().upper()
+        num_str = str(edition_number or '').strip()
+
+        # Verifica se é QN ou JBCS
+        if journal not in ['QN', 'JBCS']:
+            return None
+
+        # Tenta converter
+        try:
+            ano = int(str(year).strip())
+            vol = int(str(volume).strip())
+        except:
+            return None
+
+        ed_list = self.edicoes_revista(journal).get((ano, vol), [])
+        for (numero, link_ed) in ed_list:
+            if numero.strip() == num_str:
+                return (journal, ano, vol, num_str), link_ed
+        return None
+
+    """
+    Baixa os artigos de uma edição para o cache. Em caso de erro, a edição é registrada em self.falhas e não é baixada
+    novamente nesta execução
+
+    Parâmetros:
+        key (tuple): Chave do cache (journal, ano, volume, número)
+        url_edition (str): URL da edição
+
+    Retorna:
+        bool: True se a edição foi baixada
+    """
+    def baixar_edicao(self, key, url_edition):
+        if key in self.falhas:
+            return False
+        try:
+            if key[0] == 'QN':
+                self.cache[key] = get_artigos_de_uma_edicao_qn(url_edition)
+            else:
+                self.cache[key] = get_artigos_de_uma_edicao_jbcs(url_edition)
+        except Exception as e:
+            logger.error(f"[{key[0]}] Erro ao baixar a edição {url_edition}: {e}")
+            self.falhas.add(key)
+            return False
+        return True
+
+    """
+    Baixa em paralelo as edições dos registros ainda ausentes do cache. O número de requisições simultâneas a cada site é
+    definido pelo controle adaptativo (scrapers/concorrencia.py)
+
+    Parâmetros:
+        registros (iterável): Dicionários com as chaves "journal", "year", "volume" e "edition_number"
+        max_workers (int): Número de threads (padrão: LIMITE_MAXIMO)
+
+    Retorna:
+        int: Número de edições baixadas (as que falharam ficam em self.falhas)
+    """
+    def precarregar(self, registros, max_workers=LIMITE_MAXIMO):
+        pendentes = {}
+        for registro in registros:
+            edicao = self.localizar_edicao(
+                registro.get('journal', ''), registro.get('year', ''), registro.get('volume', ''),
+                registro.get('edition_number', '')
+            )
+            if edicao is not None and edicao[0] not in self.cache and edicao[0] not in self.falhas:
+                pendentes[edicao[0]] = edicao[1]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return sum(executor.map(lambda item: self.baixar_edicao(*item), pendentes.items()))
+
+    """
+    Retorna o "Total Access" de um artigo
+
+    Parâmetros:
+        journal (str): Sigla da revista ("QN" ou "JBCS")
+        year (str): Ano da edição
+        volume (str): Volume da edição
+        edition_number (str): Número da edição
+        title (str): Título do artigo
+
+    Retorna:
+        str: Valor do "Total Access", ou '' se o artigo ou a edição não forem encontrados
+    """
+    def obter(self, journal, year, volume, edition_number, title):
+        edicao = self.localizar_edicao(journal, year, volume, edition_number)
+        if edicao is None:
+            return ''
+        key, url_edition = edicao
+        journal = key[0]
+        if key not in self.cache and not self.baixar_edicao(key, url_edition):
+            return ''
+
+        total_access = self.cache[key].get(normalizar_titulo(str(title or '').strip()), '')
+        if journal == 'QN':
+            return str(total_access)
+        return str(total_access) if total_access else ''
+
 """
 Carrega o CSV de entrada com dados básicos dos artigos, realiza o scraping do valor 
 "Total Access" para os periódicos Química Nova e JBCS e gera um novo CSV de saída 
@@ -232,8 +394,9 @@ Parâmetros:
     output_csv (str): Caminho para o arquivo CSV de saída com a coluna 'TotalAccess'
 
 Retorna:
-    None
+    int: Número de registros processados
 """
+@instrumentacao.etapa("total_access", linhas=int)
 def run_total_access(input_csv, output_csv):
     
     # Ler CSV
@@ -245,84 +408,18 @@ def run_total_access(input_csv, output_csv):
     if 'TotalAccess' not in fieldnames:
         fieldnames.append('TotalAccess')
     
-    # Obter edições
-    edicoes_qn = get_edicoes_anteriores_qn()
-    edicoes_jbcs = get_edicoes_anteriores_jbcs()
-    
-    cache_qn = {}
-    cache_jbcs = {}
-    
+    buscador = BuscadorTotalAccess()
+    buscador.precarregar(rows)
     for row in rows:
-        journal = row.get('journal', '').strip().upper()
-        year_str = row.get('year', '').strip()
-        vol_str = row.get('volume', '').strip()
-        num_str = row.get('edition_number', '').strip()
-        title_str = row.get('title', '').strip()
-        
-        # Verifica se é QN ou JBCS
-        if journal not in ['QN', 'JBCS']:
-            row['TotalAccess'] = ''
-            continue
-        
-        # Tenta converter
-        try:
-            ano = int(year_str)
-            vol = int(vol_str)
-        except:
-            row['TotalAccess'] = ''
-            continue
-        
-        titulo_norm_csv = normalizar_titulo(title_str)
-        
-        # Processa QN
-        if journal == 'QN':
-            ed_list = edicoes_qn.get((ano, vol), [])
-            url_edition = None
-            for (numero, link_ed) in ed_list:
-                if numero.strip() == num_str:
-                    url_edition = link_ed
-                    break
-            if not url_edition:
-                row['TotalAccess'] = ''
-                continue
-            
-            key = (ano, vol, num_str)
-            if key not in cache_qn:
-                time.sleep(1)
-                artigos_qn = get_artigos_de_uma_edicao_qn(url_edition)
-                cache_qn[key] = artigos_qn
-            else:
-                artigos_qn = cache_qn[key]
-            
-            total_access = artigos_qn.get(titulo_norm_csv, '')
-            row['TotalAccess'] = str(total_access)
-        
-        # Processa JBCS
-        elif journal == 'JBCS':
-            ed_list = edicoes_jbcs.get((ano, vol), [])
-            url_edition = None
-            for (numero_site, link_ed) in ed_list:
-                if numero_site.strip() == num_str:
-                    url_edition = link_ed
-                    break
-            if not url_edition:
-                row['TotalAccess'] = ''
-                continue
-            
-            key = (ano, vol, num_str)
-            if key not in cache_jbcs:
-                time.sleep(1)
-                artigos_jbcs = get_artigos_de_uma_edicao_jbcs(url_edition)
-                cache_jbcs[key] = artigos_jbcs
-            else:
-                artigos_jbcs = cache_jbcs[key]
-            
-            total_access = artigos_jbcs.get(titulo_norm_csv, '')
-            row['TotalAccess'] = str(total_access) if total_access else ''
+        row['TotalAccess'] = buscador.obter(
+            row.get('journal', ''), row.get('year', ''), row.get('volume', ''), row.get('edition_number', ''),
+            row.get('title', '')
+        )
     
     # Salvar output
     with open(output_csv, 'w', encoding='utf-8', newline='') as fout:
         writer = csv.DictWriter(fout, fieldnames=fieldnames)
         writer.writeheader()
         for row in rows:
-            writer.writerow(row)
\ No newline at end of file
+            writer.writerow(row)
+    return len(rows)
@@ -0,0 +1,37 @@
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+
+# Os módulos do projeto são importados a partir da raiz do repositório (ex.: "from scrapers.artigo import Artigo")
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+"""
+Servidor HTTP local para os testes. A fixture retorna uma função que recebe o tratamento das requisições GET (função que
+recebe o BaseHTTPRequestHandler da requisição), inicia um servidor em uma porta livre e retorna a sua URL base. Os
+servidores iniciados são encerrados ao final do teste
+"""
+@pytest.fixture
+def servidor_http():
+    servidores = []
+
+    def iniciar(responder):
+        class Manipulador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                responder(self)
+
+            def log_message(self, *args):
+                pass
+
+        servidor = ThreadingHTTPServer(("127.0.0.1", 0), Manipulador)
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        servidores.append(servidor)
+        return f"http://127.0.0.1:{servidor.server_address[1]}"
+
+    yield iniciar
+    for servidor in servidores:
+        servidor.shutdown()
+        servidor.server_close()
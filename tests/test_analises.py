@@ -0,0 +1,58 @@
+from database.analises import CacheConsultas, executar_analise
+
+class CursorFalso:
+    def __init__(self):
+        self.comandos = []
+        self.carga = (1, "2024-03-01")
+        self.description = [("nome_autor",), ("total_publicacoes",), ("total_acessos",)]
+        self.resultado = None
+
+    def execute(self, sql, parametros=None):
+        self.comandos.append(" ".join(sql.split()))
+        if "to_regclass" in sql:
+            self.resultado = (True,)
+        elif "FROM Controle_Carga" in sql:
+            self.resultado = self.carga
+        elif "information_schema" in sql:
+            self.resultado = None
+        else:
+            self.resultado = [("Silva, Ana", 3, 10)]
+
+    def fetchone(self):
+        return self.resultado
+
+    def fetchall(self):
+        return self.resultado
+
+def test_acerto_consulta_apenas_a_marca_dagua():
+    cur, cache = CursorFalso(), CacheConsultas()
+    executar_analise("top_autores", {"limite": 5}, cur, cache)
+    assert any("to_regclass" in comando for comando in cur.comandos)
+
+    cur.comandos.clear()
+    resultado = executar_analise("top_autores", {"limite": 5}, cur, cache)
+
+    assert resultado["nome_autor"].tolist() == ["Silva, Ana"]
+    assert len(cur.comandos) == 1 and "FROM Controle_Carga" in cur.comandos[0]
+    assert cache.estatisticas()["acertos"] == 1
+
+def test_nova_carga_invalida_o_cache():
+    cur, cache = CursorFalso(), CacheConsultas()
+    executar_analise("top_autores", {"limite": 5}, cur, cache)
+    cur.carga = (2, "2024-03-02")
+    cur.comandos.clear()
+    executar_analise("top_autores", {"limite": 5}, cur, cache)
+
+    assert any("JOIN Dim_Autor" in comando for comando in cur.comandos)
+    assert cache.estatisticas()["invalidacoes"] == 1
+
+def test_lru_remove_a_entrada_menos_recente():
+    cache = CacheConsultas(tamanho_maximo=2)
+    cache.guardar("a", 1)
+    cache.guardar("b", 2)
+    cache.obter("a")
+    cache.guardar("c", 3)
+
+    assert cache.obter("b") is None
+    assert cache.obter("a") == 1 and cache.obter("c") == 3
+    assert cache.estatisticas()["remocoes"] == 1
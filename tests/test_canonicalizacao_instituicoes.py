@@ -0,0 +1,45 @@
+import pytest
+from tratamento.canonicalizacao_instituicoes import construir_mapa_canonico, palavras_compativeis
+
+@pytest.mark.parametrize("nome_a, nome_b", [
+    ("Universidade Federal do Para", "Universidade Federal do Parana"),
+    ("Universidade Federal de Santa Maria", "Universidade Federal de Santa Catarina"),
+    ("Universidade Federal do Rio Grande", "Universidade Federal do Rio Grande do Norte"),
+    ("Universidade Estadual de Maringa", "Universidade Estadual de Marilia"),
+    ("Instituto de Quimica 1", "Instituto de Quimica 2"),
+])
+def test_quase_iguais_nao_sao_unidos(nome_a, nome_b):
+    mapa = construir_mapa_canonico([nome_a, nome_b, nome_b])
+    assert mapa[nome_a] == nome_a
+    assert mapa[nome_b] == nome_b
+
+def test_variacoes_de_grafia_sao_unidas():
+    nomes = [
+        "Universidade Federal de São Carlos",
+        "Universidade Federal de Sao Carlos",
+        "Universidade Federal de São Carlos - UFSCar",
+        "Universidade Federal de São Carlos",
+        "Instituto de Quimica da Universidade de Sao Paulo",
+        "Instituto de Quimca da Universidade de Sao Paulo",
+        "Instituto de Quimica da Universidade de Sao Paulo",
+    ]
+    mapa = construir_mapa_canonico(nomes)
+    assert {mapa[n] for n in nomes[:4]} == {"Universidade Federal de São Carlos"}
+    assert {mapa[n] for n in nomes[4:]} == {"Instituto de Quimica da Universidade de Sao Paulo"}
+
+def test_palavras_compativeis():
+    assert palavras_compativeis("universidade federal sao carlos", "universidade federal sao carlos")
+    assert palavras_compativeis("instituto quimica", "instituto quimca")
+    assert not palavras_compativeis("universidade federal para", "universidade federal parana")
+    assert not palavras_compativeis("universidade federal rio grande", "universidade federal rio grande norte")
+
+def test_mapa_existente_mantem_canonicos():
+    existente = {"UFPR": "Universidade Federal do Parana", "Universidade Federal do Parana": "Universidade Federal do Parana"}
+    mapa = construir_mapa_canonico(["Universidade Federal do Para", "Universidade Federal do Paraná"], mapa_existente=existente)
+    assert mapa["Universidade Federal do Paraná"] == "Universidade Federal do Parana"
+    assert mapa["Universidade Federal do Para"] == "Universidade Federal do Para"
+
+def test_bloco_grande_e_informado(capsys):
+    nomes = [f"Laboratorio Xyzw {i:03d}" for i in range(6)]
+    construir_mapa_canonico(nomes, tamanho_max_bloco=5)
+    assert "ignorado" in capsys.readouterr().out
@@ -0,0 +1,107 @@
+import csv
+import hashlib
+import os
+import pytest
+from scrapers import downloads
+from scrapers.artigo import Artigo
+from scrapers.scraper_basico import save_article_links
+
+PDF = b"%PDF-1.4 " + bytes(range(256)) * 40
+
+@pytest.fixture
+def servidor(servidor_http, monkeypatch):
+    requisicoes = []
+
+    def responder(manipulador):
+        requisicoes.append((manipulador.path, manipulador.headers.get("Range")))
+        faixa = manipulador.headers.get("Range")
+        inicio = int(faixa[len("bytes="):].rstrip("-")) if faixa else 0
+        if inicio >= len(PDF):
+            manipulador.send_response(416)
+            manipulador.send_header("Content-Length", "0")
+            manipulador.end_headers()
+            return
+        manipulador.send_response(206 if inicio else 200)
+        manipulador.send_header("Content-Type", "application/pdf")
+        manipulador.send_header("Content-Length", str(len(PDF) - inicio))
+        manipulador.end_headers()
+        manipulador.wfile.write(PDF[inicio:])
+
+    monkeypatch.setattr(downloads, "random_sleep", lambda: None)
+    return servidor_http(responder), requisicoes
+
+def escrever_links(caminho, urls):
+    with open(caminho, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["journal", "title", "pid", "edition_url", "text_link", "pdf_link"])
+        for i, url in enumerate(urls):
+            writer.writerow(["QN", f"Artigo {i}", f"S0100-40422024000{i}", "/j/qn/i/2024.v47n1/", "", url])
+
+def objetos(diretorio):
+    return sorted(
+        os.path.relpath(os.path.join(raiz, nome), diretorio)
+        for raiz, _, nomes in os.walk(os.path.join(diretorio, "objetos")) for nome in nomes
+    )
+
+def test_documentos_iguais_sao_guardados_uma_vez(servidor, tmp_path):
+    base, requisicoes = servidor
+    links = tmp_path / "article_links.csv"
+    escrever_links(links, [f"{base}/a.pdf", f"{base}/b?format=pdf"])
+
+    contagem = downloads.run_downloads(str(links), str(tmp_path / "documentos"), max_workers=1)
+    assert (contagem["baixado"], contagem["duplicado"]) == (1, 1)
+    sha256 = hashlib.sha256(PDF).hexdigest()
+    assert objetos(tmp_path / "documentos") == [os.path.join("objetos", sha256[:2], sha256 + ".pdf")]
+
+    # Na execução seguinte, as URLs indexadas não são requisitadas novamente
+    requisicoes.clear()
+    contagem = downloads.run_downloads(str(links), str(tmp_path / "documentos"), max_workers=1)
+    assert contagem["existente"] == 2 and requisicoes == []
+
+def test_download_interrompido_continua_com_range(servidor, tmp_path):
+    base, requisicoes = servidor
+    url = f"{base}/artigo?format=pdf"
+    links = tmp_path / "article_links.csv"
+    escrever_links(links, [url])
+    armazem = downloads.ArmazemDocumentos(str(tmp_path / "documentos"))
+    with open(armazem.caminho_parcial(url), "wb") as f:
+        f.write(PDF[:1000])
+
+    contagem = downloads.run_downloads(str(links), str(tmp_path / "documentos"), max_workers=1)
+
+    assert contagem["baixado"] == 1
+    assert requisicoes == [("/artigo?format=pdf", "bytes=1000-")]
+    sha256 = hashlib.sha256(PDF).hexdigest()
+    with open(tmp_path / "documentos" / "objetos" / sha256[:2] / (sha256 + ".pdf"), "rb") as f:
+        assert f.read() == PDF
+
+def test_parcial_completo_mantem_a_extensao_do_content_type(servidor, tmp_path):
+    base, requisicoes = servidor
+    url = f"{base}/artigo?format=pdf"
+    links = tmp_path / "article_links.csv"
+    escrever_links(links, [url])
+    # Download concluído em uma execução interrompida antes de guardar o objeto
+    armazem = downloads.ArmazemDocumentos(str(tmp_path / "documentos"))
+    parcial = armazem.caminho_parcial(url)
+    downloads.baixar_para_parcial(downloads.create_session(), url, parcial, armazem.caminho_tipo_parcial(parcial))
+
+    requisicoes.clear()
+    contagem = downloads.run_downloads(str(links), str(tmp_path / "documentos"), max_workers=1)
+
+    assert contagem["baixado"] == 1
+    assert requisicoes == [("/artigo?format=pdf", f"bytes={len(PDF)}-")]
+    assert objetos(tmp_path / "documentos")[0].endswith(".pdf")
+    assert os.listdir(tmp_path / "documentos" / "parciais") == []
+
+def test_links_de_execucoes_anteriores_sao_mantidos(tmp_path):
+    caminho = str(tmp_path / "article_links.csv")
+    antigo = Artigo(journal="QN", title="Antigo", pid="S1", pdf_link="http://x/antigo.pdf")
+    save_article_links([antigo], caminho)
+    atualizado = Artigo(journal="QN", title="Antigo", pid="S1", pdf_link="http://x/antigo-v2.pdf")
+    novo = Artigo(journal="QN", title="Novo", pid="S2", text_link="http://x/novo.html")
+    save_article_links([atualizado, novo], caminho)
+
+    with open(caminho, "r", encoding="utf-8", newline="") as f:
+        linhas = {linha["pid"]: linha for linha in csv.DictReader(f)}
+    assert set(linhas) == {"S1", "S2"}
+    assert linhas["S1"]["pdf_link"] == "http://x/antigo-v2.pdf"
@@ -0,0 +1,22 @@
+import pipeline
+
+def test_csv_alterado_recria_o_dw_antes_da_carga(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    execucoes = []
+    monkeypatch.setitem(pipeline.ETAPAS["estrutura"], "funcao", lambda: execucoes.append("estrutura"))
+    monkeypatch.setitem(pipeline.ETAPAS["carga"], "funcao", lambda: execucoes.append("carga"))
+    estado = str(tmp_path / "estado.json")
+    (tmp_path / "articles_dw.csv").write_text("title,TotalAccess\nA,10\n", encoding="utf-8")
+
+    pipeline.executar_pipeline(["estrutura", "carga"], caminho_estado=estado)
+    assert pipeline.executar_pipeline(["estrutura", "carga"], caminho_estado=estado) == {
+        "estrutura": "atualizada", "carga": "atualizada"
+    }
+
+    # TotalAccess corrigido: as tabelas são recriadas e a carga é executada novamente
+    (tmp_path / "articles_dw.csv").write_text("title,TotalAccess\nA,12\n", encoding="utf-8")
+    execucoes.clear()
+    resultado = pipeline.executar_pipeline(["estrutura", "carga"], caminho_estado=estado)
+
+    assert resultado == {"estrutura": "executada", "carga": "executada"}
+    assert execucoes == ["estrutura", "carga"]
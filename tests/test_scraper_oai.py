@@ -0,0 +1,88 @@
+from urllib.parse import parse_qs, urlparse
+import pytest
+from scrapers import scraper_oai
+from scrapers.artigo import Artigo, salvar_csv
+
+REGISTRO = """<record><header><identifier>{id}</identifier></header><metadata>
+<oai_dc:dc xmlns:oai_dc="http://www.openarchives.org/OAI/2.0/oai_dc/" xmlns:dc="http://purl.org/dc/elements/1.1/">
+<dc:title>{titulo}</dc:title><dc:creator>Silva, Ana</dc:creator><dc:subject>catalise; sintese</dc:subject>
+<dc:source>Química Nova v.47 n.1 2024</dc:source><dc:date>2024-01-15</dc:date><dc:type>research-article</dc:type>
+</oai_dc:dc></metadata></record>"""
+
+PAGINA = """<?xml version="1.0" encoding="UTF-8"?>
+<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/"><responseDate>{data}</responseDate>
+<ListRecords>{registros}{token}</ListRecords></OAI-PMH>"""
+
+def pagina(titulos, token=None):
+    registros = "".join(REGISTRO.format(id=i, titulo=titulo) for i, titulo in enumerate(titulos))
+    token = f"<resumptionToken>{token}</resumptionToken>" if token else "<resumptionToken/>"
+    return PAGINA.format(data="2024-03-01T10:00:00Z", registros=registros, token=token).encode("utf-8")
+
+# Duas páginas ligadas por um resumptionToken
+PAGINAS = {None: pagina(["Artigo A", "Artigo B"], token="pagina-2"), "pagina-2": pagina(["Artigo C"])}
+
+@pytest.fixture
+def servidor_oai(servidor_http, monkeypatch, tmp_path):
+    requisicoes = []
+
+    def responder(manipulador):
+        params = {k: v[0] for k, v in parse_qs(urlparse(manipulador.path).query).items()}
+        requisicoes.append(params)
+        corpo = PAGINAS[params.get("resumptionToken")]
+        manipulador.send_response(200)
+        manipulador.send_header("Content-Type", "text/xml")
+        manipulador.send_header("Content-Length", str(len(corpo)))
+        manipulador.end_headers()
+        manipulador.wfile.write(corpo)
+
+    monkeypatch.setattr(scraper_oai, "OAI_URL", servidor_http(responder) + "/oai")
+    monkeypatch.setattr(scraper_oai, "OAI_SETS", {"QN": "0100-4042"})
+    # O estado da coleta incremental (oai_estado.json) é gravado no diretório atual
+    monkeypatch.chdir(tmp_path)
+    return requisicoes
+
+def test_segue_resumption_token(servidor_oai, tmp_path):
+    artigos = scraper_oai.run_oai(existing_csv=str(tmp_path / "articles.csv"))
+
+    assert [a.title for a in artigos] == ["Artigo A", "Artigo B", "Artigo C"]
+    assert servidor_oai[0] == {"verb": "ListRecords", "metadataPrefix": "oai_dc", "set": "0100-4042"}
+    assert servidor_oai[1] == {"verb": "ListRecords", "resumptionToken": "pagina-2"}
+    assert [a.title for a in scraper_oai.carregar_artigos_csv(str(tmp_path / "articles.csv"))] == [
+        "Artigo A", "Artigo B", "Artigo C"
+    ]
+    assert scraper_oai.carregar_estado_oai() == {"QN": "2024-03-01"}
+
+def test_estado_nao_avanca_se_o_csv_nao_for_salvo(servidor_oai, tmp_path, monkeypatch):
+    scraper_oai.salvar_estado_oai({"QN": "2024-02-01"})
+
+    def falhar(artigos, output_csv):
+        raise OSError("disco cheio")
+
+    monkeypatch.setattr(scraper_oai, "save_articles_csv", falhar)
+    with pytest.raises(OSError):
+        scraper_oai.run_oai(existing_csv=str(tmp_path / "articles.csv"))
+
+    assert scraper_oai.carregar_estado_oai() == {"QN": "2024-02-01"}
+
+def test_coleta_incremental_envia_from(servidor_oai, tmp_path):
+    scraper_oai.salvar_estado_oai({"QN": "2024-02-01"})
+    scraper_oai.run_oai(existing_csv=str(tmp_path / "articles.csv"))
+
+    assert servidor_oai[0]["from"] == "2024-02-01"
+
+def test_mescla_mantem_campos_ausentes_no_oai_dc(servidor_oai, tmp_path):
+    existente = Artigo(
+        journal="QN", year="2024", volume="47", edition_number="1", title="Artigo A", authors=["Silva, Ana"],
+        keywords=["catalise"], institutions=["Universidade de São Paulo, São Paulo, SP, Brasil"]
+    )
+    antigo = Artigo(journal="QN", year="2020", title="Artigo antigo", institutions=["Unicamp"])
+    salvar_csv([existente, antigo], tmp_path / "articles.csv")
+
+    artigos = {a.title: a for a in scraper_oai.run_oai(existing_csv=str(tmp_path / "articles.csv"))}
+
+    assert set(artigos) == {"Artigo A", "Artigo B", "Artigo C", "Artigo antigo"}
+    # O registro OAI atualiza as palavras-chave e mantém as instituições da coleta anterior
+    assert artigos["Artigo A"].keywords == ("catalise", "sintese")
+    assert artigos["Artigo A"].institutions == ("Universidade de São Paulo, São Paulo, SP, Brasil",)
+    assert artigos["Artigo B"].institutions == ()
+    assert artigos["Artigo antigo"].institutions == ("Unicamp",)
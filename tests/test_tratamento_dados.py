@@ -0,0 +1,20 @@
+import pandas as pd
+from tratamento.tratamento_dados import filtrar_localidades_consistentes
+
+def test_localidades_vazias_como_no_csv_relido(tmp_path):
+    # Saída de process_institutions_batch(): campos ausentes vêm como "" (o notebook relê o CSV, em que viram NaN)
+    df = pd.DataFrame({
+        "title": ["a", "b", "c"],
+        "Instituicao": ["usp", "", "ufscar; unicamp"],
+        "Cidade": ["sao paulo", "", "sao carlos; campinas"],
+        "Estado": ["sp", "", "sp; sp"],
+        "Pais": ["brazil", "", "brazil"],
+    })
+    caminho = tmp_path / "articles_dw.csv"
+    df.to_csv(caminho, index=False)
+    em_memoria = filtrar_localidades_consistentes(df).reset_index(drop=True)
+    relido = filtrar_localidades_consistentes(pd.read_csv(caminho)).reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(em_memoria, relido, check_dtype=False)
+    assert em_memoria.loc[em_memoria["title"] == "b", "Instituicao"].item() == "sem valor"
+    assert "c" not in set(em_memoria["title"])
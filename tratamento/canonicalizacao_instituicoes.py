@@ -0,0 +1,254 @@
+"""
+Canonicalização dos nomes de instituições extraídos por parse_institution_detail(), agrupando grafias diferentes da mesma
+instituição (com ou sem sigla, com ou sem acentos) e gerando um mapa persistente alias -> nome canônico
+"""
+
+import json
+import os
+import re
+import pandas as pd
+from collections import Counter, defaultdict
+from unidecode import unidecode
+from rapidfuzz import fuzz, process
+
+# Palavras ignoradas na comparação dos nomes
+STOPWORDS = {"de", "da", "do", "das", "dos", "e", "em", "the", "of", "and"}
+
+# Palavras muito frequentes em nomes de instituições, que não servem como chave de bloco
+PALAVRAS_GENERICAS = {
+    "universidade", "university", "instituto", "institute", "faculdade", "faculty", "escola", "school",
+    "centro", "center", "federal", "estadual", "state", "nacional", "national", "pesquisa", "research",
+    "ciencias", "ciencia", "sciences", "science", "tecnologia", "technology", "quimica", "chemistry"
+}
+
+# Similaridade mínima (fuzz.ratio) entre duas palavras diferentes para tratá-las como grafias da mesma palavra
+LIMIAR_PALAVRA = 88
+
+RE_NAO_ALFANUMERICO = re.compile(r'[^a-z0-9\s]')
+RE_ESPACOS = re.compile(r'\s+')
+
+"""
+Normaliza o nome de uma instituição para comparação: remove acentos, pontuação, stopwords e a sigla, quando esta
+corresponde às iniciais das demais palavras (ex.: "universidade federal de sao carlos ufscar")
+
+Parâmetros:
+    nome (str): Nome da instituição
+
+Retorna:
+    str: Nome normalizado
+"""
+def normalizar_nome_instituicao(nome):
+    texto = unidecode(str(nome)).lower()
+    texto = RE_NAO_ALFANUMERICO.sub(' ', texto)
+    tokens = [t for t in RE_ESPACOS.split(texto) if t and t not in STOPWORDS]
+    if len(tokens) >= 3:
+        iniciais = "".join(t[0] for t in tokens)
+        tokens = [
+            t for t in tokens
+            if not (len(t) >= 3 and t != tokens[0] and (t.startswith(iniciais[:3]) or iniciais.startswith(t)))
+        ]
+    return " ".join(tokens)
+
+"""
+Gera as chaves de bloco de um nome normalizado: o prefixo de cada palavra não genérica e a sigla formada pelas iniciais.
+Apenas nomes que compartilham alguma chave são comparados entre si
+
+Parâmetros:
+    nome_normalizado (str): Nome retornado por normalizar_nome_instituicao()
+    tamanho_prefixo (int): Número de caracteres do prefixo de cada palavra (padrão: 4)
+
+Retorna:
+    set: Conjunto de chaves de bloco
+"""
+def chaves_de_bloco(nome_normalizado, tamanho_prefixo=4):
+    tokens = nome_normalizado.split()
+    chaves = {"p:" + t[:tamanho_prefixo] for t in tokens if t not in PALAVRAS_GENERICAS and len(t) > 2}
+    if len(tokens) >= 2:
+        chaves.add("s:" + "".join(t[0] for t in tokens))
+    if not chaves and tokens:
+        chaves.add("n:" + nome_normalizado)
+    return chaves
+
+"""
+Verifica se as palavras que diferem entre dois nomes normalizados são apenas variações de grafia. Cada palavra presente em
+um só dos nomes precisa de uma correspondente no outro com fuzz.ratio >= limiar_palavra; palavras de até 2 caracteres e
+números precisam ser iguais. Evita unir instituições distintas com nomes quase iguais no todo, como "universidade federal
+para" e "universidade federal parana", em que a pontuação do nome inteiro é alta mas a palavra que os distingue não
+corresponde a nenhuma do outro nome
+
+Parâmetros:
+    nome_a (str): Nome normalizado
+    nome_b (str): Nome normalizado
+    limiar_palavra (int): Similaridade mínima entre palavras diferentes (padrão: LIMIAR_PALAVRA)
+
+Retorna:
+    bool: True se todas as palavras divergentes têm correspondente
+"""
+def palavras_compativeis(nome_a, nome_b, limiar_palavra=LIMIAR_PALAVRA):
+    tokens_a, tokens_b = set(nome_a.split()), set(nome_b.split())
+    sobra_a, sobra_b = tokens_a - tokens_b, tokens_b - tokens_a
+    for sobra, outro in ((sobra_a, sobra_b), (sobra_b, sobra_a)):
+        for token in sobra:
+            if len(token) <= 2 or token.isdigit():
+                return False
+            if not any(fuzz.ratio(token, candidato) >= limiar_palavra for candidato in outro):
+                return False
+    return True
+
+"""
+Estrutura union-find utilizada para agrupar os nomes similares
+"""
+class ConjuntosDisjuntos:
+    def __init__(self, tamanho):
+        self.pai = list(range(tamanho))
+
+    def encontrar(self, i):
+        while self.pai[i] != i:
+            self.pai[i] = self.pai[self.pai[i]]
+            i = self.pai[i]
+        return i
+
+    def unir(self, i, j):
+        raiz_i, raiz_j = self.encontrar(i), self.encontrar(j)
+        if raiz_i != raiz_j:
+            self.pai[raiz_j] = raiz_i
+
+"""
+Agrupa os nomes de instituições similares e gera o mapa alias -> nome canônico. Os nomes são distribuídos em blocos
+(chaves_de_bloco) e a similaridade (rapidfuzz, token_sort_ratio) é calculada apenas dentro de cada bloco, o que mantém
+o custo próximo de linear. Além da pontuação, as palavras que diferem entre os dois nomes precisam ser variações de grafia
+(palavras_compativeis). O nome canônico de cada grupo é a grafia mais frequente (em caso de empate, a mais longa)
+
+Parâmetros:
+    nomes (iterável): Nomes de instituições, com repetições (a frequência define o nome canônico)
+    limiar (int): Pontuação mínima de similaridade para considerar dois nomes a mesma instituição (padrão: 92)
+    tamanho_max_bloco (int): Blocos maiores que este valor são ignorados (e informados), por serem pouco discriminativos
+                             (padrão: 500)
+    mapa_existente (dict): Mapa gerado anteriormente. Os aliases já mapeados são mantidos e os novos nomes podem ser
+                           associados aos nomes canônicos existentes
+
+Retorna:
+    dict: { alias (str): nome canônico (str) }, incluindo o próprio nome canônico
+"""
+def construir_mapa_canonico(nomes, limiar=92, tamanho_max_bloco=500, mapa_existente=None):
+    mapa_existente = mapa_existente or {}
+    frequencias = Counter(n.strip() for n in nomes if isinstance(n, str) and n.strip())
+
+    # Os nomes canônicos existentes participam do agrupamento com peso elevado, para continuarem canônicos
+    for canonico in set(mapa_existente.values()):
+        frequencias[canonico] += 10 ** 9
+    novos = [n for n in frequencias if n not in mapa_existente]
+    candidatos = sorted(set(novos) | set(mapa_existente.values()))
+    if not novos:
+        return dict(mapa_existente)
+
+    normalizados = [normalizar_nome_instituicao(n) for n in candidatos]
+    conjuntos = ConjuntosDisjuntos(len(candidatos))
+
+    # Nomes com a mesma forma normalizada são unidos diretamente
+    por_forma = {}
+    for i, forma in enumerate(normalizados):
+        if forma in por_forma:
+            conjuntos.unir(por_forma[forma], i)
+        else:
+            por_forma[forma] = i
+
+    # Blocagem sobre as formas distintas e comparação apenas dentro dos blocos
+    representantes = list(por_forma.values())
+    blocos = defaultdict(list)
+    for i in representantes:
+        for chave in chaves_de_bloco(normalizados[i]):
+            blocos[chave].append(i)
+
+    for chave, membros in blocos.items():
+        if len(membros) < 2:
+            continue
+        if len(membros) > tamanho_max_bloco:
+            print(f"Bloco '{chave}' com {len(membros)} nomes ignorado (tamanho_max_bloco={tamanho_max_bloco})")
+            continue
+        textos = [normalizados[i] for i in membros]
+        scores = process.cdist(textos, textos, scorer=fuzz.token_sort_ratio, score_cutoff=limiar)
+        for a in range(len(membros)):
+            for b in range(a + 1, len(membros)):
+                if scores[a][b] >= limiar and palavras_compativeis(textos[a], textos[b]):
+                    conjuntos.unir(membros[a], membros[b])
+
+    grupos = defaultdict(list)
+    for i in range(len(candidatos)):
+        grupos[conjuntos.encontrar(i)].append(candidatos[i])
+
+    mapa = dict(mapa_existente)
+    for membros in grupos.values():
+        canonico = max(membros, key=lambda n: (frequencias[n], len(n), n))
+        canonico = mapa_existente.get(canonico, canonico)
+        for nome in membros:
+            if nome not in mapa_existente:
+                mapa[nome] = canonico
+    return mapa
+
+"""
+Salva o mapa alias -> nome canônico em um arquivo JSON
+
+Parâmetros:
+    mapa (dict): Mapa gerado por construir_mapa_canonico()
+    caminho (str): Caminho do arquivo JSON
+"""
+def salvar_mapa_canonico(mapa, caminho):
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(mapa, f, ensure_ascii=False, indent=1, sort_keys=True)
+
+"""
+Carrega o mapa alias -> nome canônico de um arquivo JSON
+
+Parâmetros:
+    caminho (str): Caminho do arquivo JSON
+
+Retorna:
+    dict: Mapa carregado, ou um dicionário vazio se o arquivo não existir
+"""
+def carregar_mapa_canonico(caminho):
+    if not os.path.exists(caminho):
+        return {}
+    with open(caminho, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+"""
+Aplica o mapa canônico a uma string de instituições separadas por ";" (formato da coluna "Instituicao").
+Cada nome é substituído em O(1); nomes ausentes do mapa são mantidos
+
+Parâmetros:
+    instituicoes_str (str): Instituições separadas por ";"
+    mapa (dict): Mapa alias -> nome canônico
+
+Retorna:
+    str: Instituições canônicas separadas por ";"
+"""
+def canonicalizar_instituicoes(instituicoes_str, mapa):
+    if not isinstance(instituicoes_str, str) or not instituicoes_str:
+        return instituicoes_str
+    nomes = [n.strip() for n in instituicoes_str.split(";") if n.strip()]
+    return "; ".join(mapa.get(n, n) for n in nomes)
+
+"""
+Constrói (ou atualiza) o mapa canônico a partir da coluna "Instituicao" de um CSV e o salva em disco
+
+Parâmetros:
+    input_csv (str): CSV com a coluna "Instituicao" (ex.: "articles_dw.csv")
+    caminho_mapa (str): Arquivo JSON do mapa; se existir, é utilizado como mapa_existente
+    limiar (int): Pontuação mínima de similaridade (padrão: 92)
+
+Retorna:
+    dict: Mapa alias -> nome canônico atualizado
+"""
+def gerar_mapa_canonico_csv(input_csv, caminho_mapa, limiar=92):
+    df = pd.read_csv(input_csv, encoding="utf-8", usecols=["Instituicao"])
+    nomes = (
+        n.strip()
+        for valor in df["Instituicao"].dropna()
+        for n in str(valor).split(";")
+        if n.strip()
+    )
+    mapa = construir_mapa_canonico(nomes, limiar=limiar, mapa_existente=carregar_mapa_canonico(caminho_mapa))
+    salvar_mapa_canonico(mapa, caminho_mapa)
+    print(f"Mapa canônico com {len(mapa)} nomes ({len(set(mapa.values()))} instituições) salvo em {caminho_mapa}")
+    return mapa
@@ -2,6 +2,7 @@ import pandas as pd
 import re
 import unidecode
 from rapidfuzz import fuzz
+from monitoramento.instrumentacao import instrumentacao
 
 
 """
@@ -263,8 +264,9 @@ Parâmetros:
     output_csv (str): Caminho para o CSV final processado
 
 Retorna:
-    None
+    int: Número de registros tratados
 """
+@instrumentacao.etapa("tratamento", linhas=int)
 def tratar_dados(input_csv, output_csv):
     df = pd.read_csv(input_csv)
 
@@ -296,4 +298,82 @@ def tratar_dados(input_csv, output_csv):
     
     # Salvar o DataFrame processado
     df.to_csv(output_csv, index=False, encoding='utf-8')
-    print(f"Dados tratados e salvos em {output_csv}")
\ No newline at end of file
+    print(f"Dados tratados e salvos em {output_csv}")
+    return len(df)
+
+"""
+Remove os registros sem a métrica TotalAccess (não encontrados no portal SBQ)
+
+Parâmetros:
+    input_csv (str): Caminho do CSV de entrada ('articles_final.csv')
+    output_csv (str): Caminho do CSV de saída; pode ser o próprio CSV de entrada
+
+Retorna:
+    int: Número de registros removidos
+"""
+def remover_sem_total_access(input_csv, output_csv):
+    df = pd.read_csv(input_csv)
+    df['TotalAccess'] = pd.to_numeric(df['TotalAccess'], errors='coerce')
+    df_clean = df.dropna(subset=['TotalAccess'])
+    df_clean.to_csv(output_csv, index=False, encoding='utf-8')
+    return len(df) - len(df_clean)
+
+"""
+Mantém apenas os registros em que "Instituicao", "Cidade", "Estado" e "Pais" têm o mesmo número de elementos separados
+por ";", e preenche os valores ausentes (NaN ou "") dessas colunas com "sem valor"
+
+Parâmetros:
+    df (pd.DataFrame): DataFrame com as colunas de localidade
+
+Retorna:
+    pd.DataFrame: DataFrame filtrado
+"""
+def filtrar_localidades_consistentes(df):
+    colunas = ['Instituicao', 'Cidade', 'Estado', 'Pais']
+    # process_institutions_batch() retorna "" para campos ausentes; ao reler o CSV (como no notebook) eles viram NaN
+    df = df.copy()
+    df[colunas] = df[colunas].replace("", pd.NA)
+    contagens = [df[c].apply(lambda x: len(x.split(";")) if isinstance(x, str) and x.strip() else 0) for c in colunas]
+    consistentes = (contagens[0] == contagens[1]) & (contagens[1] == contagens[2]) & (contagens[2] == contagens[3])
+    df_cleaned = df[consistentes].copy()
+    for c in colunas:
+        df_cleaned[c] = df_cleaned[c].fillna("sem valor")
+    return df_cleaned
+
+"""
+Aplica a um único artigo as mesmas operações de tratar_dados(), para uso no pipeline em fluxo (sem CSV intermediário).
+As listas de autores, palavras-chave e instituições podem vir como listas (saída do scraper) ou como strings separadas
+por ';'. As listas resultantes são mantidas como listas
+
+Parâmetros:
+    registro (dict): Dados do artigo
+    titulos_vistos (set): Títulos normalizados dos artigos já tratados; se informado, artigos repetidos são descartados
+
+Retorna:
+    dict: Registro tratado, ou None se for uma duplicata
+"""
+def tratar_registro(registro, titulos_vistos=None):
+    if titulos_vistos is not None:
+        titulo_norm = normalizar_titulo(registro.get('title'))
+        if titulo_norm in titulos_vistos:
+            return None
+        titulos_vistos.add(titulo_norm)
+
+    def como_texto(valor):
+        return "; ".join(valor) if isinstance(valor, list) else valor
+
+    instituicoes = como_texto(registro.get('institutions'))
+    keywords = como_texto(registro.get('keywords'))
+    registro['institutions'] = padronizar_instituicoes(instituicoes) if isinstance(instituicoes, str) else []
+    registro['keywords'] = normalizar_palavras_chave(keywords) if isinstance(keywords, str) else []
+    registro['subareas'] = mapear_subareas(registro['keywords'], subarea_map) if registro['keywords'] else []
+    registro['authors'] = separar_autores(como_texto(registro.get('authors')))
+
+    date_info = converter_extrair_datas(registro.get('publication_date'))
+    registro['publication_date'] = date_info["full_date"] if date_info else ""
+    registro['year_extracted'] = date_info["year"] if date_info else None
+    registro['month_extracted'] = date_info["month"] if date_info else None
+    registro['day_extracted'] = date_info["day"] if date_info else None
+
+    registro['edition_id'] = concatenar_volume_numero(registro.get('volume'), registro.get('edition_number'))
+    return registro